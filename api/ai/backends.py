@@ -0,0 +1,206 @@
+import hashlib
+from enum import Enum
+from pathlib import Path
+from types import SimpleNamespace
+import torch
+
+
+class Backend(str, Enum):
+    """Inference backends a `ModelLoader` can run on."""
+    TORCH = "torch"
+    TORCH_INT8_DYNAMIC = "torch-int8-dynamic"
+    ONNXRUNTIME = "onnxruntime"
+
+
+def artifact_dir(cache_dir: str, model_name: str) -> Path:
+    """Directory holding the built artifacts of a model inside `cache_dir`."""
+    return Path(cache_dir).expanduser() / model_name.strip("/").replace("/", "--")
+
+
+def tensor_bytes(model: torch.nn.Module) -> int:
+    """Size of every tensor in a module's state dict, including packed int8 weights."""
+    total = 0
+    for value in model.state_dict().values():
+        tensors = value if isinstance(value, tuple) else (value,)
+        for tensor in tensors:
+            if isinstance(tensor, torch.Tensor):
+                total += tensor.numel() * tensor.element_size()
+    return total
+
+
+def artifact_fingerprint(config, source: str, backend: Backend) -> str:
+    """Short hash identifying the inputs of a backend's built artifacts.
+
+    It covers the model config, the hub revision or, for a local directory,
+    the size and modification time of its weight files, and the versions of
+    the libraries that build and read the artifacts. A new revision or
+    library upgrade therefore builds fresh files instead of reusing stale ones.
+    """
+    import transformers
+
+    parts = [
+        backend.value,
+        config.to_json_string(),
+        getattr(config, "_commit_hash", None) or "",
+        torch.__version__,
+        transformers.__version__,
+    ]
+    if backend == Backend.ONNXRUNTIME:
+        import onnxruntime
+
+        parts.append(onnxruntime.__version__)
+    directory = Path(source).expanduser()
+    if directory.is_dir():
+        for path in sorted([*directory.glob("*.safetensors"), *directory.glob("*.bin")]):
+            stat = path.stat()
+            parts.append(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def remove_stale_artifacts(directory: Path, pattern: str, keep: set[Path]):
+    """Deletes the files built for other fingerprints."""
+    for path in directory.glob(pattern):
+        if path not in keep:
+            path.unlink(missing_ok=True)
+
+
+def load_torch_int8_dynamic(model_name: str, config, cache_dir: str, source: str | None = None) -> torch.nn.Module:
+    """Loads the model with its Linear layers dynamically quantized to int8.
+
+    The first call quantizes the fp32 weights read from `source` (the hub
+    name by default) and saves the quantized state dict in `cache_dir`, under
+    the `artifact_fingerprint` of its inputs. Later calls build the quantized
+    skeleton from the config and load that state dict, never reading the
+    fp32 weights again.
+    """
+    from transformers import AutoModelForSequenceClassification
+
+    source = source or model_name
+    directory = artifact_dir(cache_dir, model_name)
+    fingerprint = artifact_fingerprint(config, source, Backend.TORCH_INT8_DYNAMIC)
+    path = directory / f"torch-int8-dynamic-{fingerprint}.pt"
+    if path.exists():
+        model = AutoModelForSequenceClassification.from_config(config)
+        model = torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+        model.load_state_dict(torch.load(path, weights_only=True, mmap=True))
+        return model.eval()
+
+    model = AutoModelForSequenceClassification.from_pretrained(source).eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    directory.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), path)
+    remove_stale_artifacts(directory, "torch-int8-dynamic*.pt", {path})
+    return model
+
+
+class OnnxSequenceClassifier:
+    """ONNX Runtime session exposing the call contract of a HF classifier.
+
+    Calling it with the tokenizer's tensors returns an object whose `logits`
+    is a torch tensor, so `ModelLoader` post-processes every backend the same way.
+    """
+
+    def __init__(self, path: Path, intra_op_threads: int = 0):
+        try:
+            import onnxruntime
+        except ImportError as e:
+            raise RuntimeError("The onnxruntime backend requires the 'onnxruntime' package.") from e
+        options = onnxruntime.SessionOptions()
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        self.path = path
+        self.session = onnxruntime.InferenceSession(str(path), options, providers=["CPUExecutionProvider"])
+        self.input_names = [model_input.name for model_input in self.session.get_inputs()]
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.path.stat().st_size
+
+    def __call__(self, **inputs):
+        feed = {name: inputs[name].numpy() for name in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        return SimpleNamespace(logits=torch.from_numpy(logits))
+
+
+def load_onnxruntime(
+    model_name: str,
+    tokenizer,
+    config,
+    cache_dir: str,
+    quantize: bool = True,
+    intra_op_threads: int = 0,
+    source: str | None = None,
+) -> OnnxSequenceClassifier:
+    """Loads the model as an ONNX Runtime session, exporting it on first use.
+
+    The fp32 model read from `source` (the hub name by default) is exported
+    once to ONNX with dynamic batch and sequence axes and, if `quantize`, its
+    weights are dynamically quantized to int8. Both files are kept in
+    `cache_dir`, under the `artifact_fingerprint` of their inputs, and reused
+    on later loads.
+    """
+    source = source or model_name
+    directory = artifact_dir(cache_dir, model_name)
+    fingerprint = artifact_fingerprint(config, source, Backend.ONNXRUNTIME)
+    exported = directory / f"model-{fingerprint}.onnx"
+    quantized = directory / f"model-{fingerprint}.int8.onnx"
+    target = quantized if quantize else exported
+
+    if not target.exists():
+        if not exported.exists():
+            from transformers import AutoModelForSequenceClassification
+
+            model = AutoModelForSequenceClassification.from_pretrained(source).eval()
+            model.config.return_dict = False
+            sample = tokenizer(["Exportando o modelo."], return_tensors="pt")
+            names = list(sample.keys())
+            directory.mkdir(parents=True, exist_ok=True)
+            torch.onnx.export(
+                model,
+                (),
+                str(exported),
+                kwargs=dict(sample),
+                input_names=names,
+                output_names=["logits"],
+                dynamic_axes={**{name: {0: "batch", 1: "sequence"} for name in names}, "logits": {0: "batch"}},
+                opset_version=17,
+                dynamo=False,
+            )
+        if quantize:
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            quantize_dynamic(str(exported), str(quantized), weight_type=QuantType.QInt8)
+        remove_stale_artifacts(directory, "model*.onnx", {exported, quantized})
+
+    return OnnxSequenceClassifier(target, intra_op_threads=intra_op_threads)
+
+
+def check_parity(reference, candidate, texts: list[str]) -> dict:
+    """Compares the predictions of two loaded `ModelLoader`s on the same texts.
+
+    Args:
+        reference (ModelLoader): Baseline, usually the fp32 torch backend.
+        candidate (ModelLoader): Backend under evaluation.
+        texts (list[str]): Texts scored by both models.
+
+    Returns:
+        dict: Share of texts with the same predicted label and the largest
+            absolute difference between any class score.
+
+    Raises:
+        ValueError: If `texts` is empty.
+    """
+    if not texts:
+        raise ValueError("check_parity needs at least one text to compare the models on.")
+    expected = reference.predict_batch(texts)
+    actual = candidate.predict_batch(texts)
+    agreement = sum(e["predicted_label"] == a["predicted_label"] for e, a in zip(expected, actual))
+    deviation = max(
+        abs(float(e["scores"][label]) - float(a["scores"][label]))
+        for e, a in zip(expected, actual)
+        for label in e["scores"]
+    )
+    return {
+        "texts": len(texts),
+        "label_agreement": agreement / len(texts),
+        "max_score_deviation": deviation,
+    }
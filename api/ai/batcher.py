@@ -0,0 +1,152 @@
+import asyncio
+import contextvars
+from typing import Awaitable, Callable
+from .executor import QueueFullError
+
+
+class MicroBatcher:
+    """Merges concurrent single-text predictions into one padded model batch.
+
+    Every call to `submit` enqueues a text and waits for its result. A
+    background task takes the first pending text, keeps collecting until
+    `max_batch_size` texts are queued or `max_wait_ms` has passed, and then
+    runs `predict_batch` once for the whole group. Results are handed back to
+    each caller in the same order the texts were batched.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[list[str]], list[dict]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 10.0,
+        max_queue_size: int = 1024,
+        max_concurrent_batches: int = 1,
+        run: Callable[..., Awaitable] | None = None,
+    ):
+        """
+        Args:
+            predict_batch (Callable): Function scoring a list of texts and
+                returning one prediction per text, in order.
+            max_batch_size (int): Maximum number of texts per forward pass.
+            max_wait_ms (float): Maximum time to wait for more texts after the
+                first one arrives, in milliseconds.
+            max_queue_size (int): Maximum number of texts waiting for a batch.
+                Further submits raise `QueueFullError`.
+            max_concurrent_batches (int): Number of batches that may be scored
+                at the same time.
+            run (Callable, optional): Coroutine function running
+                `predict_batch(texts)` off the event loop, such as
+                `InferenceExecutor.run`. Uses the loop's default executor if None.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(max_wait_ms, 0) / 1000
+        self.max_queue_size = max_queue_size
+        self.max_concurrent_batches = max_concurrent_batches
+        self.run = run
+        self.__queue = None
+        self.__slots = None
+        self.__worker = None
+        self.__batches = set()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of texts waiting to be batched."""
+        return self.__queue.qsize() if self.__queue is not None else 0
+
+    def __ensure_started(self):
+        """Start the batching task on the running event loop if needed."""
+        if self.__worker is None or self.__worker.done():
+            self.__queue = asyncio.Queue()
+            self.__slots = asyncio.Semaphore(self.max_concurrent_batches)
+            # A batch serves many requests, so it must not log under the trace ID of the first one
+            self.__worker = asyncio.get_running_loop().create_task(self.__run(), context=contextvars.Context())
+
+    async def submit(self, text: str) -> dict:
+        """Queue a text for the next batch and wait for its prediction.
+
+        Args:
+            text (str): The text to analyze.
+
+        Returns:
+            dict: The prediction for `text`.
+
+        Raises:
+            QueueFullError: If `max_queue_size` texts are already waiting.
+        """
+        self.__ensure_started()
+        if self.__queue.qsize() >= self.max_queue_size:
+            raise QueueFullError("Micro-batch queue is full.")
+        future = asyncio.get_running_loop().create_future()
+        self.__queue.put_nowait((text, future))
+        return await future
+
+    async def __collect(self) -> list[tuple[str, asyncio.Future]]:
+        """Wait for one pending text, then gather more until the batch is full or the wait expires."""
+        loop = asyncio.get_running_loop()
+        batch = [await self.__queue.get()]
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            try:
+                if timeout <= 0:
+                    batch.append(self.__queue.get_nowait())
+                else:
+                    batch.append(await asyncio.wait_for(self.__queue.get(), timeout))
+            except (asyncio.QueueEmpty, asyncio.TimeoutError):
+                break
+        return batch
+
+    async def __predict(self, batch: list[tuple[str, asyncio.Future]]):
+        """Score one batch off the event loop and resolve its futures."""
+        texts = [text for text, _ in batch]
+        try:
+            if self.run is None:
+                loop = asyncio.get_running_loop()
+                results = await loop.run_in_executor(None, self.predict_batch, texts)
+            else:
+                results = await self.run(self.predict_batch, texts)
+            if len(results) != len(texts):
+                raise RuntimeError(f"predict_batch returned {len(results)} predictions for {len(texts)} texts.")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.__slots.release()
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def __run(self):
+        """Batching loop: wait for a free slot, collect a batch and dispatch it."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.__slots.acquire()
+            try:
+                batch = await self.__collect()
+            except asyncio.CancelledError:
+                self.__slots.release()
+                raise
+            task = loop.create_task(self.__predict(batch))
+            self.__batches.add(task)
+            task.add_done_callback(self.__batches.discard)
+
+    async def close(self):
+        """Stop the batching task, failing any texts still waiting in the queue."""
+        if self.__worker is not None:
+            self.__worker.cancel()
+            try:
+                await self.__worker
+            except asyncio.CancelledError:
+                pass
+            self.__worker = None
+        if self.__batches:
+            await asyncio.gather(*self.__batches, return_exceptions=True)
+        while self.__queue is not None and not self.__queue.empty():
+            _, future = self.__queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher was closed."))
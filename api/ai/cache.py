@@ -0,0 +1,286 @@
+import json
+import os
+import sqlite3
+import time
+import unicodedata
+import weakref
+from array import array
+from collections import OrderedDict
+from hashlib import blake2b, sha256
+from threading import Lock
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes a text so trivially different copies share a cache entry.
+
+    Applies Unicode NFC normalization, trims the ends and collapses runs of
+    whitespace. Casing is kept, since cased models score it differently.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class PredictionCache:
+    """Content-addressed cache of model predictions.
+
+    Entries are keyed on the model name and a SHA-256 hash of the normalized
+    text. The in-memory tier is a bounded LRU with a per-entry TTL. When a
+    `path` is given, entries are also written to a SQLite file, so they
+    survive restarts and are promoted back to memory on their next hit.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 86400, path: str | None = None):
+        """
+        Args:
+            max_entries (int): Maximum number of entries held in memory.
+            ttl_seconds (float): Time an entry stays valid after being stored.
+            path (str, optional): SQLite file for the on-disk tier. Disabled if None.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.path = path
+        self.__entries = OrderedDict()
+        self.__lock = Lock()
+        self.__db_lock = Lock()
+        self.__stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self.__db = None
+        if path:
+            self.__connect()
+            # A SQLite connection must not cross fork; forked workers open their own
+            connect = weakref.WeakMethod(self.__connect)
+
+            def reconnect():
+                method = connect()
+                if method is not None:
+                    method()
+
+            os.register_at_fork(after_in_child=reconnect)
+
+    def __connect(self):
+        """Opens the on-disk tier, creating its table and dropping expired entries."""
+        self.__lock = Lock()
+        # The disk tier has its own lock, so memory lookups never wait on a commit
+        self.__db_lock = Lock()
+        self.__db = sqlite3.connect(self.path, check_same_thread=False)
+        # WAL lets forked workers read while another one commits
+        self.__db.execute("PRAGMA journal_mode=WAL")
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS predictions "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.__db.execute("DELETE FROM predictions WHERE expires_at <= ?", (time.time(),))
+        self.__db.commit()
+
+    @staticmethod
+    def key(model_name: str, text: str) -> str:
+        """Builds the cache key for a text scored by a given model."""
+        digest = sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def get(self, model_name: str, text: str, memory_only: bool = False) -> dict | None:
+        """Returns the cached prediction for `text`, or None on a miss.
+
+        Args:
+            model_name (str): Name of the model that scored the text.
+            text (str): The analyzed text.
+            memory_only (bool): Whether to skip the disk tier, e.g. on the
+                event loop. Such lookups count hits but not misses, which the
+                full lookup that follows counts.
+
+        Returns:
+            dict | None: The cached `predicted_label` and `scores`.
+        """
+        key = self.key(model_name, text)
+        now = time.time()
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self.__entries.move_to_end(key)
+                    self.__stats["memory_hits"] += 1
+                    return value
+                del self.__entries[key]
+            if memory_only:
+                return None
+
+        row = None
+        if self.__db is not None:
+            with self.__db_lock:
+                row = self.__db.execute(
+                    "SELECT value, expires_at FROM predictions WHERE key = ? AND expires_at > ?",
+                    (key, now),
+                ).fetchone()
+
+        with self.__lock:
+            if row is None:
+                self.__stats["misses"] += 1
+                return None
+            value = json.loads(row[0])
+            self.__remember(key, value, row[1])
+            self.__stats["disk_hits"] += 1
+            return value
+
+    def put(self, model_name: str, text: str, prediction: dict):
+        """Stores the prediction of `text` in every tier.
+
+        Args:
+            model_name (str): Name of the model that scored the text.
+            text (str): The analyzed text.
+            prediction (dict): Prediction with `predicted_label`, `scores` and,
+                for long texts, the number of `chunks`.
+        """
+        self.put_many(model_name, [text], [prediction])
+
+    def put_many(self, model_name: str, texts: list[str], predictions: list[dict]):
+        """Stores the predictions of `texts` in every tier, in one disk transaction.
+
+        Args:
+            model_name (str): Name of the model that scored the texts.
+            texts (list[str]): The analyzed texts.
+            predictions (list[dict]): One prediction per text, as in `put`.
+        """
+        expires_at = time.time() + self.ttl_seconds
+        rows = []
+        for text, prediction in zip(texts, predictions):
+            value = {
+                "predicted_label": prediction["predicted_label"],
+                "scores": {label: float(score) for label, score in prediction["scores"].items()},
+            }
+            if "chunks" in prediction:
+                value["chunks"] = prediction["chunks"]
+            rows.append((self.key(model_name, text), value, expires_at))
+        if not rows:
+            return
+
+        with self.__lock:
+            for key, value, expires_at in rows:
+                self.__remember(key, value, expires_at)
+        if self.__db is not None:
+            with self.__db_lock:
+                self.__db.executemany(
+                    "INSERT OR REPLACE INTO predictions (key, value, expires_at) VALUES (?, ?, ?)",
+                    [(key, json.dumps(value), expires_at) for key, value, expires_at in rows],
+                )
+                self.__db.commit()
+
+    def __remember(self, key: str, value: dict, expires_at: float):
+        """Inserts an entry in the memory tier, evicting the least recently used ones."""
+        self.__entries[key] = (expires_at, value)
+        self.__entries.move_to_end(key)
+        while len(self.__entries) > self.max_entries:
+            self.__entries.popitem(last=False)
+            self.__stats["evictions"] += 1
+
+    def clear(self):
+        """Drops every entry from all tiers."""
+        with self.__lock:
+            self.__entries.clear()
+        if self.__db is not None:
+            with self.__db_lock:
+                self.__db.execute("DELETE FROM predictions")
+                self.__db.commit()
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters and current size of the cache."""
+        with self.__lock:
+            hits = self.__stats["memory_hits"] + self.__stats["disk_hits"]
+            lookups = hits + self.__stats["misses"]
+            return {
+                **self.__stats,
+                "hits": hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "size": len(self.__entries),
+                "max_entries": self.max_entries,
+                "disk": self.path,
+            }
+
+
+class TokenCache:
+    """Bounded LRU of tokenizer outputs, keyed by a hash of the raw text.
+
+    Each entry holds the encoded inputs of one text (`input_ids`,
+    `attention_mask`, ...) as compact `array('i')` rows rather than lists of
+    Python ints. Repeated texts then skip tokenization even when their
+    prediction is not cached, e.g. after switching backends or when a caller
+    bypasses the prediction cache. The cache is bounded by the total number of
+    tokens it holds, so long texts cannot blow past its memory. One cache
+    serves one tokenizer.
+    """
+
+    def __init__(self, max_tokens: int = 2000000):
+        """
+        Args:
+            max_tokens (int): Maximum number of tokens held, summed over every
+                text. 0 disables the cache.
+        """
+        self.max_tokens = max_tokens
+        self.__entries = OrderedDict()
+        self.__tokens = 0
+        self.__lock = Lock()
+        self.__stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        """Builds the cache key of a text; tokenization is exact, so the text is not normalized."""
+        return blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+    def get_many(self, texts: list[str]) -> list[dict | None]:
+        """Returns the cached encoding of each text, or None for misses.
+
+        The rows are shared with the cache and must not be modified.
+        """
+        found = []
+        with self.__lock:
+            for text in texts:
+                key = self.key(text)
+                entry = self.__entries.get(key)
+                if entry is None:
+                    self.__stats["misses"] += 1
+                else:
+                    self.__entries.move_to_end(key)
+                    self.__stats["hits"] += 1
+                found.append(entry)
+        return found
+
+    def put_many(self, texts: list[str], encodings: list[dict]) -> list[dict]:
+        """Stores the encoding of each text, evicting the least recently used ones.
+
+        Returns:
+            list[dict]: The encodings as stored, with `array('i')` rows.
+        """
+        compact = [{name: array("i", ids) for name, ids in encoding.items()} for encoding in encodings]
+        if self.max_tokens <= 0:
+            return compact
+        with self.__lock:
+            for text, encoding in zip(texts, compact):
+                key = self.key(text)
+                previous = self.__entries.pop(key, None)
+                if previous is not None:
+                    self.__tokens -= len(previous["input_ids"])
+                self.__entries[key] = encoding
+                self.__tokens += len(encoding["input_ids"])
+            while self.__tokens > self.max_tokens:
+                _, evicted = self.__entries.popitem(last=False)
+                self.__tokens -= len(evicted["input_ids"])
+                self.__stats["evictions"] += 1
+        return compact
+
+    def clear(self):
+        """Drops every entry."""
+        with self.__lock:
+            self.__entries.clear()
+            self.__tokens = 0
+
+    @property
+    def stats(self) -> dict:
+        """Hit/miss counters and current size of the cache."""
+        with self.__lock:
+            lookups = self.__stats["hits"] + self.__stats["misses"]
+            return {
+                **self.__stats,
+                "hit_rate": self.__stats["hits"] / lookups if lookups else 0.0,
+                "size": len(self.__entries),
+                "tokens": self.__tokens,
+                "max_tokens": self.max_tokens,
+            }
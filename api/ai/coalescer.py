@@ -0,0 +1,104 @@
+import asyncio
+from threading import Lock
+from typing import Awaitable, Callable
+from .cache import PredictionCache
+
+
+class RequestCoalescer:
+    """Shares one pending computation between concurrent requests for the same text.
+
+    Texts are keyed like the prediction cache, by model namespace and
+    normalized text. The first request for a key computes it; requests for a
+    key that is already being computed wait for that result instead of
+    scoring the text again, and repeated texts within one call are computed
+    once. The computation runs in its own task, so a caller that disconnects
+    does not cancel it for the others.
+    """
+
+    def __init__(self):
+        self.__pending = {}
+        self.__tasks = set()
+        self.__lock = Lock()
+        self.__stats = {"texts": 0, "in_flight": 0, "duplicates": 0}
+
+    @property
+    def stats(self) -> dict:
+        """Texts seen, texts that joined another request's computation, and repeated texts within a call."""
+        with self.__lock:
+            stats = dict(self.__stats)
+        stats["coalesced"] = stats["in_flight"] + stats["duplicates"]
+        stats["pending"] = len(self.__pending)
+        return stats
+
+    async def run(
+        self,
+        namespace: str,
+        texts: list[str],
+        compute: Callable[[list[str]], Awaitable[list[dict]]],
+    ) -> list[dict]:
+        """Predict `texts`, computing only those no other request is computing already.
+
+        Args:
+            namespace (str): Model the texts are scored with, such as
+                `ModelLoader.cache_namespace`.
+            texts (list[str]): The texts to analyze.
+            compute (Callable): Coroutine function scoring a list of distinct
+                texts and returning one prediction per text, in order.
+
+        Returns:
+            list[dict]: One prediction per text, in the same order as `texts`.
+
+        Raises:
+            Exception: Whatever `compute` raised, for every text it was computing.
+        """
+        loop = asyncio.get_running_loop()
+        keys = [PredictionCache.key(namespace, text) for text in texts]
+        waiting = {}
+        new_keys, new_texts, new_futures = [], [], []
+        in_flight = 0
+        for key, text in zip(keys, texts):
+            if key in waiting:
+                continue
+            if key in self.__pending:
+                in_flight += 1
+            else:
+                self.__pending[key] = loop.create_future()
+                new_keys.append(key)
+                new_texts.append(text)
+                new_futures.append(self.__pending[key])
+            waiting[key] = self.__pending[key]
+        with self.__lock:
+            self.__stats["texts"] += len(texts)
+            self.__stats["in_flight"] += in_flight
+            self.__stats["duplicates"] += len(texts) - len(waiting)
+
+        if new_texts:
+            task = loop.create_task(self.__compute(compute, new_texts, new_keys, new_futures))
+            self.__tasks.add(task)
+            task.add_done_callback(self.__tasks.discard)
+
+        # Shielded, so a cancelled caller leaves the shared futures to the others
+        results = await asyncio.gather(*(asyncio.shield(future) for future in waiting.values()))
+        results = dict(zip(waiting, results))
+        return [{**results[key], "text": text} for key, text in zip(keys, texts)]
+
+    async def __compute(
+        self, compute: Callable, texts: list[str], keys: list[str], futures: list[asyncio.Future]
+    ):
+        """Score the texts of one call and resolve their shared futures."""
+        try:
+            results = await compute(texts)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+                # Retrieved here in case every caller was cancelled meanwhile
+                future.exception()
+        else:
+            for future, result in zip(futures, results):
+                future.set_result(result)
+        finally:
+            for key, future in zip(keys, futures):
+                if not future.done():
+                    future.cancel()
+                if self.__pending.get(key) is future:
+                    del self.__pending[key]
@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+from typing import Callable
+import torch
+
+
+class QueueFullError(RuntimeError):
+    """Raised when inference work is rejected because its queue is full."""
+
+
+class InferenceExecutor:
+    """Bounded worker pool dedicated to CPU-heavy model inference.
+
+    Inference runs on its own threads instead of the event loop's default
+    pool, so it never starves the other routes. At most `max_queue_size` jobs
+    may wait for a worker; beyond that `run` fails fast with a
+    `QueueFullError` so the API can shed load instead of queueing forever.
+    """
+
+    def __init__(self, max_workers: int = 1, max_queue_size: int = 64, torch_threads: int = 0):
+        """
+        Args:
+            max_workers (int): Number of inference threads.
+            max_queue_size (int): Maximum number of jobs waiting for a worker.
+            torch_threads (int): Intra-op threads used by torch. Keeps the torch
+                default if 0.
+        """
+        self.max_workers = max_workers
+        self.max_queue_size = max_queue_size
+        if torch_threads > 0:
+            torch.set_num_threads(torch_threads)
+        self.__pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inference")
+        self.__lock = Lock()
+        self.__waiting = 0
+        self.__running = 0
+        self.__completed = 0
+        self.__rejected = 0
+        self.__wait_times = deque(maxlen=1000)
+
+    async def run(self, func: Callable, *args, **kwargs):
+        """Run `func(*args, **kwargs)` on an inference worker and await its result.
+
+        Raises:
+            QueueFullError: If `max_queue_size` jobs are already waiting.
+        """
+        with self.__lock:
+            if self.__waiting >= self.max_queue_size:
+                self.__rejected += 1
+                raise QueueFullError("Inference queue is full.")
+            self.__waiting += 1
+        enqueued_at = perf_counter()
+        # Logs written by the job keep the caller's context, such as its trace ID
+        context = contextvars.copy_context()
+
+        def job():
+            with self.__lock:
+                self.__waiting -= 1
+                self.__running += 1
+                self.__wait_times.append(perf_counter() - enqueued_at)
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                with self.__lock:
+                    self.__running -= 1
+                    self.__completed += 1
+
+        def release(future):
+            # A job cancelled while queued never runs, so its slot is freed here
+            if future.cancelled():
+                with self.__lock:
+                    self.__waiting -= 1
+
+        try:
+            future = self.__pool.submit(job)
+        except BaseException:
+            with self.__lock:
+                self.__waiting -= 1
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self):
+        """Stop accepting work and wait for running jobs to finish."""
+        self.__pool.shutdown(wait=True, cancel_futures=True)
+
+    @property
+    def stats(self) -> dict:
+        """Queue depth, throughput counters and queue wait times in milliseconds."""
+        with self.__lock:
+            waits = sorted(self.__wait_times)
+            return {
+                "workers": self.max_workers,
+                "torch_threads": torch.get_num_threads(),
+                "queue_depth": self.__waiting,
+                "max_queue_size": self.max_queue_size,
+                "running": self.__running,
+                "completed": self.__completed,
+                "rejected": self.__rejected,
+                "wait_ms": {
+                    "mean": 1000 * sum(waits) / len(waits) if waits else 0.0,
+                    "p95": 1000 * waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    "max": 1000 * waits[-1] if waits else 0.0,
+                },
+            }
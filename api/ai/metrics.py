@@ -0,0 +1,293 @@
+import json
+import logging
+import math
+import os
+from bisect import bisect_left
+from contextvars import ContextVar
+from pathlib import Path
+from threading import Lock
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s trace_id=%(trace_id)s %(message)s"
+
+# Trace ID of the request being handled, set by the request middleware
+trace_id = ContextVar("trace_id", default=None)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class TraceIdFilter(logging.Filter):
+    """Stamps every log record with the trace ID of the request being handled, or `-`."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = trace_id.get() or "-"
+        return True
+
+
+def configure_logging(level: str | int = logging.INFO):
+    """Logs to stderr in `LOG_FORMAT`, so every line carries the trace ID of its request."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+    for handler in logging.getLogger().handlers:
+        if not any(isinstance(existing, TraceIdFilter) for existing in handler.filters):
+            handler.addFilter(TraceIdFilter())
+
+
+def escape_label_value(value) -> str:
+    """Escapes backslashes, double quotes and newlines in a label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: dict) -> str:
+    """Formats label pairs as `{name="value",...}`."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Metric:
+    """Base of the metric families: a name, a help text and values per label set."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        """
+        Args:
+            name (str): Metric name, e.g. `sentiment_api_requests_total`.
+            documentation (str): Help text shown by the exposition.
+            labelnames (tuple[str, ...]): Names of the labels every sample carries.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}.")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        """Returns every sample as (name, labels, value)."""
+        with self._lock:
+            return [
+                (self.name, dict(zip(self.labelnames, key)), value)
+                for key, value in sorted(self._values.items())
+            ]
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set."""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, total: float, **labels):
+        """Sets the count from a running total kept elsewhere, e.g. a cache's counters; it never goes down."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = max(self._values.get(key, 0.0), float(total))
+
+
+class Gauge(Metric):
+    """Value that is set, usually from a snapshot taken at scrape time."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def clear(self):
+        """Drops every label set, e.g. before setting the values of a new snapshot."""
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets per label set."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        """
+        Args:
+            name (str): Metric name, without the `_bucket`/`_sum`/`_count` suffixes.
+            documentation (str): Help text shown by the exposition.
+            labelnames (tuple[str, ...]): Names of the labels every sample carries.
+            buckets (tuple[float, ...]): Ascending upper bounds; `+Inf` is added.
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def samples(self) -> list[tuple[str, dict, float]]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        samples = []
+        for key, (counts, total) in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """Set of metric families rendered together in the Prometheus text format."""
+
+    def __init__(self):
+        self.__metrics = {}
+        self.__lock = Lock()
+
+    def __register(self, metric: Metric) -> Metric:
+        with self.__lock:
+            if metric.name in self.__metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self.__metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self.__register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self.__register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.__register(Histogram(name, documentation, labelnames, buckets))
+
+    def families(self) -> list[dict]:
+        """Returns every metric as a dict with its `name`, `documentation`, `type` and `samples`."""
+        with self.__lock:
+            metrics = list(self.__metrics.values())
+        return [
+            {"name": metric.name, "documentation": metric.documentation, "type": metric.type, "samples": metric.samples()}
+            for metric in metrics
+        ]
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format (version 0.0.4)."""
+        return render_families(self.families())
+
+
+def render_families(families: list[dict]) -> str:
+    """Renders metric families, as returned by `MetricsRegistry.families`, in the Prometheus text format."""
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family['name']} {family['documentation']}")
+        lines.append(f"# TYPE {family['name']} {family['type']}")
+        for name, labels, value in family["samples"]:
+            lines.append(f"{name}{format_labels(labels)} {format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+class SharedMetrics:
+    """Metrics of several worker processes, merged through files in a shared directory.
+
+    Each worker publishes its own families to `worker-<id>.json`. Merging
+    sums counters and histograms over every worker, including workers that
+    have exited, so totals never go backwards; gauges describe a worker's
+    current state, so they are kept per worker under a `worker` label and
+    dropped once the worker is retired.
+    """
+
+    def __init__(self, directory: str):
+        """
+        Args:
+            directory (str): Directory shared by the workers; created if missing.
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __path(self, worker: str) -> Path:
+        return self.directory / f"worker-{worker}.json"
+
+    def clear(self):
+        """Drops the files of every worker, e.g. those left by a previous run."""
+        for path in self.directory.glob("worker-*.json"):
+            path.unlink(missing_ok=True)
+
+    def publish(self, worker: str, families: list[dict]):
+        """Replaces the published families of `worker`."""
+        path = self.__path(worker)
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temporary.write_text(json.dumps(families))
+        temporary.replace(path)
+
+    def retire(self, worker: str):
+        """Drops the gauges of a worker that exited, keeping its counts in the totals."""
+        path = self.__path(worker)
+        try:
+            families = json.loads(path.read_text())
+        except FileNotFoundError:
+            return
+        self.publish(worker, [family for family in families if family["type"] != "gauge"])
+
+    def merged(self) -> list[dict]:
+        """Returns the families of every worker merged into one set, ready for `render_families`."""
+        families = {}
+        for path in sorted(self.directory.glob("worker-*.json")):
+            worker = path.stem.removeprefix("worker-")
+            try:
+                published = json.loads(path.read_text())
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+            for family in published:
+                merged = families.setdefault(family["name"], {**family, "samples": {}})
+                for name, labels, value in family["samples"]:
+                    if family["type"] == "gauge":
+                        labels = {**labels, "worker": worker}
+                    key = (name, tuple(labels.items()))
+                    merged["samples"][key] = merged["samples"].get(key, 0.0) + value
+        return [
+            {**family, "samples": [(name, dict(labels), value) for (name, labels), value in family["samples"].items()]}
+            for family in families.values()
+        ]
+
+
+# Metrics of the API process, updated on the request and inference paths
+metrics_registry = MetricsRegistry()
+REQUESTS = metrics_registry.counter(
+    "sentiment_api_requests_total", "HTTP requests served.", ("method", "route", "status")
+)
+REQUEST_LATENCY = metrics_registry.histogram(
+    "sentiment_api_request_duration_seconds", "Time to answer an HTTP request, until its headers are sent.", ("route",)
+)
+STAGE_LATENCY = metrics_registry.histogram(
+    "sentiment_api_stage_duration_seconds", "Time spent per model call in each stage of the hot path.", ("model", "stage")
+)
+BATCH_SIZE = metrics_registry.histogram(
+    "sentiment_api_batch_size", "Texts scored per model call.", ("model",), buckets=BATCH_SIZE_BUCKETS
+)
+
+
+def observe_inference(timings: dict):
+    """`ModelLoader` timings hook: records one model call's stage timings and batch size."""
+    model = timings["model"]
+    for stage in ("tokenize", "forward", "postprocess"):
+        STAGE_LATENCY.observe(timings[f"{stage}_ms"] / 1000, model=model, stage=stage)
+    BATCH_SIZE.observe(timings["batch_size"], model=model)
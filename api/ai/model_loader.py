@@ -1,8 +1,18 @@
 
 from enum import Enum
-from transformers import AutoModelForSequenceClassification
-from transformers import AutoTokenizer, AutoConfig
-from scipy.special import softmax
+from threading import Lock, local
+from pathlib import Path
+from time import perf_counter
+from typing import Callable, Sequence
+import torch
+from .cache import PredictionCache, TokenCache
+from .backends import (
+    Backend,
+    artifact_dir,
+    load_onnxruntime,
+    load_torch_int8_dynamic,
+    tensor_bytes,
+)
 
 
 class ModelSelection(str, Enum):
@@ -11,39 +21,537 @@ class ModelSelection(str, Enum):
     MULTILINGUAL_BERT = "tabularisai/multilingual-sentiment-analysis"
     
 
+class ChunkAggregation(str, Enum):
+    """How the chunk scores of a long text are combined into one score vector."""
+    MEAN = "mean"
+    MAX = "max"
+    LENGTH_WEIGHTED = "length_weighted"
+
+# Written last by prepare_artifacts.py; its presence marks a complete artifact directory
+MANIFEST_FILE = "manifest.json"
+
+# Characters that end a sentence; long texts are preferably split right after them
+SENTENCE_ENDINGS = ".!?…\n"
+# Architectures numbering positions after the padding index, so the first
+# `pad_token_id + 1` position embeddings never hold a token
+PADDED_POSITION_MODEL_TYPES = {"roberta", "xlm-roberta", "xlm-roberta-xl", "camembert", "longformer"}
+
 
 class ModelLoader:
-    def __init__(self, model:ModelSelection = ModelSelection.MULTILINGUAL_BERT):
-        self.model_name = model.value
+    def __init__(
+        self,
+        model:ModelSelection | str = ModelSelection.MULTILINGUAL_BERT,
+        max_batch_tokens: int = 8192,
+        cache: PredictionCache | None = None,
+        backend: Backend | str = Backend.TORCH,
+        backend_cache_dir: str = "~/.cache/sentiment-api/backends",
+        timings_hook: Callable[[dict], None] | None = None,
+        chunk_overlap_tokens: int = 64,
+        max_chunks: int = 32,
+        token_cache_tokens: int = 2000000,
+        artifacts_dir: str | None = None,
+        intra_op_threads: int = 0,
+    ):
+        self.model_name = model.value if isinstance(model, ModelSelection) else model
+        self.max_batch_tokens = max_batch_tokens
+        self.cache = cache
+        self.backend = Backend(backend)
+        self.backend_cache_dir = backend_cache_dir
+        self.artifacts_dir = artifacts_dir
+        # 0 follows torch's thread count, so every backend uses this process's share of the cores
+        self.intra_op_threads = intra_op_threads
+        self.load_seconds = None
         self.tokenizer = None
         self.config = None
         self.model = None
+        self.timings_hook = timings_hook
+        # Updated from every inference thread, so only touched under the lock
+        self.__stats_lock = Lock()
+        self.__padding_stats = {"real_tokens": 0, "padded_tokens": 0, "unbucketed_padded_tokens": 0}
+        self.__stage_stats = {"calls": 0, "texts": 0, "tokenize": 0.0, "forward": 0.0, "postprocess": 0.0}
+        self.labels = None
+        self.chunk_overlap_tokens = chunk_overlap_tokens
+        self.max_chunks = max_chunks
+        self.__special_tokens = None
+        self.token_cache = TokenCache(token_cache_tokens)
+        # Input tensors reused across batches, one set per inference thread
+        self.__buffers = local()
     
+    @property
+    def source(self) -> Path | None:
+        """Directory of the model's prepared artifacts, or None to resolve it on the Hugging Face hub."""
+        if self.artifacts_dir is None:
+            return None
+        return artifact_dir(self.artifacts_dir, self.model_name)
+
     def load_model(self):
-        """Load the model and tokenizer."""
+        """Load the model and tokenizer on the configured backend.
+
+        With `artifacts_dir`, everything is read from the directory written by
+        `prepare_artifacts.py`, strictly offline: the safetensors weights are
+        memory-mapped and quantized or exported backends use the files
+        prepared next to them. Otherwise the model is resolved on the hub and
+        the int8 and ONNX backends build their artifacts from the fp32 weights
+        on first use, reusing them from `backend_cache_dir` afterwards.
+
+        `transformers` is imported here rather than at module import, so the
+        API answers its liveness probe while the model loads.
+        """
+        start = perf_counter()
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
-            self.config = AutoConfig.from_pretrained(self.model_name)
-            self.model = AutoModelForSequenceClassification.from_pretrained(self.model_name)
+            from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+            source, cache_dir, options = self.model_name, self.backend_cache_dir, {}
+            if self.source is not None:
+                if not (self.source / MANIFEST_FILE).exists():
+                    raise FileNotFoundError(
+                        f"No prepared artifacts in {self.source}; run prepare_artifacts.py first."
+                    )
+                source, cache_dir, options = str(self.source), self.artifacts_dir, {"local_files_only": True}
+
+            # The Rust tokenizer encodes a whole batch in one call, off the GIL
+            self.tokenizer = AutoTokenizer.from_pretrained(source, use_fast=True, **options)
+            if not self.tokenizer.is_fast:
+                raise ValueError(f"{self.model_name} has no fast tokenizer.")
+            self.token_cache.clear()
+            self.config = AutoConfig.from_pretrained(source, **options)
+            self.labels = [self.config.id2label[i] for i in range(len(self.config.id2label))]
+            if self.backend == Backend.TORCH_INT8_DYNAMIC:
+                self.model = load_torch_int8_dynamic(self.model_name, self.config, cache_dir, source=source)
+            elif self.backend == Backend.ONNXRUNTIME:
+                self.model = load_onnxruntime(
+                    self.model_name,
+                    self.tokenizer,
+                    self.config,
+                    cache_dir,
+                    intra_op_threads=self.intra_op_threads or torch.get_num_threads(),
+                    source=source,
+                )
+            else:
+                self.model = AutoModelForSequenceClassification.from_pretrained(source, **options)
         except Exception as e:
             raise RuntimeError(f"Failed to load model: {e}")
-    def predict(self, text: str) -> dict:
-        """Predict sentiment for a given text."""
+        self.load_seconds = perf_counter() - start
+
+    @property
+    def cache_namespace(self) -> str:
+        """Prediction cache namespace; each backend caches its own scores."""
+        if self.backend == Backend.TORCH:
+            return self.model_name
+        return f"{self.model_name}@{self.backend.value}"
+
+    @property
+    def memory_bytes(self) -> int:
+        """Size of the loaded model weights, in bytes."""
+        if self.model is None:
+            return 0
+        if self.backend == Backend.ONNXRUNTIME:
+            return self.model.memory_bytes
+        return tensor_bytes(self.model)
+
+    @property
+    def padding_stats(self) -> dict:
+        """Real tokens fed to the model, and the padded tokens with and without length bucketing."""
+        with self.__stats_lock:
+            return dict(self.__padding_stats)
+
+    @property
+    def padding_ratio(self) -> float:
+        """Share of the tokens fed to the model so far that were padding."""
+        stats = self.padding_stats
+        padded = stats["padded_tokens"]
+        return 1 - stats["real_tokens"] / padded if padded else 0.0
+
+    @property
+    def unbucketed_padding_ratio(self) -> float:
+        """Share of padding the same inputs would have had in one padded batch each."""
+        stats = self.padding_stats
+        padded = stats["unbucketed_padded_tokens"]
+        return 1 - stats["real_tokens"] / padded if padded else 0.0
+
+    def __check_loaded(self):
         if self.tokenizer is None or self.model is None:
             raise RuntimeError("Model and tokenizer must be loaded before prediction.")
 
-        inputs = self.tokenizer(text, return_tensors="pt", truncation=True, padding=True)
-        outputs = self.model(**inputs)
-        scores = outputs.logits.detach().numpy()
-        scores = softmax(scores, axis=1)[0]
-
-        labels = self.config.id2label
-        sentiment = {labels[i]: scores[i] for i in range(len(labels))}
-        predicted_label = max(sentiment, key=sentiment.get)
-        sentiment_prediction_data = {
-            "text": text,
-            "predicted_label": predicted_label,
-            "scores": sentiment
+    @property
+    def stage_stats(self) -> dict:
+        """Calls and texts scored, and the total seconds spent in each stage of the hot path."""
+        with self.__stats_lock:
+            return dict(self.__stage_stats)
+
+    @property
+    def stage_timings(self) -> dict:
+        """Mean time per call spent in each stage of the hot path, in milliseconds."""
+        stats = self.stage_stats
+        calls = stats["calls"]
+        return {
+            f"{stage}_ms": 1000 * stats[stage] / calls if calls else 0.0
+            for stage in ("tokenize", "forward", "postprocess")
         }
-        
-        return sentiment_prediction_data
\ No newline at end of file
+
+    @property
+    def tokenize_share(self) -> float:
+        """Share of the hot path's time spent tokenizing so far."""
+        stats = self.stage_stats
+        total = sum(stats[stage] for stage in ("tokenize", "forward", "postprocess"))
+        return stats["tokenize"] / total if total else 0.0
+
+    def __record(self, timings: dict, texts: int) -> dict:
+        """Add one call's stage timings (seconds) to `stage_stats` and report them in milliseconds."""
+        with self.__stats_lock:
+            self.__stage_stats["calls"] += 1
+            self.__stage_stats["texts"] += texts
+            for stage, seconds in timings.items():
+                self.__stage_stats[stage] += seconds
+        timings_ms = {f"{stage}_ms": 1000 * seconds for stage, seconds in timings.items()}
+        if self.timings_hook is not None:
+            self.timings_hook({**timings_ms, "batch_size": texts, "model": self.cache_namespace})
+        return timings_ms
+
+    def __buffer(self, key: str, size: int) -> torch.Tensor:
+        """Return a reusable int64 buffer of at least `size` elements for input `key`."""
+        buffer = getattr(self.__buffers, key, None)
+        if buffer is None or buffer.numel() < size:
+            buffer = torch.empty(size, dtype=torch.long)
+            setattr(self.__buffers, key, buffer)
+        return buffer[:size]
+
+    def __pad(self, encodings, indices: list[int], length: int) -> dict:
+        """Right-pad the encodings at `indices` to `length` into the reused buffers."""
+        if self.tokenizer.padding_side != "right":
+            features = [{key: list(encodings[key][index]) for key in encodings} for index in indices]
+            return self.tokenizer.pad(features, return_tensors="pt")
+
+        rows = len(indices)
+        inputs = {}
+        for key in encodings:
+            pad_value = 0
+            if key == "input_ids" and self.tokenizer.pad_token_id is not None:
+                pad_value = self.tokenizer.pad_token_id
+            tensor = self.__buffer(key, rows * length).view(rows, length)
+            tensor.fill_(pad_value)
+            for row, index in enumerate(indices):
+                values = encodings[key][index]
+                tensor[row, :len(values)] = torch.as_tensor(values)
+            inputs[key] = tensor
+        return inputs
+
+    def __probabilities(self, inputs, timings: dict) -> torch.Tensor:
+        """Run the model on already tokenized `inputs` and return the class probabilities."""
+        start = perf_counter()
+        with torch.inference_mode():
+            logits = self.model(**inputs).logits
+        forward_done = perf_counter()
+        with torch.inference_mode():
+            probabilities = torch.softmax(logits.float(), dim=-1)
+        timings["forward"] += forward_done - start
+        timings["postprocess"] += perf_counter() - forward_done
+        return probabilities
+
+    def __predictions(self, probabilities: torch.Tensor, texts: list[str], timings: dict) -> list[dict]:
+        """Build one prediction per row of `probabilities`.
+
+        Argmax runs vectorized on the whole tensor, and the scores are
+        returned as plain Python floats.
+        """
+        start = perf_counter()
+        best = probabilities.argmax(dim=-1).tolist()
+        rows = probabilities.tolist()
+        predictions = [
+            {
+                "text": text,
+                "predicted_label": self.labels[label],
+                "scores": dict(zip(self.labels, row)),
+            }
+            for text, label, row in zip(texts, best, rows)
+        ]
+        timings["postprocess"] += perf_counter() - start
+        return predictions
+
+    def __forward(self, inputs, texts: list[str], timings: dict) -> list[dict]:
+        """Run the model on already tokenized `inputs` and build one prediction per text."""
+        return self.__predictions(self.__probabilities(inputs, timings), texts, timings)
+
+    def get_cached(self, text: str, memory_only: bool = False) -> dict | None:
+        """Return the cached prediction for `text` without touching the model, or None.
+
+        With `memory_only`, the disk tier is skipped, so the lookup is safe on the event loop.
+        """
+        if self.cache is None:
+            return None
+        cached = self.cache.get(self.cache_namespace, text, memory_only=memory_only)
+        if cached is None:
+            return None
+        return {"text": text, **cached}
+
+    def predict(self, text: str) -> dict:
+        """Predict sentiment for a given text."""
+        return self.predict_many([text])[0]
+
+    def predict_batch(self, texts: list[str]) -> list[dict]:
+        """Predict sentiment for a list of texts in a single padded forward pass.
+
+        Args:
+            texts (list[str]): The texts to analyze.
+
+        Returns:
+            list[dict]: One prediction per text, in the same order as `texts`.
+        """
+        self.__check_loaded()
+        if not texts:
+            return []
+
+        timings = {"tokenize": 0.0, "forward": 0.0, "postprocess": 0.0}
+        start = perf_counter()
+        inputs = self.tokenizer(texts, return_tensors="pt", truncation=True, padding=True)
+        timings["tokenize"] += perf_counter() - start
+        predictions = self.__forward(inputs, texts, timings)
+        timings_ms = self.__record(timings, len(texts))
+        for prediction in predictions:
+            prediction["timings"] = timings_ms
+        return predictions
+
+    def predict_many(self, texts: list[str], max_batch_tokens: int | None = None, lookup_cache: bool = True) -> list[dict]:
+        """Predict sentiment for many texts using length-bucketed batches.
+
+        Texts found in the prediction cache are answered from it and never
+        reach the model. The remaining texts are sorted by token length and
+        grouped so that each padded batch holds at most `max_batch_tokens`
+        tokens. Short headlines are therefore never padded up to the length of
+        a long description. The padding actually fed to the model is tracked
+        in `padding_stats`.
+
+        Args:
+            texts (list[str]): The texts to analyze.
+            max_batch_tokens (int, optional): Token budget (rows x padded
+                length) per batch. Defaults to `self.max_batch_tokens`.
+            lookup_cache (bool): Whether to look the texts up in the cache
+                first. Callers that already did so pass False; predictions are
+                stored in the cache either way.
+
+        Returns:
+            list[dict]: One prediction per text, in the same order as `texts`.
+        """
+        self.__check_loaded()
+        predictions = [self.get_cached(text) if lookup_cache else None for text in texts]
+        missing = [index for index, prediction in enumerate(predictions) if prediction is None]
+        if not missing:
+            return predictions
+
+        scored = self.__predict_bucketed([texts[index] for index in missing], max_batch_tokens)
+        for index, prediction in zip(missing, scored):
+            predictions[index] = prediction
+        if self.cache is not None:
+            self.cache.put_many(self.cache_namespace, [texts[index] for index in missing], scored)
+        return predictions
+
+    def __predict_bucketed(self, texts: list[str], max_batch_tokens: int | None = None) -> list[dict]:
+        """Score `texts` with the model in length-sorted buckets, keeping their order."""
+        timings = {"tokenize": 0.0, "forward": 0.0, "postprocess": 0.0}
+
+        start = perf_counter()
+        encodings = self.__encode(texts)
+        timings["tokenize"] += perf_counter() - start
+        probabilities = self.__score_encodings(encodings, max_batch_tokens, timings)
+        predictions = self.__predictions(probabilities, texts, timings)
+
+        timings_ms = self.__record(timings, len(texts))
+        for prediction in predictions:
+            prediction["timings"] = timings_ms
+        return predictions
+
+    def __encode(self, texts: list[str]) -> dict[str, list[Sequence[int]]]:
+        """Tokenize `texts` (truncated to the model input), reusing cached token ids.
+
+        Texts missing from `token_cache` are encoded together in one batch
+        call of the fast tokenizer and added to the cache.
+
+        Returns:
+            dict: Each model input name mapped to one row of ids per text.
+        """
+        encoded = self.token_cache.get_many(texts)
+        missing = [index for index, encoding in enumerate(encoded) if encoding is None]
+        if missing:
+            batch = self.tokenizer([texts[index] for index in missing], truncation=True)
+            names = list(batch.keys())
+            fresh = [{name: batch[name][row] for name in names} for row in range(len(missing))]
+            fresh = self.token_cache.put_many([texts[index] for index in missing], fresh)
+            for index, encoding in zip(missing, fresh):
+                encoded[index] = encoding
+        return {name: [encoding[name] for encoding in encoded] for name in encoded[0]}
+
+    def __score_encodings(self, encodings, max_batch_tokens: int | None, timings: dict) -> torch.Tensor:
+        """Return the class probabilities of tokenized inputs, scored in length-sorted buckets.
+
+        Rows are sorted by token length and grouped so that each padded batch
+        holds at most `max_batch_tokens` tokens. The probabilities come back
+        in the order of `encodings`.
+        """
+        budget = max_batch_tokens or self.max_batch_tokens
+        lengths = [len(ids) for ids in encodings["input_ids"]]
+        order = sorted(range(len(lengths)), key=lengths.__getitem__)
+
+        buckets, bucket = [], []
+        for index in order:
+            # Sorted ascending, so the current text sets the padded length
+            if bucket and lengths[index] * (len(bucket) + 1) > budget:
+                buckets.append(bucket)
+                bucket = []
+            bucket.append(index)
+        buckets.append(bucket)
+
+        probabilities = torch.empty(len(lengths), len(self.labels))
+        padded = 0
+        for bucket in buckets:
+            start = perf_counter()
+            inputs = self.__pad(encodings, bucket, lengths[bucket[-1]])
+            timings["tokenize"] += perf_counter() - start
+            probabilities[bucket] = self.__probabilities(inputs, timings)
+            padded += len(bucket) * lengths[bucket[-1]]
+
+        with self.__stats_lock:
+            self.__padding_stats["padded_tokens"] += padded
+            self.__padding_stats["real_tokens"] += sum(lengths)
+            self.__padding_stats["unbucketed_padded_tokens"] += len(lengths) * max(lengths)
+        return probabilities
+
+    def __special_layout(self) -> tuple[list[int], list[int], list[str]]:
+        """Return the special token ids the tokenizer puts before and after a single text, and its input names."""
+        if self.__special_tokens is None:
+            bare = self.tokenizer("a", add_special_tokens=False)["input_ids"]
+            full = self.tokenizer("a")
+            ids = full["input_ids"]
+            position = next(i for i in range(len(ids)) if ids[i:i + len(bare)] == bare)
+            self.__special_tokens = (ids[:position], ids[position + len(bare):], list(full.keys()))
+        return self.__special_tokens
+
+    def __window_size(self) -> int:
+        """Number of text tokens that fit in one model input next to the special tokens."""
+        prefix, suffix, _ = self.__special_layout()
+        limit = self.tokenizer.model_max_length
+        positions = getattr(self.config, "max_position_embeddings", None)
+        if positions and self.config.model_type in PADDED_POSITION_MODEL_TYPES:
+            # e.g. 514 embeddings hold 512 tokens in RoBERTa
+            positions -= (self.config.pad_token_id or 0) + 1
+        if positions and (limit is None or limit > positions):
+            limit = positions
+        return limit - len(prefix) - len(suffix)
+
+    def __chunk_spans(self, offsets: list[tuple[int, int]], text: str) -> list[tuple[int, int]]:
+        """Split a text's tokens into windows that fit the model, preferring sentence boundaries.
+
+        A window that would cut a sentence ends at the last sentence boundary
+        in its second half if there is one. Windows that still cut mid-sentence
+        overlap the next one by `chunk_overlap_tokens` tokens.
+        """
+        window = self.__window_size()
+        count = len(offsets)
+        # Token positions that start a new sentence
+        boundaries = [
+            i for i in range(1, count)
+            if text[offsets[i - 1][1] - 1:offsets[i - 1][1]] in SENTENCE_ENDINGS
+        ]
+        overlap = min(self.chunk_overlap_tokens, window // 2)
+        spans, start = [], 0
+        while start < count and len(spans) < self.max_chunks:
+            end = min(start + window, count)
+            cut_sentence = end < count
+            if cut_sentence:
+                inside = [b for b in boundaries if start + window // 2 < b <= end]
+                if inside:
+                    end, cut_sentence = inside[-1], False
+            spans.append((start, end))
+            if end >= count:
+                break
+            start = end - overlap if cut_sentence else end
+        return spans or [(0, 0)]
+
+    def predict_long(
+        self,
+        texts: list[str],
+        aggregation: ChunkAggregation | str = ChunkAggregation.MEAN,
+        max_batch_tokens: int | None = None,
+        lookup_cache: bool = True,
+    ) -> list[dict]:
+        """Predict sentiment for texts longer than the model's maximum input length.
+
+        Each text is split into windows that fit the model (see
+        `__chunk_spans`), at most `max_chunks` per text. The windows of all
+        texts are scored together in one length-bucketed pass and each text's
+        chunk probabilities are combined into one score vector:
+        `mean` averages them, `length_weighted` weighs each chunk by its
+        number of tokens and `max` takes the per-class maximum, renormalized.
+        Texts that fit in one window get a single chunk and the same scores as
+        `predict_many`.
+
+        Args:
+            texts (list[str]): The texts to analyze.
+            aggregation (ChunkAggregation): How chunk scores are combined.
+            max_batch_tokens (int, optional): Token budget per batch. Defaults
+                to `self.max_batch_tokens`.
+            lookup_cache (bool): Whether to look the texts up in the cache first.
+
+        Returns:
+            list[dict]: One prediction per text, in the same order as `texts`,
+                with the number of scored windows in `chunks`.
+        """
+        self.__check_loaded()
+        aggregation = ChunkAggregation(aggregation)
+        namespace = f"{self.cache_namespace}#long-{aggregation.value}"
+        predictions = [None] * len(texts)
+        if lookup_cache and self.cache is not None:
+            for index, text in enumerate(texts):
+                cached = self.cache.get(namespace, text)
+                if cached is not None:
+                    predictions[index] = {"text": text, **cached}
+        missing = [index for index, prediction in enumerate(predictions) if prediction is None]
+        if not missing:
+            return predictions
+
+        timings = {"tokenize": 0.0, "forward": 0.0, "postprocess": 0.0}
+        start = perf_counter()
+        missing_texts = [texts[index] for index in missing]
+        tokens = self.tokenizer(missing_texts, add_special_tokens=False, return_offsets_mapping=True)
+        prefix, suffix, input_names = self.__special_layout()
+        encodings = {name: [] for name in input_names}
+        owners, weights = [], []
+        for owner, (text, ids, offsets) in enumerate(zip(missing_texts, tokens["input_ids"], tokens["offset_mapping"])):
+            for begin, end in self.__chunk_spans(offsets, text):
+                chunk = prefix + ids[begin:end] + suffix
+                encodings["input_ids"].append(chunk)
+                for name in input_names:
+                    if name == "attention_mask":
+                        encodings[name].append([1] * len(chunk))
+                    elif name != "input_ids":
+                        encodings[name].append([0] * len(chunk))
+                owners.append(owner)
+                weights.append(max(end - begin, 1))
+        timings["tokenize"] += perf_counter() - start
+
+        probabilities = self.__score_encodings(encodings, max_batch_tokens, timings)
+
+        start = perf_counter()
+        owners = torch.tensor(owners)
+        chunks = torch.bincount(owners, minlength=len(missing_texts))
+        combined = torch.zeros(len(missing_texts), len(self.labels))
+        if aggregation == ChunkAggregation.MAX:
+            index = owners[:, None].expand_as(probabilities)
+            combined.scatter_reduce_(0, index, probabilities, "amax", include_self=False)
+            combined /= combined.sum(dim=-1, keepdim=True)
+        else:
+            weights = torch.tensor(weights, dtype=torch.float)
+            if aggregation == ChunkAggregation.MEAN:
+                weights = torch.ones_like(weights)
+            combined.index_add_(0, owners, probabilities * weights[:, None])
+            combined /= torch.zeros(len(missing_texts)).index_add_(0, owners, weights)[:, None]
+        timings["postprocess"] += perf_counter() - start
+
+        scored = self.__predictions(combined, missing_texts, timings)
+        timings_ms = self.__record(timings, len(missing_texts))
+        for index, prediction, count in zip(missing, scored, chunks.tolist()):
+            prediction["chunks"] = count
+            prediction["timings"] = timings_ms
+            predictions[index] = prediction
+        if self.cache is not None:
+            self.cache.put_many(namespace, missing_texts, scored)
+        return predictions
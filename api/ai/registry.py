@@ -0,0 +1,190 @@
+from collections import OrderedDict
+from enum import Enum
+from threading import Lock
+from typing import Callable
+from .model_loader import ModelLoader, ModelSelection
+
+
+class ModelState(str, Enum):
+    """Lifecycle states of a served model."""
+    NOT_LOADED = "not_loaded"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+    OVER_BUDGET = "over_budget"
+
+
+class ModelNotReadyError(RuntimeError):
+    """Raised when a prediction is requested before the model is ready."""
+
+
+class MemoryBudgetError(RuntimeError):
+    """Raised when a model does not fit in the memory budget next to the default model."""
+
+
+class ModelRegistry:
+    """Thread-safe owner of the served `ModelLoader`s and their readiness state.
+
+    Every `ModelSelection` entry can be served. The default model is loaded at
+    startup and always kept; the others are loaded on first use. Each model is
+    loaded exactly once, no matter how many threads call `load` at the same
+    time, and optionally warmed up with a forward pass so the first real
+    request does not pay for lazy initialisation. When the loaded weights
+    exceed `memory_budget_mb`, the least recently used non-default models are
+    unloaded; a non-default model that still does not fit next to the default
+    one is refused with `MemoryBudgetError`. Its measured size is kept, so later
+    requests for it are refused without loading it again.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[ModelSelection], ModelLoader],
+        default: ModelSelection = ModelSelection.MULTILINGUAL_BERT,
+        warmup_texts: list[str] | None = None,
+        memory_budget_mb: float = 0,
+    ):
+        """
+        Args:
+            factory (Callable): Builds an unloaded `ModelLoader` for a model.
+            default (ModelSelection): Model served when a request names none.
+            warmup_texts (list[str], optional): Texts scored once after
+                loading. No warm-up is done if empty or None.
+            memory_budget_mb (float): Memory allowed for loaded weights, in
+                MB. No model is ever unloaded if 0.
+        """
+        self.factory = factory
+        self.default = default
+        self.warmup_texts = warmup_texts or []
+        self.memory_budget_mb = memory_budget_mb
+        self.__models = OrderedDict()
+        self.__states = {model: ModelState.NOT_LOADED for model in ModelSelection}
+        self.__errors = {model: None for model in ModelSelection}
+        # Measured weights of the models refused for the memory budget
+        self.__refused_bytes = {}
+        self.__load_locks = {model: Lock() for model in ModelSelection}
+        self.__lock = Lock()
+
+    def state(self, model: ModelSelection | None = None) -> ModelState:
+        return self.__states[model or self.default]
+
+    @property
+    def ready(self) -> bool:
+        """Whether the default model is ready to serve predictions."""
+        return self.state() == ModelState.READY
+
+    def load(self, model: ModelSelection | None = None) -> ModelLoader:
+        """Load and warm up a model, unless another caller already did.
+
+        Args:
+            model (ModelSelection, optional): Model to load. Defaults to
+                `self.default`.
+
+        Returns:
+            ModelLoader: The loaded model.
+
+        Raises:
+            MemoryBudgetError: If the model does not fit in `memory_budget_mb`.
+            RuntimeError: If loading or warming up the model fails.
+        """
+        model = model or self.default
+        with self.__load_locks[model]:
+            with self.__lock:
+                if self.__states[model] == ModelState.READY:
+                    self.__models.move_to_end(model)
+                    return self.__models[model]
+                if self.__states[model] == ModelState.OVER_BUDGET and not self.__fits(self.__refused_bytes[model]):
+                    raise MemoryBudgetError(self.__errors[model])
+                self.__states[model] = ModelState.LOADING
+                self.__errors[model] = None
+            try:
+                loader = self.factory(model)
+                loader.load_model()
+                if self.warmup_texts:
+                    loader.predict_batch(self.warmup_texts)
+            except Exception as e:
+                with self.__lock:
+                    self.__states[model] = ModelState.FAILED
+                    self.__errors[model] = str(e)
+                raise
+            with self.__lock:
+                self.__models[model] = loader
+                self.__states[model] = ModelState.READY
+                if not self.__evict(keep=model) and model != self.default:
+                    # Dropping the new model is the only way back under the budget
+                    del self.__models[model]
+                    self.__states[model] = ModelState.OVER_BUDGET
+                    self.__refused_bytes[model] = loader.memory_bytes
+                    self.__errors[model] = (
+                        f"{model.name} needs {loader.memory_bytes / 1024 ** 2:.0f} MB and does not fit in "
+                        f"the {self.memory_budget_mb:.0f} MB memory budget next to {self.default.name}."
+                    )
+                    raise MemoryBudgetError(self.__errors[model])
+            return loader
+
+    def __evict(self, keep: ModelSelection) -> bool:
+        """Unload least recently used non-default models until the loaded weights fit the budget.
+
+        Returns:
+            bool: Whether the loaded weights fit the budget.
+        """
+        if not self.memory_budget_mb:
+            return True
+        budget = self.memory_budget_mb * 1024 ** 2
+        for model in list(self.__models):
+            if self.__memory_bytes() <= budget:
+                return True
+            if model in (keep, self.default):
+                continue
+            # Requests already holding the loader finish; the weights are freed after
+            del self.__models[model]
+            self.__states[model] = ModelState.NOT_LOADED
+        return self.__memory_bytes() <= budget
+
+    def __memory_bytes(self) -> int:
+        return sum(loader.memory_bytes for loader in self.__models.values())
+
+    def __fits(self, memory_bytes: int) -> bool:
+        """Whether weights of `memory_bytes` fit the budget next to the default model alone."""
+        default = self.__models.get(self.default)
+        used = default.memory_bytes if default is not None else 0
+        return used + memory_bytes <= self.memory_budget_mb * 1024 ** 2
+
+    def get(self, model: ModelSelection | None = None) -> ModelLoader:
+        """Return a loaded model.
+
+        Args:
+            model (ModelSelection, optional): Model to return. Defaults to
+                `self.default`.
+
+        Raises:
+            ModelNotReadyError: If the model is not loaded, still loading or
+                failed to load.
+        """
+        model = model or self.default
+        with self.__lock:
+            if self.__states[model] != ModelState.READY:
+                raise ModelNotReadyError(f"Model is not ready (state: {self.__states[model].value}).")
+            self.__models.move_to_end(model)
+            return self.__models[model]
+
+    def loaded(self) -> dict[ModelSelection, ModelLoader]:
+        """Ready models, without marking them as recently used."""
+        with self.__lock:
+            return {model: self.__models[model] for model in self.__models if self.__states[model] == ModelState.READY}
+
+    def status(self) -> dict:
+        """Readiness information of the default model and of every served model."""
+        with self.__lock:
+            return {
+                "state": self.__states[self.default].value,
+                "error": self.__errors[self.default],
+                "models": {
+                    model.name: {
+                        "state": self.__states[model].value,
+                        "error": self.__errors[model],
+                        "memory_mb": self.__models[model].memory_bytes / 1024 ** 2 if model in self.__models else 0.0,
+                        "load_seconds": self.__models[model].load_seconds if model in self.__models else None,
+                    }
+                    for model in ModelSelection
+                },
+            }
@@ -1,8 +1,22 @@
 from os import environ
+import logging
+from contextlib import asynccontextmanager
+import asyncio
 from fastapi import FastAPI
 import uvicorn
 from dotenv import load_dotenv
-from routes.predict import predict_router
+from routes.predict import (
+    predict_router,
+    model_registry,
+    sentiment_batchers,
+    inference_executor,
+)
+from routes.health import health_router
+from routes.stream import stream_router
+from routes.stats import stats_router
+from routes.metrics import metrics_router, track_requests
+from ai.metrics import configure_logging
+from config import MODEL_LOAD_RETRY_SECONDS, MODEL_LOAD_RETRY_MAX_SECONDS
 
 # Load environment variables
 load_dotenv()
@@ -10,10 +24,59 @@ load_dotenv()
 # Get environment variables
 PORT=environ.get("PORT")
 
-app = FastAPI(title="Sentiment Prediction API", version="1.0.0")
+# Log lines carry the trace ID sent by the app in X-Request-ID
+configure_logging(environ.get("LOG_LEVEL", "INFO"))
+
+
+logger = logging.getLogger("sentiment_api")
+
+
+async def load_model(
+    retry_seconds: float = MODEL_LOAD_RETRY_SECONDS,
+    max_retry_seconds: float = MODEL_LOAD_RETRY_MAX_SECONDS,
+):
+    """Loads and warms up the model on the inference pool, retrying with backoff until it succeeds.
+
+    A temporary hub or disk error would otherwise leave the API unready
+    for good while /health/live keeps reporting it alive.
+    """
+    delay = retry_seconds
+    while True:
+        try:
+            await inference_executor.run(model_registry.load)
+            return
+        except Exception as e:
+            # The error is kept by the registry and reported by /health/ready
+            logger.warning("model load failed (%s); retrying in %.0f s", e, delay)
+        await asyncio.sleep(delay)
+        delay = min(2 * delay, max_retry_seconds)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Loads the model at startup and stops the inference workers at shutdown.
+
+    Loading runs in the background so /health/live answers right away, while
+    /health/ready only succeeds once the model is warm.
+    """
+    loading = asyncio.create_task(load_model())
+    yield
+    loading.cancel()
+    for batcher in sentiment_batchers.values():
+        await batcher.close()
+    inference_executor.shutdown()
+
+
+app = FastAPI(title="Sentiment Prediction API", version="1.0.0", lifespan=lifespan)
 
 # Include routes
 app.include_router(predict_router)
+app.include_router(stream_router)
+app.include_router(health_router)
+app.include_router(stats_router)
+app.include_router(metrics_router)
+app.middleware("http")(track_requests)
 
 @app.get("/")
 def read_root():
@@ -25,4 +88,3 @@ def read_root():
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=PORT, log_level="info")
-
@@ -0,0 +1,239 @@
+import argparse
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import numpy as np
+import torch
+from ai.model_loader import ModelLoader, ModelSelection
+from ai.backends import Backend
+from config import BACKEND_CACHE_DIR
+from parity_check import DEFAULT_TEXTS
+
+
+TINY_MODEL = "tiny"
+TINY_VOCABULARY = (
+    "i love hate this product it is amazing terrible the a bitcoin market "
+    "o mercado está subindo caindo otimista notícia hoje"
+).split()
+TINY_LABELS = ["Very Negative", "Negative", "Neutral", "Positive", "Very Positive"]
+
+
+def build_tiny_model(directory: str, max_length: int = 64) -> str:
+    """Saves a tiny randomly initialised BERT classifier, a stand-in that needs no download.
+
+    It has the same labels, tokenizer type and output contract as the
+    served models, so every code path runs offline in milliseconds.
+
+    Args:
+        directory (str): Where the model and tokenizer are saved.
+        max_length (int): Maximum input length, in tokens.
+
+    Returns:
+        str: `directory`, loadable by `ModelLoader`.
+    """
+    from tokenizers import Tokenizer, models, normalizers, pre_tokenizers
+    from transformers import BertConfig, BertForSequenceClassification, PreTrainedTokenizerFast
+
+    vocab = {"[PAD]": 0, "[UNK]": 1, "[CLS]": 2, "[SEP]": 3}
+    for word in TINY_VOCABULARY:
+        vocab.setdefault(word, len(vocab))
+
+    tokenizer = Tokenizer(models.WordLevel(vocab=vocab, unk_token="[UNK]"))
+    tokenizer.normalizer = normalizers.Lowercase()
+    tokenizer.pre_tokenizer = pre_tokenizers.Whitespace()
+    PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer,
+        unk_token="[UNK]",
+        pad_token="[PAD]",
+        cls_token="[CLS]",
+        sep_token="[SEP]",
+        model_max_length=max_length,
+    ).save_pretrained(directory)
+
+    config = BertConfig(
+        vocab_size=len(vocab),
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        max_position_embeddings=max_length,
+        num_labels=len(TINY_LABELS),
+        id2label=dict(enumerate(TINY_LABELS)),
+        label2id={label: i for i, label in enumerate(TINY_LABELS)},
+    )
+    BertForSequenceClassification(config).save_pretrained(directory)
+    return directory
+
+
+def benchmark_texts(count: int, seed: int = 0) -> list[str]:
+    """Returns `count` distinct news-like texts, so no cache answers for the model."""
+    rng = np.random.default_rng(seed)
+    texts = []
+    for index in range(count):
+        # One headline, sometimes followed by its description
+        parts = rng.choice(DEFAULT_TEXTS, size=rng.integers(1, 4))
+        texts.append(f"{' '.join(parts)} #{index}")
+    return texts
+
+
+# peak_rss_mb and check_regressions are kept identical to app/benchmark.py: the API and
+# the app are separate projects built into separate images and share no code,
+# so a shared module would have to be copied into both anyway.
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def measure_latency(loader: ModelLoader, texts: list[str]) -> dict:
+    """Scores texts one at a time with `ModelLoader.predict` and returns latency percentiles."""
+    latencies = []
+    for text in texts:
+        start = time.perf_counter()
+        loader.predict(text)
+        latencies.append(1000 * (time.perf_counter() - start))
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {"predict_latency_p50_ms": p50, "predict_latency_p95_ms": p95, "predict_latency_p99_ms": p99}
+
+
+def measure_throughput(loader: ModelLoader, texts: list[str], batch_size: int, concurrency: int) -> float:
+    """Scores `texts` in batches of `batch_size` from `concurrency` threads and returns texts per second."""
+    batches = [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(lambda batch: loader.predict_many(batch, lookup_cache=False), batches))
+    return len(texts) / (time.perf_counter() - start)
+
+
+def run_benchmark(
+    model: str,
+    backend: Backend | str = Backend.TORCH,
+    texts: int = 256,
+    latency_texts: int = 100,
+    batch_sizes: list[int] = (1, 8, 32),
+    concurrency: list[int] = (1, 4),
+) -> dict:
+    """Measures cold start, latency, throughput and memory of one model and backend.
+
+    Args:
+        model (str): Local model directory or Hugging Face model id. Real
+            models are read from the local Hugging Face cache; set
+            HF_HUB_OFFLINE=1 to forbid downloads.
+        backend (Backend): The inference backend.
+        texts (int): Texts scored by each throughput run.
+        latency_texts (int): Texts scored one at a time for the latency percentiles.
+        batch_sizes (list[int]): Batch sizes of the throughput runs.
+        concurrency (list[int]): Numbers of threads of the throughput runs.
+
+    Returns:
+        dict: `environment` describing the run and flat `metrics`. Metric
+            names ending in `_per_second` are better when higher; all
+            others are better when lower.
+    """
+    # No token or prediction cache, so every run measures the full hot path
+    loader = ModelLoader(model, backend=backend, backend_cache_dir=BACKEND_CACHE_DIR, token_cache_tokens=0)
+    start = time.perf_counter()
+    loader.load_model()
+    metrics = {"cold_start_seconds": time.perf_counter() - start}
+
+    sample = benchmark_texts(max(texts, latency_texts))
+    loader.predict_many(sample[:8], lookup_cache=False)
+    metrics.update(measure_latency(loader, sample[:latency_texts]))
+    for batch_size in batch_sizes:
+        for threads in concurrency:
+            key = f"throughput_b{batch_size}_c{threads}_texts_per_second"
+            metrics[key] = measure_throughput(loader, sample[:texts], batch_size, threads)
+    metrics["peak_rss_mb"] = peak_rss_mb()
+
+    return {
+        "environment": {
+            "model": loader.model_name,
+            "backend": loader.backend.value,
+            "python": platform.python_version(),
+            "torch": torch.__version__,
+            "torch_threads": torch.get_num_threads(),
+            "machine": platform.machine(),
+        },
+        "metrics": metrics,
+    }
+
+
+def check_regressions(metrics: dict, baseline: dict, max_regression: float) -> list[dict]:
+    """Lists the metrics that got worse than `baseline` by more than `max_regression`.
+
+    Args:
+        metrics (dict): Metrics of the current run.
+        baseline (dict): Metrics of a previous run. Metrics missing from
+            either side are not compared.
+        max_regression (float): Tolerated relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list[dict]: One entry per regressed metric, with both values and the
+            relative change (positive means worse).
+    """
+    regressions = []
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = (value - reference) / reference
+        if name.endswith("_per_second"):
+            change = -change
+        if change > max_regression:
+            regressions.append({"metric": name, "baseline": reference, "current": value, "change": change})
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Benchmarks the model hot path and optionally fails on regressions against a baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--model",
+        default=TINY_MODEL,
+        help=f"'{TINY_MODEL}' (offline stand-in), a ModelSelection name or a local model directory.",
+    )
+    parser.add_argument("--backend", choices=[backend.value for backend in Backend], default=Backend.TORCH.value)
+    parser.add_argument("--texts", type=int, default=256, help="Texts per throughput run.")
+    parser.add_argument("--latency-texts", type=int, default=100)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", help="Results file of a previous run to compare against.")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Tolerated relative slowdown.")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        model = args.model
+        if model == TINY_MODEL:
+            model = build_tiny_model(directory, max_length=512)
+        elif model in ModelSelection.__members__:
+            model = ModelSelection[model].value
+        results = run_benchmark(
+            model,
+            backend=args.backend,
+            texts=args.texts,
+            latency_texts=args.latency_texts,
+            batch_sizes=args.batch_sizes,
+            concurrency=args.concurrency,
+        )
+    if args.model == TINY_MODEL:
+        results["environment"]["model"] = TINY_MODEL
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        results["regressions"] = check_regressions(results["metrics"], baseline["metrics"], args.max_regression)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+    print(report)
+    return 1 if results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+from os import environ
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Micro-batching of concurrent /analyze/ requests
+BATCH_MAX_SIZE = int(environ.get("BATCH_MAX_SIZE", 32))
+BATCH_MAX_WAIT_MS = float(environ.get("BATCH_MAX_WAIT_MS", 10))
+
+# Token budget (rows x padded length) of each length-bucketed batch
+BATCH_MAX_TOKENS = int(environ.get("BATCH_MAX_TOKENS", 8192))
+
+# Token ids of recently seen texts, kept per model so repeated texts skip
+# tokenization even when their prediction is not cached. Bounded by the total
+# number of tokens held (about 4 bytes each per model input); 0 disables it
+TOKEN_CACHE_MAX_TOKENS = int(environ.get("TOKEN_CACHE_MAX_TOKENS", 2000000))
+
+# Prediction cache; the on-disk tier is only enabled when a path is given
+PREDICTION_CACHE_SIZE = int(environ.get("PREDICTION_CACHE_SIZE", 10000))
+PREDICTION_CACHE_TTL_SECONDS = float(environ.get("PREDICTION_CACHE_TTL_SECONDS", 86400))
+PREDICTION_CACHE_PATH = environ.get("PREDICTION_CACHE_PATH") or None
+
+# Warm-up forward pass run at startup, before the API reports itself ready
+MODEL_WARMUP = environ.get("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")
+# A failed startup load is retried after this delay, doubled up to the maximum
+MODEL_LOAD_RETRY_SECONDS = float(environ.get("MODEL_LOAD_RETRY_SECONDS", 5))
+MODEL_LOAD_RETRY_MAX_SECONDS = float(environ.get("MODEL_LOAD_RETRY_MAX_SECONDS", 300))
+
+# Dedicated inference pool and load shedding
+INFERENCE_WORKERS = int(environ.get("INFERENCE_WORKERS", 1))
+# Per process, for torch and ONNX Runtime sessions alike; with serve.py 0 splits
+# the cores evenly between the workers
+INFERENCE_TORCH_THREADS = int(environ.get("INFERENCE_TORCH_THREADS", 0))
+INFERENCE_QUEUE_SIZE = int(environ.get("INFERENCE_QUEUE_SIZE", 64))
+BATCH_QUEUE_SIZE = int(environ.get("BATCH_QUEUE_SIZE", 1024))
+RETRY_AFTER_SECONDS = int(environ.get("RETRY_AFTER_SECONDS", 1))
+
+# Served models: ModelSelection name of the default model and memory budget
+# (MB) of loaded weights before idle models are unloaded; 0 disables unloading
+DEFAULT_MODEL = environ.get("DEFAULT_MODEL", "MULTILINGUAL_BERT")
+MODEL_MEMORY_BUDGET_MB = float(environ.get("MODEL_MEMORY_BUDGET_MB", 0))
+
+# Inference backend (torch, torch-int8-dynamic or onnxruntime) and the
+# directory where quantized / exported artifacts are built once and reused
+INFERENCE_BACKEND = environ.get("INFERENCE_BACKEND", "torch")
+BACKEND_CACHE_DIR = environ.get("BACKEND_CACHE_DIR", "~/.cache/sentiment-api/backends")
+
+# Worker processes started by serve.py, sharing the model loaded before fork
+SERVE_WORKERS = int(environ.get("SERVE_WORKERS", 1))
+
+# Directory where serve.py workers publish their metrics, so /metrics reports
+# all of them; a temporary one is used when unset. Each worker republishes
+# every METRICS_SYNC_SECONDS, and right before answering a scrape
+METRICS_DIR = environ.get("METRICS_DIR") or None
+METRICS_SYNC_SECONDS = float(environ.get("METRICS_SYNC_SECONDS", 1))
+
+# Directory written by prepare_artifacts.py; when set, models load strictly
+# offline from it instead of resolving them on the Hugging Face hub
+MODEL_ARTIFACTS_DIR = environ.get("MODEL_ARTIFACTS_DIR") or None
+
+# Number of NDJSON lines scored together by /analyze/stream
+STREAM_BATCH_SIZE = int(environ.get("STREAM_BATCH_SIZE", 64))
+STREAM_MAX_LINE_BYTES = int(environ.get("STREAM_MAX_LINE_BYTES", 1024 ** 2))
+
+# Opt-in long-text mode: overlap (tokens) between windows that cut a sentence
+# and the maximum number of windows scored per text
+LONG_TEXT_OVERLAP_TOKENS = int(environ.get("LONG_TEXT_OVERLAP_TOKENS", 64))
+LONG_TEXT_MAX_CHUNKS = int(environ.get("LONG_TEXT_MAX_CHUNKS", 32))
@@ -1 +1,6 @@
-from .requests import SentimentRequest, SentimentResponse
\ No newline at end of file
+from .requests import (
+    SentimentRequest,
+    SentimentResponse,
+    SentimentBatchRequest,
+    SentimentBatchResponse,
+)
\ No newline at end of file
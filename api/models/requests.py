@@ -1,10 +1,29 @@
 from pydantic import BaseModel
+from ai.model_loader import ChunkAggregation, ModelSelection
 
 class SentimentRequest(BaseModel):
     text: str
+    model: ModelSelection | None = None
+    include_timings: bool = False
+    long_text: bool = False
+    chunk_aggregation: ChunkAggregation = ChunkAggregation.MEAN
 
 
 class SentimentResponse(BaseModel):
     text: str
     predicted_label: str
     scores: dict[str, float]
+    timings: dict[str, float] | None = None
+    chunks: int | None = None
+
+
+class SentimentBatchRequest(BaseModel):
+    texts: list[str]
+    model: ModelSelection | None = None
+    include_timings: bool = False
+    long_text: bool = False
+    chunk_aggregation: ChunkAggregation = ChunkAggregation.MEAN
+
+
+class SentimentBatchResponse(BaseModel):
+    results: list[SentimentResponse]
@@ -0,0 +1,49 @@
+import argparse
+import json
+from ai.model_loader import ModelLoader, ModelSelection
+from ai.backends import Backend, check_parity
+from config import BACKEND_CACHE_DIR
+
+
+# Headlines and descriptions in the style of the news the app analyzes
+DEFAULT_TEXTS = [
+    "Bitcoin dispara e atinge nova máxima histórica.",
+    "Ethereum cai 8% após falha em atualização da rede.",
+    "Mercado de criptomoedas fecha a semana sem grandes variações.",
+    "Investidores demonstram otimismo com a aprovação de novos fundos de índice.",
+    "Regulador anuncia investigação sobre corretora por suspeita de fraude.",
+    "Stocks rallied today as inflation data came in lower than expected.",
+    "The company reported disappointing earnings and cut its guidance.",
+    "Analysts expect the market to remain flat through the end of the quarter.",
+]
+
+
+def main():
+    """Reports how closely a backend matches the fp32 torch baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--model", choices=[model.name for model in ModelSelection], default="MULTILINGUAL_BERT")
+    parser.add_argument("--backend", choices=[backend.value for backend in Backend], required=True)
+    parser.add_argument("--texts", help="File with one text per line. Uses built-in samples if omitted.")
+    args = parser.parse_args()
+
+    texts = DEFAULT_TEXTS
+    if args.texts:
+        with open(args.texts, encoding="utf-8") as file:
+            texts = [line.strip() for line in file if line.strip()]
+        if not texts:
+            parser.error(f"{args.texts} has no texts; write one text per line.")
+
+    model = ModelSelection[args.model]
+    reference = ModelLoader(model)
+    reference.load_model()
+    candidate = ModelLoader(model, backend=args.backend, backend_cache_dir=BACKEND_CACHE_DIR)
+    candidate.load_model()
+
+    report = check_parity(reference, candidate, texts)
+    report["reference_memory_mb"] = reference.memory_bytes / 1024 ** 2
+    report["candidate_memory_mb"] = candidate.memory_bytes / 1024 ** 2
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
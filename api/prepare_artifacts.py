@@ -0,0 +1,93 @@
+import argparse
+import json
+import time
+from pathlib import Path
+from ai.model_loader import MANIFEST_FILE, ModelLoader, ModelSelection
+from ai.backends import Backend, artifact_dir, load_onnxruntime, load_torch_int8_dynamic
+
+
+def prepare_artifacts(model_name: str, output_dir: str, backends: list[Backend] = (Backend.TORCH,)) -> Path:
+    """Snapshots a model into a local directory the API loads offline.
+
+    The tokenizer, config and fp32 weights (as safetensors, which are
+    memory-mapped on load) are saved in `artifact_dir(output_dir, model_name)`.
+    For the int8 and ONNX backends, their quantized or exported files are
+    built next to them. The manifest is written last, so an interrupted run
+    never looks complete.
+
+    Args:
+        model_name (str): Hugging Face model id or local directory to snapshot.
+        output_dir (str): Root directory of the artifacts, the API's
+            MODEL_ARTIFACTS_DIR.
+        backends (list[Backend]): Backends to prepare files for.
+
+    Returns:
+        Path: The model's artifact directory.
+    """
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+    directory = artifact_dir(output_dir, model_name)
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / MANIFEST_FILE).unlink(missing_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+    if not tokenizer.is_fast:
+        raise ValueError(f"{model_name} has no fast tokenizer.")
+    tokenizer.save_pretrained(directory)
+    AutoModelForSequenceClassification.from_pretrained(model_name).save_pretrained(directory)
+    # Read back from the snapshot, as the API will, so the backends' fingerprints match
+    config = AutoConfig.from_pretrained(directory)
+
+    for backend in map(Backend, backends):
+        if backend == Backend.TORCH_INT8_DYNAMIC:
+            load_torch_int8_dynamic(model_name, config, output_dir, source=str(directory))
+        elif backend == Backend.ONNXRUNTIME:
+            load_onnxruntime(model_name, tokenizer, config, output_dir, source=str(directory))
+
+    manifest = {
+        "model": model_name,
+        "backends": sorted({Backend(backend).value for backend in backends} | {Backend.TORCH.value}),
+        "files": sorted(path.name for path in directory.iterdir()),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+    (directory / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return directory
+
+
+def main(argv: list[str] | None = None):
+    """Prepares local model artifacts and reports the cold start from them."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--model",
+        nargs="+",
+        default=[model.name for model in ModelSelection],
+        help="ModelSelection names, Hugging Face ids or local directories. Defaults to every served model.",
+    )
+    parser.add_argument(
+        "--backend",
+        nargs="+",
+        choices=[backend.value for backend in Backend],
+        default=[Backend.TORCH.value],
+        help="Backends to prepare files for.",
+    )
+    parser.add_argument("--output-dir", required=True, help="Root directory of the artifacts (MODEL_ARTIFACTS_DIR).")
+    args = parser.parse_args(argv)
+
+    report = []
+    for model in args.model:
+        model_name = ModelSelection[model].value if model in ModelSelection.__members__ else model
+        directory = prepare_artifacts(model_name, args.output_dir, args.backend)
+        for backend in args.backend:
+            loader = ModelLoader(model_name, backend=backend, artifacts_dir=args.output_dir)
+            loader.load_model()
+            report.append({
+                "model": model_name,
+                "backend": backend,
+                "directory": str(directory),
+                "load_seconds": loader.load_seconds,
+            })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
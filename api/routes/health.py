@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from routes.predict import model_registry
+
+
+health_router = APIRouter()
+
+
+@health_router.get("/health/live")
+def liveness() -> dict:
+    """Reports that the API process is up, whether or not the model is loaded."""
+    return {"status": "alive"}
+
+
+@health_router.get("/health/ready")
+def readiness():
+    """Reports whether the model is loaded and warmed up.
+
+    Returns:
+        JSONResponse: 200 once the model is ready to serve predictions,
+            503 while it is still loading or if loading failed.
+    """
+    status = model_registry.status()
+    if not model_registry.ready:
+        return JSONResponse(status_code=503, content=status, headers={"Retry-After": "5"})
+    return status
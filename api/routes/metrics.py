@@ -0,0 +1,164 @@
+import logging
+import os
+from threading import Thread
+from time import perf_counter, sleep
+from uuid import uuid4
+from fastapi import APIRouter, Request, Response
+import routes.predict as predict
+from ai.metrics import (
+    CONTENT_TYPE,
+    REQUESTS,
+    REQUEST_LATENCY,
+    SharedMetrics,
+    metrics_registry,
+    render_families,
+    trace_id,
+)
+from config import METRICS_SYNC_SECONDS
+
+
+TRACE_HEADER = "X-Request-ID"
+
+logger = logging.getLogger("sentiment_api.requests")
+
+metrics_router = APIRouter()
+# Set in serve.py workers, so /metrics reports every worker rather than the one answering
+shared_metrics = None
+
+CACHE_LOOKUPS = metrics_registry.counter(
+    "sentiment_api_prediction_cache_lookups_total", "Prediction cache lookups, by result.", ("result",)
+)
+CACHE_HIT_RATIO = metrics_registry.gauge(
+    "sentiment_api_prediction_cache_hit_ratio", "Share of prediction cache lookups that were hits."
+)
+TOKEN_CACHE_HIT_RATIO = metrics_registry.gauge(
+    "sentiment_api_token_cache_hit_ratio", "Share of token cache lookups that were hits.", ("model",)
+)
+MODEL_MEMORY = metrics_registry.gauge(
+    "sentiment_api_model_memory_bytes", "Memory held by the weights of each loaded model.", ("model",)
+)
+MODEL_LOAD = metrics_registry.gauge(
+    "sentiment_api_model_load_seconds", "Time the last load of each loaded model took.", ("model",)
+)
+PADDING_RATIO = metrics_registry.gauge(
+    "sentiment_api_padding_ratio", "Share of the tokens fed to each model that were padding.", ("model",)
+)
+COALESCED_TEXTS = metrics_registry.counter(
+    "sentiment_api_coalesced_texts_total",
+    "Texts answered by the computation of an identical text, by where that text came from.",
+    ("source",),
+)
+QUEUE_DEPTH = metrics_registry.gauge(
+    "sentiment_api_queue_depth", "Work waiting for the model, by queue.", ("queue",)
+)
+
+
+async def track_requests(request: Request, call_next) -> Response:
+    """HTTP middleware that traces and measures every request.
+
+    The trace ID comes from the `X-Request-ID` header, or a new one is
+    generated. It is echoed in the response and, through `TraceIdFilter`,
+    stamped on every log line written while serving the request, including
+    those of the inference threads, so a slow call from the app can be found
+    here.
+
+    Args:
+        request (Request): The incoming request.
+        call_next: Calls the next handler of the application.
+
+    Returns:
+        Response: The handler's response, with the `X-Request-ID` header.
+    """
+    trace = request.headers.get(TRACE_HEADER) or uuid4().hex
+    token = trace_id.set(trace)
+    start = perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        response.headers[TRACE_HEADER] = trace
+        return response
+    finally:
+        duration = perf_counter() - start
+        # The route template keeps the label set small; unknown paths share one label
+        route = request.scope.get("route")
+        route = getattr(route, "path", "unmatched")
+        REQUESTS.inc(method=request.method, route=route, status=status)
+        REQUEST_LATENCY.observe(duration, route=route)
+        logger.info(
+            "method=%s route=%s status=%s duration_ms=%.1f",
+            request.method, route, status, 1000 * duration,
+        )
+        trace_id.reset(token)
+
+
+def collect_snapshot():
+    """Sets the gauges and counters read from the cache, registry and queues at scrape time."""
+    cache = predict.prediction_cache.stats
+    CACHE_LOOKUPS.set_total(cache["memory_hits"], result="memory_hit")
+    CACHE_LOOKUPS.set_total(cache["disk_hits"], result="disk_hit")
+    CACHE_LOOKUPS.set_total(cache["misses"], result="miss")
+    CACHE_HIT_RATIO.set(cache["hit_rate"])
+
+    for gauge in (TOKEN_CACHE_HIT_RATIO, MODEL_MEMORY, MODEL_LOAD, PADDING_RATIO):
+        gauge.clear()
+    for model, loader in predict.model_registry.loaded().items():
+        TOKEN_CACHE_HIT_RATIO.set(loader.token_cache.stats["hit_rate"], model=model.name)
+        MODEL_MEMORY.set(loader.memory_bytes, model=model.name)
+        MODEL_LOAD.set(loader.load_seconds or 0.0, model=model.name)
+        PADDING_RATIO.set(loader.padding_ratio, model=model.name)
+
+    coalescing = predict.request_coalescer.stats
+    COALESCED_TEXTS.set_total(coalescing["in_flight"], source="in_flight")
+    COALESCED_TEXTS.set_total(coalescing["duplicates"], source="duplicate")
+
+    QUEUE_DEPTH.set(predict.inference_executor.stats["queue_depth"], queue="inference")
+    QUEUE_DEPTH.set(sum(batcher.queue_depth for batcher in predict.sentiment_batchers.values()), queue="batch")
+
+
+def publish_snapshot():
+    """Publishes the metrics of this worker to the shared directory."""
+    collect_snapshot()
+    shared_metrics.publish(str(os.getpid()), metrics_registry.families())
+
+
+def share_metrics(directory: str, interval_seconds: float = METRICS_SYNC_SECONDS):
+    """Makes `/metrics` merge the metrics of every worker sharing `directory`.
+
+    This worker publishes its own metrics there every `interval_seconds`, in
+    a background thread, and before each scrape it answers.
+
+    Args:
+        directory (str): Directory shared by the workers of one server.
+        interval_seconds (float): Time between two publications.
+    """
+    global shared_metrics
+    shared_metrics = SharedMetrics(directory)
+
+    def publish():
+        while True:
+            try:
+                publish_snapshot()
+            except Exception:
+                logger.exception("could not publish the worker metrics")
+            sleep(interval_seconds)
+
+    Thread(target=publish, name="metrics-publisher", daemon=True).start()
+
+
+@metrics_router.get("/metrics")
+def get_metrics() -> Response:
+    """Returns the API metrics in the Prometheus text format.
+
+    Returns:
+        Response: Request counts and latency histograms per route, stage
+            latency and batch size histograms per model, prediction and
+            token cache hit rates, model memory and load time, coalesced
+            texts and queue depths. Under serve.py, counters and histograms
+            are summed over the workers and gauges carry a `worker` label.
+    """
+    if shared_metrics is None:
+        collect_snapshot()
+        return Response(metrics_registry.render(), media_type=CONTENT_TYPE)
+    publish_snapshot()
+    return Response(render_families(shared_metrics.merged()), media_type=CONTENT_TYPE)
@@ -1,23 +1,176 @@
 from fastapi import APIRouter, HTTPException
-from models import SentimentRequest, SentimentResponse
-from ai.model_loader import ModelLoader, ModelSelection
-from functools import wraps
+from fastapi.concurrency import run_in_threadpool
+from models import (
+    SentimentRequest,
+    SentimentResponse,
+    SentimentBatchRequest,
+    SentimentBatchResponse,
+)
+from ai.model_loader import ChunkAggregation, ModelLoader, ModelSelection
+from ai.batcher import MicroBatcher
+from ai.executor import InferenceExecutor, QueueFullError
+from ai.cache import PredictionCache
+from ai.coalescer import RequestCoalescer
+from ai.registry import MemoryBudgetError, ModelRegistry, ModelNotReadyError
+from ai.metrics import observe_inference
+from config import (
+    BATCH_MAX_SIZE,
+    BATCH_MAX_WAIT_MS,
+    BATCH_MAX_TOKENS,
+    PREDICTION_CACHE_SIZE,
+    PREDICTION_CACHE_TTL_SECONDS,
+    PREDICTION_CACHE_PATH,
+    MODEL_WARMUP,
+    DEFAULT_MODEL,
+    MODEL_MEMORY_BUDGET_MB,
+    INFERENCE_BACKEND,
+    BACKEND_CACHE_DIR,
+    INFERENCE_WORKERS,
+    INFERENCE_TORCH_THREADS,
+    INFERENCE_QUEUE_SIZE,
+    BATCH_QUEUE_SIZE,
+    RETRY_AFTER_SECONDS,
+    LONG_TEXT_OVERLAP_TOKENS,
+    LONG_TEXT_MAX_CHUNKS,
+    TOKEN_CACHE_MAX_TOKENS,
+    MODEL_ARTIFACTS_DIR,
+)
+from functools import partial, wraps
 
 
 predict_router = APIRouter()
 
-sentiment_model = None
+# Texts of typical lengths (headline, description) scored once at startup
+WARMUP_TEXTS = [
+    "Bitcoin sobe após anúncio.",
+    "O mercado de criptomoedas fechou a semana em alta, impulsionado pela "
+    "expectativa de novos investimentos institucionais e pela queda dos juros.",
+]
+
+prediction_cache = PredictionCache(
+    max_entries=PREDICTION_CACHE_SIZE,
+    ttl_seconds=PREDICTION_CACHE_TTL_SECONDS,
+    path=PREDICTION_CACHE_PATH,
+)
+model_registry = ModelRegistry(
+    partial(
+        ModelLoader,
+        max_batch_tokens=BATCH_MAX_TOKENS,
+        cache=prediction_cache,
+        backend=INFERENCE_BACKEND,
+        backend_cache_dir=BACKEND_CACHE_DIR,
+        chunk_overlap_tokens=LONG_TEXT_OVERLAP_TOKENS,
+        max_chunks=LONG_TEXT_MAX_CHUNKS,
+        token_cache_tokens=TOKEN_CACHE_MAX_TOKENS,
+        timings_hook=observe_inference,
+        artifacts_dir=MODEL_ARTIFACTS_DIR,
+    ),
+    default=ModelSelection[DEFAULT_MODEL],
+    warmup_texts=WARMUP_TEXTS if MODEL_WARMUP else None,
+    memory_budget_mb=MODEL_MEMORY_BUDGET_MB,
+)
+
+
+def predict_pending(model: ModelSelection, texts: list[str]) -> list[dict]:
+    """Scores a micro-batch of texts that already missed the in-memory prediction cache.
+
+    The disk tier is looked up here, on the inference thread, rather than on the event loop.
+
+    Raises:
+        ModelNotReadyError: If the model was unloaded while the texts were queued.
+    """
+    return model_registry.get(model).predict_many(texts)
+
+
+inference_executor = InferenceExecutor(
+    max_workers=INFERENCE_WORKERS,
+    max_queue_size=INFERENCE_QUEUE_SIZE,
+    torch_threads=INFERENCE_TORCH_THREADS,
+)
+# One micro-batcher per model, all sharing the inference pool and cache
+sentiment_batchers = {}
+# Identical texts in flight at the same time share one computation
+request_coalescer = RequestCoalescer()
+
+
+def get_batcher(model: ModelSelection) -> MicroBatcher:
+    """Returns the micro-batcher of a model, creating it on first use."""
+    if model not in sentiment_batchers:
+        sentiment_batchers[model] = MicroBatcher(
+            partial(predict_pending, model),
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            max_queue_size=BATCH_QUEUE_SIZE,
+            max_concurrent_batches=INFERENCE_WORKERS,
+            run=inference_executor.run,
+        )
+    return sentiment_batchers[model]
+
+
+def to_response(prediction: dict, include_timings: bool = False) -> SentimentResponse:
+    """Builds the response of one prediction, keeping the stage timings only if requested."""
+    prediction = {**prediction, "timings": prediction.get("timings") if include_timings else None}
+    return SentimentResponse(**prediction)
+
+
+async def resolve_model(model: ModelSelection | None) -> ModelLoader:
+    """Returns the requested model, loading it on demand if it is not loaded yet.
+
+    Args:
+        model (ModelSelection, optional): The requested model. Defaults to the
+            registry's default model.
+
+    Raises:
+        HTTPException: 503 if the model does not fit in the memory budget,
+            500 if it could not be loaded.
+    """
+    try:
+        return model_registry.get(model)
+    except ModelNotReadyError:
+        pass
+    try:
+        # Loading takes seconds, so it stays off the inference workers
+        return await run_in_threadpool(model_registry.load, model)
+    except MemoryBudgetError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model loading failed: {e}")
+
+
+def overloaded(e: QueueFullError) -> HTTPException:
+    """Builds the 503 returned when inference work is rejected by a full queue."""
+    return HTTPException(
+        status_code=503,
+        detail=f"Server overloaded: {e}",
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+    )
+
+async def predict_long(
+    sentiment_model: ModelLoader, texts: list[str], aggregation: ChunkAggregation
+) -> list[dict]:
+    """Scores texts in long-text mode, all their chunks in one batched call.
+
+    Raises:
+        HTTPException: 503 if the inference queue is full, 500 if inference fails.
+    """
+    try:
+        return await inference_executor.run(partial(sentiment_model.predict_long, aggregation=aggregation), texts)
+    except QueueFullError as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Long-text inference failed: {e}")
+
 
 def ensure_model_loaded(func):
-    """Decorator to ensure the model is loaded before executing the route."""
+    """Decorator to ensure the model is ready before executing the route."""
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    async def wrapper(*args, **kwargs):
         """
-        Decorator to ensure the model is loaded before executing the route.
+        Decorator to ensure the model is ready before executing the route.
 
-        If the model is not loaded, it will load it and store it in the global
-        variable `sentiment_model`. This allows the model to be reused across
-        different requests.
+        The default model is loaded once at startup by the application
+        lifespan. Until it is loaded and warmed up, requests are rejected with
+        a 503 instead of waiting on (or triggering) the load.
 
         Args:
             *args: Arguments passed to the route function.
@@ -26,38 +179,104 @@ def ensure_model_loaded(func):
         Returns:
             The return value of the route function.
         """
-        global sentiment_model
-        if sentiment_model is None:
-            # Create a model loader and load the model.
-            # Store it in the global variable so it can be reused.
-            sentiment_model = ModelLoader()
-            sentiment_model.load_model()
+        if not model_registry.ready:
+            raise HTTPException(
+                status_code=503,
+                detail=f"Model is not ready (state: {model_registry.state().value}).",
+                headers={"Retry-After": "5"},
+            )
         # Call the route function with the loaded model.
-        return func(*args, **kwargs)
+        return await func(*args, **kwargs)
     return wrapper
 
 
 
 @predict_router.post("/analyze/", response_model=SentimentResponse)
 @ensure_model_loaded
-def analyze_sentiment(request_data: SentimentRequest) -> SentimentResponse:
+async def analyze_sentiment(request_data: SentimentRequest) -> SentimentResponse:
     """Analyzes the sentiment of a given text and returns the sentiment scores.
 
+    Cached texts are answered without touching the model. A text that is
+    already being scored for another request shares that computation. Other
+    concurrent calls are merged by the micro-batcher into a single padded
+    forward pass.
+    With `long_text`, texts longer than the model input are split into
+    chunks that are scored in one batched call and aggregated.
+
     Args:
-        request_data (SentimentRequest): The text to analyze.
+        request_data (SentimentRequest): The text to analyze and, optionally,
+            the model to use.
 
     Returns:
         SentimentResponse: The sentiment scores.
     """
 
+    sentiment_model = await resolve_model(request_data.model)
+    if request_data.long_text:
+        predictions = await predict_long(sentiment_model, [request_data.text], request_data.chunk_aggregation)
+        return to_response(predictions[0], request_data.include_timings)
+
+    # Memory tier only: a disk lookup would block the event loop
+    predictions = sentiment_model.get_cached(request_data.text, memory_only=True)
+    if predictions is not None:
+        return to_response(predictions, request_data.include_timings)
+
+    batcher = get_batcher(request_data.model or model_registry.default)
+
+    async def submit(texts):
+        # Queue the text for the next batch and wait for its scores
+        return [await batcher.submit(texts[0])]
+
     try:
-        # Call the predict method to get the sentiment scores
-        predictions = sentiment_model.predict(request_data.text)
+        predictions, = await request_coalescer.run(sentiment_model.cache_namespace, [request_data.text], submit)
+    except QueueFullError as e:
+        raise overloaded(e)
+    except ModelNotReadyError as e:
+        # The model was unloaded to fit the memory budget while the text was queued
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
     except Exception as e:
         # Raise an HTTPException if the model fails to load
         raise HTTPException(status_code=500, detail=f"Model loading failed: {e}")
 
     # Return the predictions as a SentimentResponse
-    return SentimentResponse(**predictions)
- 
+    return to_response(predictions, request_data.include_timings)
+
+
+@predict_router.post("/analyze/batch", response_model=SentimentBatchResponse)
+@ensure_model_loaded
+async def analyze_sentiment_batch(request_data: SentimentBatchRequest) -> SentimentBatchResponse:
+    """Analyzes the sentiment of a list of texts in as few forward passes as possible.
+
+    Repeated texts are scored once, and texts already being scored for
+    another request share that computation.
+
+    Args:
+        request_data (SentimentBatchRequest): The texts to analyze and,
+            optionally, the model to use.
+
+    Returns:
+        SentimentBatchResponse: The sentiment scores, in the same order as the texts.
+    """
+
+    sentiment_model = await resolve_model(request_data.model)
+    if request_data.long_text:
+        predictions = await predict_long(sentiment_model, request_data.texts, request_data.chunk_aggregation)
+        return SentimentBatchResponse(
+            results=[to_response(prediction, request_data.include_timings) for prediction in predictions]
+        )
+
+    try:
+        # Length-bucketed batches keep padding low for mixed-length texts
+        predictions = await request_coalescer.run(
+            sentiment_model.cache_namespace,
+            request_data.texts,
+            partial(inference_executor.run, sentiment_model.predict_many),
+        )
+    except QueueFullError as e:
+        raise overloaded(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model loading failed: {e}")
 
+    return SentimentBatchResponse(
+        results=[to_response(prediction, request_data.include_timings) for prediction in predictions]
+    )
@@ -0,0 +1,44 @@
+from fastapi import APIRouter
+import routes.predict as predict
+
+
+stats_router = APIRouter()
+
+
+@stats_router.get("/stats/")
+def get_stats() -> dict:
+    """Returns runtime statistics about the sentiment model.
+
+    Returns:
+        dict: Hit/miss counters of the prediction cache, texts coalesced with
+            an identical one, queue depth and wait times of the inference pool
+            and, for every loaded model, its memory, the padding statistics of its length-bucketed batches, its
+            token cache counters and the mean time spent tokenizing, in the
+            forward pass and post-processing, with the tokenization share.
+    """
+    stats = {
+        "cache": predict.prediction_cache.stats,
+        "coalescing": predict.request_coalescer.stats,
+        "inference": {
+            **predict.inference_executor.stats,
+            "batch_queue_depth": sum(
+                batcher.queue_depth for batcher in predict.sentiment_batchers.values()
+            ),
+        },
+    }
+    stats["models"] = predict.model_registry.status()["models"]
+    # loaded() leaves the LRU order alone, so polling stats never changes which model is evicted
+    for model, loader in predict.model_registry.loaded().items():
+        stats["models"][model.name]["padding"] = {
+            **loader.padding_stats,
+            "padding_ratio": loader.padding_ratio,
+            "unbucketed_padding_ratio": loader.unbucketed_padding_ratio,
+        }
+        stats["models"][model.name]["stages"] = {
+            "calls": loader.stage_stats["calls"],
+            "texts": loader.stage_stats["texts"],
+            **loader.stage_timings,
+            "tokenize_share": loader.tokenize_share,
+        }
+        stats["models"][model.name]["token_cache"] = loader.token_cache.stats
+    return stats
@@ -0,0 +1,167 @@
+import asyncio
+import json
+from typing import AsyncIterator
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from ai.model_loader import ModelLoader, ModelSelection
+from ai.executor import QueueFullError
+from config import STREAM_BATCH_SIZE, STREAM_MAX_LINE_BYTES, RETRY_AFTER_SECONDS
+from routes.predict import (
+    ensure_model_loaded,
+    inference_executor,
+    request_coalescer,
+    resolve_model,
+    to_response,
+)
+
+
+stream_router = APIRouter()
+
+
+class NDJSONStreamingResponse(StreamingResponse):
+    """Streaming response that leaves the request body to the body iterator.
+
+    `StreamingResponse` watches for disconnects by reading `receive`, which
+    would swallow the request body chunks the iterator is still consuming.
+    Here the iterator reads the body itself and detects disconnects.
+    """
+
+    media_type = "application/x-ndjson"
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await self.stream_response(send)
+        except OSError:
+            raise ClientDisconnect()
+
+
+async def read_ndjson_texts(
+    request: Request, max_line_bytes: int = STREAM_MAX_LINE_BYTES
+) -> AsyncIterator[tuple[str | None, str | None]]:
+    """Yields `(text, error)` for each line of an NDJSON request body, as it arrives.
+
+    A line may be a JSON string or an object with a `text` field. Lines that
+    cannot be parsed yield an error message instead of a text. Lines longer
+    than `max_line_bytes` also yield an error, and are dropped as they
+    arrive, so one unterminated line never grows the buffer without limit.
+    """
+    buffer = b""
+    # Inside an overlong line, whose error was already yielded
+    skipping = False
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False
+            elif len(line) > max_line_bytes:
+                yield None, f"Line exceeds {max_line_bytes} bytes."
+            elif line.strip():
+                yield parse_line(line)
+        if len(buffer) > max_line_bytes:
+            if not skipping:
+                yield None, f"Line exceeds {max_line_bytes} bytes."
+            skipping = True
+            buffer = b""
+    if buffer.strip() and not skipping:
+        yield parse_line(buffer)
+
+
+def parse_line(line: bytes) -> tuple[str | None, str | None]:
+    """Extracts the text of one NDJSON line, or an error message."""
+    try:
+        item = json.loads(line)
+    except ValueError as e:
+        return None, f"Invalid JSON: {e}"
+    if isinstance(item, dict):
+        item = item.get("text")
+    if not isinstance(item, str):
+        return None, "Each line must be a JSON string or an object with a 'text' field."
+    return item, None
+
+
+async def score(sentiment_model: ModelLoader, texts: list[str]) -> list[dict]:
+    """Scores one batch on the inference pool, waiting while the queue is full.
+
+    Repeated texts and texts already being scored for another request are
+    not scored again.
+    """
+
+    async def compute(texts):
+        return await inference_executor.run(sentiment_model.predict_many, texts)
+
+    # Retried outside the coalescer, so requests sharing these texts are not
+    # held in a computation that is only waiting for room in the queue
+    while True:
+        try:
+            return await request_coalescer.run(sentiment_model.cache_namespace, texts, compute)
+        except QueueFullError:
+            await asyncio.sleep(RETRY_AFTER_SECONDS)
+
+
+async def score_rows(
+    request: Request,
+    sentiment_model: ModelLoader,
+    include_timings: bool,
+) -> AsyncIterator[str]:
+    """Scores the incoming texts in batches and yields one NDJSON row per line.
+
+    At most `STREAM_BATCH_SIZE` lines are held at a time, and the next lines
+    are only read once the previous rows were sent. Work stops as soon as the
+    client disconnects. If a batch cannot be scored, each of its lines gets
+    an error row and the following batches are still scored.
+    """
+
+    async def flush(entries):
+        texts = [text for text, error in entries if error is None]
+        try:
+            predictions = iter(await score(sentiment_model, texts) if texts else [])
+        except Exception as e:
+            # The headers are already sent, so the failure is reported in the batch's rows
+            failure = f"Inference failed: {e}"
+            entries = [(None, error or failure) for _, error in entries]
+        rows = []
+        for text, error in entries:
+            if error is not None:
+                rows.append(json.dumps({"error": error}))
+            else:
+                rows.append(to_response(next(predictions), include_timings).model_dump_json())
+        return "\n".join(rows) + "\n"
+
+    entries = []
+    try:
+        async for entry in read_ndjson_texts(request, STREAM_MAX_LINE_BYTES):
+            entries.append(entry)
+            if len(entries) >= STREAM_BATCH_SIZE:
+                yield await flush(entries)
+                entries = []
+    except ClientDisconnect:
+        return
+    if entries and not await request.is_disconnected():
+        yield await flush(entries)
+
+
+@stream_router.post("/analyze/stream", response_class=NDJSONStreamingResponse)
+@ensure_model_loaded
+async def analyze_sentiment_stream(
+    request: Request,
+    model: ModelSelection | None = None,
+    include_timings: bool = False,
+) -> NDJSONStreamingResponse:
+    """Scores a newline-delimited JSON stream of texts and streams the results back.
+
+    Each request line is a JSON string or an object with a `text` field. Each
+    response line is a `SentimentResponse`, in the same order as the request
+    lines, or an object with an `error` field for lines that could not be read.
+
+    Args:
+        request (Request): The NDJSON request.
+        model (ModelSelection, optional): Model to use. Defaults to the default model.
+        include_timings (bool): Whether to include the stage timings in each row.
+
+    Returns:
+        NDJSONStreamingResponse: The streamed predictions.
+    """
+    sentiment_model = await resolve_model(model)
+    return NDJSONStreamingResponse(score_rows(request, sentiment_model, include_timings))
@@ -0,0 +1,164 @@
+import argparse
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from os import environ
+import torch
+import uvicorn
+from ai.backends import Backend
+from ai.metrics import SharedMetrics, configure_logging
+from config import INFERENCE_BACKEND, INFERENCE_TORCH_THREADS, METRICS_DIR, SERVE_WORKERS
+
+
+logger = logging.getLogger("sentiment_api.serve")
+
+# A worker crashing again within this time after starting doubles the wait
+# before the next restart, up to the maximum; a worker that ran longer resets it
+RESTART_SECONDS = 1
+RESTART_MAX_SECONDS = 60
+HEALTHY_WORKER_SECONDS = 60
+
+
+def worker_torch_threads(workers: int, torch_threads: int = 0) -> int:
+    """Intra-op torch threads of each worker: `torch_threads`, or the cores split evenly between workers."""
+    if torch_threads > 0:
+        return torch_threads
+    return max(1, (os.cpu_count() or 1) // max(workers, 1))
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    """Opens the listening socket shared by every worker."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def preload():
+    """Loads and warms up the default model in the parent process, before any worker forks.
+
+    Workers inherit the weights through fork. Nothing writes to them
+    afterwards, so their pages stay shared copy-on-write, and memory grows
+    only by each worker's activations and Python objects. An ONNX Runtime
+    session is the exception: its thread pool is sized when it is created and
+    does not survive fork, so each worker creates its own session instead.
+    """
+    from routes.predict import model_registry
+
+    # With one thread torch never starts its OpenMP pool, which forked children can't reuse
+    torch.set_num_threads(1)
+    if Backend(INFERENCE_BACKEND) == Backend.ONNXRUNTIME:
+        logger.info("onnxruntime backend; each worker loads its own session")
+    else:
+        model_registry.load()
+    # Objects alive now are never collected, so the collector doesn't dirty their shared pages
+    gc.collect()
+    gc.freeze()
+
+
+def restart_delay(crashes: int, delay_seconds: float = RESTART_SECONDS, max_seconds: float = RESTART_MAX_SECONDS) -> float:
+    """Wait before restarting a worker after `crashes` consecutive early exits."""
+    return min(delay_seconds * 2 ** max(crashes - 1, 0), max_seconds)
+
+
+def run_worker(sock: socket.socket, torch_threads: int, log_level: str, metrics_dir: str):
+    """Serves the API on the shared socket in a forked worker."""
+    torch.set_num_threads(torch_threads)
+    from app import app
+    from routes.metrics import share_metrics
+
+    share_metrics(metrics_dir)
+
+    server = uvicorn.Server(uvicorn.Config(app, log_level=log_level))
+    server.run(sockets=[sock])
+
+
+def main(argv: list[str] | None = None):
+    """Serves the API from several worker processes that share one copy of the model."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=int(environ.get("PORT") or 8000))
+    parser.add_argument("--workers", type=int, default=SERVE_WORKERS, help="Worker processes (SERVE_WORKERS).")
+    parser.add_argument(
+        "--torch-threads",
+        type=int,
+        default=INFERENCE_TORCH_THREADS,
+        help="Torch threads per worker (INFERENCE_TORCH_THREADS). Defaults to the cores split between workers.",
+    )
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    torch_threads = worker_torch_threads(args.workers, args.torch_threads)
+    sock = bind_socket(args.host, args.port)
+    metrics_dir = METRICS_DIR or tempfile.mkdtemp(prefix="sentiment-api-metrics-")
+    shared_metrics = SharedMetrics(metrics_dir)
+    shared_metrics.clear()
+    preload()
+    logger.info("model loaded; starting %d workers with %d torch threads each", args.workers, torch_threads)
+
+    workers = {}
+    stopping = False
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            code = 1
+            try:
+                run_worker(sock, torch_threads, args.log_level, metrics_dir)
+                code = 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                logger.exception("worker %d failed", os.getpid())
+            finally:
+                # Skips the parent's atexit handlers and buffers inherited through fork
+                os._exit(code)
+        workers[pid] = time.monotonic()
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in list(workers):
+            os.kill(pid, signal.SIGTERM)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for _ in range(args.workers):
+        spawn()
+
+    crashes = 0
+    while workers:
+        pid, status = os.wait()
+        started = workers.pop(pid)
+        shared_metrics.retire(str(pid))
+        if stopping:
+            continue
+        crashes = crashes + 1 if time.monotonic() - started < HEALTHY_WORKER_SECONDS else 1
+        delay = restart_delay(crashes)
+        # The model is still loaded here, so a replacement starts in seconds
+        logger.warning(
+            "worker %d exited with code %d; restarting it in %.0f s",
+            pid, os.waitstatus_to_exitcode(status), delay,
+        )
+        deadline = time.monotonic() + delay
+        while not stopping and time.monotonic() < deadline:
+            time.sleep(0.1)
+        if not stopping:
+            spawn()
+    sock.close()
+    if METRICS_DIR is None:
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    configure_logging(environ.get("LOG_LEVEL", "INFO"))
+    main()
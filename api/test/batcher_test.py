@@ -0,0 +1,77 @@
+import asyncio
+from ai.batcher import MicroBatcher
+
+
+def fake_predict_batch(calls):
+    """Builds a predict_batch stub that records the size of every batch it runs."""
+    def predict_batch(texts):
+        calls.append(len(texts))
+        return [{"text": text, "predicted_label": text.upper(), "scores": {}} for text in texts]
+    return predict_batch
+
+
+def test_concurrent_submits_are_merged_in_order():
+    """Concurrent submits share one batch and each caller gets its own result."""
+    calls = []
+    batcher = MicroBatcher(fake_predict_batch(calls), max_batch_size=8, max_wait_ms=50)
+
+    async def run():
+        texts = [f"text {i}" for i in range(5)]
+        results = await asyncio.gather(*(batcher.submit(text) for text in texts))
+        await batcher.close()
+        return texts, results
+
+    texts, results = asyncio.run(run())
+    assert [result["text"] for result in results] == texts
+    assert calls == [5]
+
+
+def test_batches_are_capped_at_max_batch_size():
+    """Texts beyond max_batch_size go to the following batch."""
+    calls = []
+    batcher = MicroBatcher(fake_predict_batch(calls), max_batch_size=2, max_wait_ms=50)
+
+    async def run():
+        results = await asyncio.gather(*(batcher.submit(str(i)) for i in range(5)))
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+    assert [result["text"] for result in results] == ["0", "1", "2", "3", "4"]
+    assert calls == [2, 2, 1]
+
+
+def test_prediction_errors_reach_every_caller():
+    """A failing batch raises in every request that was part of it."""
+    def failing_predict_batch(texts):
+        raise ValueError("boom")
+
+    batcher = MicroBatcher(failing_predict_batch, max_batch_size=4, max_wait_ms=10)
+
+    async def run():
+        results = await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+
+def test_missing_predictions_fail_the_batch():
+    """A batch scored with fewer predictions than texts fails every caller instead of leaving some waiting."""
+    def short_predict_batch(texts):
+        return [{"text": texts[0], "predicted_label": "A", "scores": {}}]
+
+    batcher = MicroBatcher(short_predict_batch, max_batch_size=4, max_wait_ms=10)
+
+    async def run():
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit("a"), batcher.submit("b"), return_exceptions=True), timeout=5
+        )
+        await batcher.close()
+        return results
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,41 @@
+import json
+import benchmark
+
+
+def test_benchmark_reports_every_metric(tiny_model_dir):
+    results = benchmark.run_benchmark(tiny_model_dir, texts=16, latency_texts=5, batch_sizes=[1, 8], concurrency=[2])
+    metrics = results["metrics"]
+    assert set(metrics) == {
+        "cold_start_seconds",
+        "predict_latency_p50_ms",
+        "predict_latency_p95_ms",
+        "predict_latency_p99_ms",
+        "throughput_b1_c2_texts_per_second",
+        "throughput_b8_c2_texts_per_second",
+        "peak_rss_mb",
+    }
+    assert all(value > 0 for value in metrics.values())
+    assert metrics["predict_latency_p50_ms"] <= metrics["predict_latency_p99_ms"]
+
+
+def test_regressions_respect_the_direction_of_each_metric():
+    baseline = {"predict_latency_p50_ms": 10.0, "throughput_b8_c1_texts_per_second": 100.0, "peak_rss_mb": 500.0}
+    current = {"predict_latency_p50_ms": 13.0, "throughput_b8_c1_texts_per_second": 130.0, "peak_rss_mb": 510.0}
+    assert [r["metric"] for r in benchmark.check_regressions(current, baseline, 0.2)] == ["predict_latency_p50_ms"]
+
+    current["throughput_b8_c1_texts_per_second"] = 70.0
+    regressed = benchmark.check_regressions(current, baseline, 0.2)
+    assert [r["metric"] for r in regressed] == ["predict_latency_p50_ms", "throughput_b8_c1_texts_per_second"]
+
+
+def test_cli_fails_on_regression(tmp_path, capsys):
+    arguments = ["--texts", "8", "--latency-texts", "3", "--batch-sizes", "4", "--concurrency", "1"]
+    output = tmp_path / "results.json"
+    assert benchmark.main([*arguments, "--output", str(output)]) == 0
+    results = json.loads(output.read_text())
+    assert results["environment"]["model"] == "tiny"
+
+    # A baseline that is impossibly fast makes the run fail
+    baseline = {"metrics": {name: value / 100 for name, value in results["metrics"].items()}}
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+    assert benchmark.main([*arguments, "--baseline", str(tmp_path / "baseline.json")]) == 1
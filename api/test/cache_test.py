@@ -0,0 +1,71 @@
+from ai.cache import PredictionCache, TokenCache
+
+
+PREDICTION = {"predicted_label": "Positive", "scores": {"Negative": 0.1, "Positive": 0.9}}
+
+
+def test_normalized_texts_share_an_entry():
+    """Whitespace differences do not create new cache entries."""
+    cache = PredictionCache()
+    cache.put("model", "Bitcoin  sobe\n hoje", PREDICTION)
+    assert cache.get("model", " Bitcoin sobe hoje ") == PREDICTION
+    assert cache.get("other-model", "Bitcoin sobe hoje") is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(max_entries=2)
+    cache.put("model", "a", PREDICTION)
+    cache.put("model", "b", PREDICTION)
+    cache.get("model", "a")
+    cache.put("model", "c", PREDICTION)
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") == PREDICTION
+    assert cache.stats["evictions"] == 1
+
+
+def test_expired_entries_are_misses():
+    cache = PredictionCache(ttl_seconds=0)
+    cache.put("model", "a", PREDICTION)
+    assert cache.get("model", "a") is None
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Entries written to SQLite are found by a new cache on the same file."""
+    path = str(tmp_path / "predictions.sqlite3")
+    PredictionCache(path=path).put("model", "a", PREDICTION)
+    cache = PredictionCache(path=path)
+    assert cache.get("model", "a") == PREDICTION
+    assert cache.stats["disk_hits"] == 1
+    assert cache.get("model", "a") == PREDICTION
+    assert cache.stats["memory_hits"] == 1
+
+
+def test_put_many_writes_a_batch_to_every_tier(tmp_path):
+    path = str(tmp_path / "predictions.sqlite3")
+    cache = PredictionCache(path=path)
+    cache.put_many("model", ["a", "b"], [PREDICTION, {**PREDICTION, "chunks": 2}])
+    assert cache.get("model", "b") == {**PREDICTION, "chunks": 2}
+
+    restarted = PredictionCache(path=path)
+    # Only the memory tier is checked, and the miss is left to the full lookup
+    assert restarted.get("model", "a", memory_only=True) is None
+    assert restarted.stats["misses"] == 0
+    assert restarted.get("model", "a") == PREDICTION
+    assert restarted.get("model", "a", memory_only=True) == PREDICTION
+    assert restarted.stats["disk_hits"] == 1
+
+
+def test_token_cache_evicts_least_recently_used_texts():
+    """The cache is bounded by the tokens it holds and stores compact integer arrays."""
+    cache = TokenCache(max_tokens=4)
+    cache.put_many(["a", "b"], [{"input_ids": [1, 1]}, {"input_ids": [2]}])
+    cache.get_many(["a"])
+    cache.put_many(["c"], [{"input_ids": [3, 3]}])
+    found = cache.get_many(["a", "b", "c"])
+    assert [entry and entry["input_ids"].tolist() for entry in found] == [[1, 1], None, [3, 3]]
+    assert found[0]["input_ids"].typecode == "i"
+    assert cache.stats["evictions"] == 1
+    assert cache.stats["hits"] == 3
+    assert cache.stats["tokens"] == 4
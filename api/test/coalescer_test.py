@@ -0,0 +1,83 @@
+import asyncio
+from ai.coalescer import RequestCoalescer
+
+
+def fake_compute(calls, delay=0.05):
+    """Builds a compute stub that records every list of texts it scores."""
+    async def compute(texts):
+        calls.append(list(texts))
+        await asyncio.sleep(delay)
+        return [{"text": text, "predicted_label": text.strip().upper(), "scores": {}} for text in texts]
+    return compute
+
+
+def test_concurrent_requests_share_one_computation():
+    """Requests for a text already being scored wait for it instead of scoring it again."""
+    calls = []
+    coalescer = RequestCoalescer()
+
+    async def run():
+        return await asyncio.gather(
+            coalescer.run("model", ["bitcoin sobe"], fake_compute(calls)),
+            coalescer.run("model", ["bitcoin  sobe "], fake_compute(calls)),
+            coalescer.run("model", ["bitcoin cai", "bitcoin sobe"], fake_compute(calls)),
+            coalescer.run("other-model", ["bitcoin sobe"], fake_compute(calls)),
+        )
+
+    results = asyncio.run(run())
+    assert calls == [["bitcoin sobe"], ["bitcoin cai"], ["bitcoin sobe"]]
+    # Each caller gets the prediction under its own text
+    assert results[1] == [{"text": "bitcoin  sobe ", "predicted_label": "BITCOIN SOBE", "scores": {}}]
+    assert [result["predicted_label"] for result in results[2]] == ["BITCOIN CAI", "BITCOIN SOBE"]
+    assert coalescer.stats == {
+        "texts": 5, "in_flight": 2, "duplicates": 0, "coalesced": 2, "pending": 0
+    }
+
+
+def test_repeated_texts_in_a_call_are_scored_once():
+    calls = []
+    coalescer = RequestCoalescer()
+    texts = ["a", "b", "a", "A", "b"]
+    results = asyncio.run(coalescer.run("model", texts, fake_compute(calls, delay=0)))
+    assert calls == [["a", "b", "A"]]
+    assert [result["text"] for result in results] == texts
+    assert coalescer.stats["duplicates"] == 2
+
+
+def test_errors_reach_every_waiting_request():
+    """A failing computation raises in every request sharing it, and the text can be retried."""
+    async def failing_compute(texts):
+        await asyncio.sleep(0.05)
+        raise ValueError("boom")
+
+    calls = []
+    coalescer = RequestCoalescer()
+
+    async def run():
+        results = await asyncio.gather(
+            coalescer.run("model", ["a"], failing_compute),
+            coalescer.run("model", ["a"], fake_compute(calls)),
+            return_exceptions=True,
+        )
+        return results, await coalescer.run("model", ["a"], fake_compute(calls, delay=0))
+
+    results, retried = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert calls == [["a"]]
+    assert retried[0]["predicted_label"] == "A"
+
+
+def test_cancelled_request_does_not_cancel_the_others():
+    calls = []
+    coalescer = RequestCoalescer()
+
+    async def run():
+        first = asyncio.ensure_future(coalescer.run("model", ["a"], fake_compute(calls)))
+        second = asyncio.ensure_future(coalescer.run("model", ["a"], fake_compute(calls)))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    result = asyncio.run(run())
+    assert result[0]["predicted_label"] == "A"
+    assert calls == [["a"]]
@@ -0,0 +1,8 @@
+import pytest
+from benchmark import build_tiny_model
+
+
+@pytest.fixture(scope="session")
+def tiny_model_dir(tmp_path_factory):
+    """Builds a tiny randomly initialised BERT classifier on disk, so tests run offline."""
+    return build_tiny_model(str(tmp_path_factory.mktemp("tiny_model")))
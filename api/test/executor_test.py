@@ -0,0 +1,64 @@
+import asyncio
+from threading import Event
+import pytest
+from ai.executor import InferenceExecutor, QueueFullError
+
+
+def test_run_returns_result_and_records_wait():
+    executor = InferenceExecutor(max_workers=1, max_queue_size=4)
+    result = asyncio.run(executor.run(sum, [1, 2, 3]))
+    stats = executor.stats
+    executor.shutdown()
+    assert result == 6
+    assert stats["completed"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_full_queue_rejects_new_work():
+    """Once max_queue_size jobs wait behind a busy worker, new work fails fast."""
+    executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+    release = Event()
+
+    async def run():
+        busy = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+        await asyncio.sleep(0)
+        with pytest.raises(QueueFullError):
+            await executor.run(lambda: "rejected")
+        release.set()
+        return await asyncio.gather(busy, queued)
+
+    assert asyncio.run(run()) == [True, "queued"]
+    assert executor.stats["rejected"] == 1
+    executor.shutdown()
+
+
+def test_cancelled_queued_jobs_free_their_slots():
+    """A caller that goes away while its job is queued does not keep the slot for good."""
+    executor = InferenceExecutor(max_workers=1, max_queue_size=2)
+    release = Event()
+
+    async def run():
+        busy = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        queued = [asyncio.ensure_future(executor.run(lambda: "queued")) for _ in range(2)]
+        await asyncio.sleep(0)
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        depth = executor.stats["queue_depth"]
+        release.set()
+        await busy
+        return depth, await executor.run(lambda: "after")
+
+    assert asyncio.run(run()) == (0, "after")
+    executor.shutdown()
+
+
+def test_submit_failure_frees_its_slot():
+    executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+    executor.shutdown()
+    with pytest.raises(RuntimeError):
+        asyncio.run(executor.run(lambda: None))
+    assert executor.stats["queue_depth"] == 0
@@ -0,0 +1,113 @@
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from ai.executor import InferenceExecutor
+from ai.metrics import (
+    MetricsRegistry,
+    SharedMetrics,
+    TraceIdFilter,
+    metrics_registry,
+    observe_inference,
+    render_families,
+)
+from routes.metrics import metrics_router, track_requests
+
+
+def test_histograms_render_cumulative_buckets():
+    registry = MetricsRegistry()
+    latency = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    requests = registry.counter("requests_total", "Requests.", ("route",))
+    for value in (0.05, 0.5, 5.0):
+        latency.observe(value, route="/a")
+    requests.inc(route='/a"b')
+
+    text = registry.render()
+    assert '# TYPE latency_seconds histogram' in text
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in text
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{route="/a"} 3' in text
+    assert 'requests_total{route="/a\\"b"} 1.0' in text
+
+
+def test_shared_metrics_sum_counts_and_keep_gauges_per_worker(tmp_path):
+    shared = SharedMetrics(str(tmp_path))
+    for worker, requests_served in (("1", 2), ("2", 3)):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.", ("route",)).inc(requests_served, route="/a")
+        registry.histogram("latency_seconds", "Latency.", buckets=(1.0,)).observe(0.5)
+        registry.gauge("queue_depth", "Queue depth.").set(requests_served)
+        shared.publish(worker, registry.families())
+
+    text = render_families(shared.merged())
+    assert 'requests_total{route="/a"} 5.0' in text
+    assert 'latency_seconds_bucket{le="1.0"} 2' in text
+    assert 'queue_depth{worker="1"} 2.0' in text
+    assert 'queue_depth{worker="2"} 3.0' in text
+
+    # An exited worker still counts in the totals, but its gauges are gone
+    shared.retire("2")
+    text = render_families(shared.merged())
+    assert 'requests_total{route="/a"} 5.0' in text
+    assert 'queue_depth{worker="2"}' not in text
+
+
+def test_counters_set_from_running_totals_never_go_down():
+    registry = MetricsRegistry()
+    lookups = registry.counter("lookups_total", "Lookups.", ("result",))
+    lookups.set_total(3, result="hit")
+    lookups.set_total(2, result="hit")
+    assert 'lookups_total{result="hit"} 3.0' in registry.render()
+
+
+def test_requests_are_traced_and_counted():
+    app = FastAPI()
+    app.include_router(metrics_router)
+    app.middleware("http")(track_requests)
+
+    @app.get("/items/{item}")
+    def item(item: str):
+        return {"item": item}
+
+    client = TestClient(app)
+    response = client.get("/items/1", headers={"X-Request-ID": "abc123"})
+    assert response.headers["X-Request-ID"] == "abc123"
+    assert len(client.get("/items/2").headers["X-Request-ID"]) == 32
+
+    observe_inference({"tokenize_ms": 1.0, "forward_ms": 4.0, "postprocess_ms": 0.5, "batch_size": 3, "model": "m"})
+    text = client.get("/metrics").text
+    assert 'sentiment_api_requests_total{method="GET",route="/items/{item}",status="200"} 2.0' in text
+    assert 'sentiment_api_stage_duration_seconds_count{model="m",stage="forward"}' in text
+    assert 'sentiment_api_batch_size_bucket{model="m",le="4.0"}' in text
+    assert "sentiment_api_prediction_cache_hit_ratio" in text
+    assert '# TYPE sentiment_api_coalesced_texts_total counter' in text
+    assert 'sentiment_api_coalesced_texts_total{source="in_flight"}' in text
+    assert 'sentiment_api_prediction_cache_lookups_total{result="miss"}' in text
+    assert metrics_registry.render().endswith("\n")
+
+
+def test_log_lines_carry_the_trace_id_of_their_request():
+    """Records written while serving a request, on the inference pool too, get its trace ID."""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    handler.addFilter(TraceIdFilter())
+    logger = logging.getLogger("sentiment_api.test_trace")
+    logger.addHandler(handler)
+    executor = InferenceExecutor()
+
+    app = FastAPI()
+    app.middleware("http")(track_requests)
+
+    @app.get("/work")
+    async def work():
+        await executor.run(logger.warning, "scored")
+        return {}
+
+    try:
+        TestClient(app).get("/work", headers={"X-Request-ID": "abc123"})
+        logger.warning("outside")
+    finally:
+        logger.removeHandler(handler)
+        executor.shutdown()
+    assert [(record.getMessage(), record.trace_id) for record in records] == [("scored", "abc123"), ("outside", "-")]
@@ -0,0 +1,249 @@
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import pytest
+from benchmark import build_tiny_model
+from prepare_artifacts import prepare_artifacts
+from ai.cache import PredictionCache
+from ai.backends import Backend, check_parity
+from ai.model_loader import ModelLoader
+
+
+TEXTS = [
+    "bitcoin",
+    "o mercado está subindo e o bitcoin está otimista hoje " * 4,
+    "i love this product",
+    "the market is terrible",
+    "hoje",
+]
+
+
+@pytest.fixture(scope="module")
+def loader(tiny_model_dir):
+    loader = ModelLoader(tiny_model_dir, max_batch_tokens=64)
+    loader.load_model()
+    return loader
+
+
+def test_predict_many_keeps_input_order(loader):
+    """Bucketed predictions come back in the original order with the same scores."""
+    predictions = loader.predict_many(TEXTS)
+    assert [prediction["text"] for prediction in predictions] == TEXTS
+    for text, prediction in zip(TEXTS, predictions):
+        single = loader.predict(text)
+        assert prediction["predicted_label"] == single["predicted_label"]
+        for label, score in single["scores"].items():
+            assert prediction["scores"][label] == pytest.approx(score, abs=1e-5)
+
+
+def test_predict_many_reduces_padding(loader):
+    """Mixing short and long texts pads less than one unsorted batch would."""
+    loader.predict_many(TEXTS)
+    assert loader.padding_ratio < loader.unbucketed_padding_ratio
+
+
+def test_predict_many_empty(loader):
+    assert loader.predict_many([]) == []
+
+
+def test_cached_texts_skip_the_model(tiny_model_dir):
+    """A second pass over the same texts is answered entirely from the cache."""
+    loader = ModelLoader(tiny_model_dir, cache=PredictionCache())
+    loader.load_model()
+    first = loader.predict_many(TEXTS)
+    real_tokens = loader.padding_stats["real_tokens"]
+    second = loader.predict_many(TEXTS)
+    assert loader.padding_stats["real_tokens"] == real_tokens
+    assert [p["predicted_label"] for p in second] == [p["predicted_label"] for p in first]
+    assert loader.cache.stats["hits"] == len(TEXTS)
+
+
+@pytest.mark.parametrize("backend", [Backend.TORCH_INT8_DYNAMIC, Backend.ONNXRUNTIME])
+def test_backends_match_the_fp32_baseline(loader, tiny_model_dir, tmp_path, backend):
+    """Quantized and exported backends keep the output contract and agree with fp32."""
+    if backend == Backend.ONNXRUNTIME:
+        pytest.importorskip("onnxruntime")
+    candidate = ModelLoader(tiny_model_dir, backend=backend, backend_cache_dir=str(tmp_path))
+    candidate.load_model()
+    report = check_parity(loader, candidate, TEXTS)
+    assert report["max_score_deviation"] < 0.05
+    assert set(candidate.predict(TEXTS[0])["scores"]) == set(loader.predict(TEXTS[0])["scores"])
+
+    # The second load reuses the artifacts built by the first one
+    reloaded = ModelLoader(tiny_model_dir, backend=backend, backend_cache_dir=str(tmp_path))
+    reloaded.load_model()
+    assert check_parity(candidate, reloaded, TEXTS)["max_score_deviation"] < 1e-5
+
+
+def test_onnx_session_uses_the_process_thread_count(tiny_model_dir, tmp_path):
+    """The ONNX session follows the torch threads of the process unless told otherwise."""
+    pytest.importorskip("onnxruntime")
+    torch = pytest.importorskip("torch")
+    threads = torch.get_num_threads()
+    try:
+        torch.set_num_threads(2)
+        loader = ModelLoader(tiny_model_dir, backend=Backend.ONNXRUNTIME, backend_cache_dir=str(tmp_path))
+        loader.load_model()
+    finally:
+        torch.set_num_threads(threads)
+    assert loader.model.session.get_session_options().intra_op_num_threads == 2
+
+    loader = ModelLoader(
+        tiny_model_dir, backend=Backend.ONNXRUNTIME, backend_cache_dir=str(tmp_path), intra_op_threads=1
+    )
+    loader.load_model()
+    assert loader.model.session.get_session_options().intra_op_num_threads == 1
+
+
+def test_parity_needs_texts(loader):
+    with pytest.raises(ValueError, match="at least one text"):
+        check_parity(loader, loader, [])
+
+
+def test_changed_weights_rebuild_backend_artifacts(tiny_model_dir, tmp_path):
+    """Artifacts are keyed on their inputs, so new weights never reuse stale int8 files."""
+    model_dir = tmp_path / "model"
+    shutil.copytree(tiny_model_dir, model_dir)
+    cache_dir = tmp_path / "cache"
+    ModelLoader(str(model_dir), backend=Backend.TORCH_INT8_DYNAMIC, backend_cache_dir=str(cache_dir)).load_model()
+    [first] = (cache_dir / str(model_dir).strip("/").replace("/", "--")).glob("torch-int8-dynamic-*.pt")
+
+    build_tiny_model(str(model_dir))
+    ModelLoader(str(model_dir), backend=Backend.TORCH_INT8_DYNAMIC, backend_cache_dir=str(cache_dir)).load_model()
+    [second] = first.parent.glob("torch-int8-dynamic-*.pt")
+    assert second != first
+
+
+def test_predictions_use_plain_floats_and_report_timings(tiny_model_dir):
+    """Scores are plain floats and every call reports its per-stage timings."""
+    reported = []
+    loader = ModelLoader(tiny_model_dir, timings_hook=reported.append)
+    loader.load_model()
+    predictions = loader.predict_many(TEXTS)
+    assert all(type(score) is float for p in predictions for score in p["scores"].values())
+    assert set(predictions[0]["timings"]) == {"tokenize_ms", "forward_ms", "postprocess_ms"}
+    assert reported[0]["batch_size"] == len(TEXTS)
+    assert loader.stage_stats["calls"] == 1
+
+
+def test_stats_count_every_call_from_concurrent_threads(tiny_model_dir):
+    loader = ModelLoader(tiny_model_dir, token_cache_tokens=0)
+    loader.load_model()
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: loader.predict_many(TEXTS, lookup_cache=False), range(64)))
+    single = ModelLoader(tiny_model_dir)
+    single.load_model()
+    single.predict_many(TEXTS)
+    assert loader.stage_stats["calls"] == 64
+    assert loader.stage_stats["texts"] == 64 * len(TEXTS)
+    assert loader.padding_stats == {key: 64 * value for key, value in single.padding_stats.items()}
+
+
+LONG_TEXT = " ".join(
+    f"o mercado está subindo hoje e o bitcoin está otimista {'.' if i % 2 else 'e'}" for i in range(40)
+)
+
+
+def test_short_texts_are_one_chunk_with_predict_many_scores(loader):
+    """Texts that fit in the model input are scored exactly like predict_many."""
+    short = TEXTS[2:]
+    for aggregation in ("mean", "max", "length_weighted"):
+        predictions = loader.predict_long(short, aggregation=aggregation, lookup_cache=False)
+        for prediction, single in zip(predictions, loader.predict_many(short)):
+            assert prediction["chunks"] == 1
+            for label, score in single["scores"].items():
+                assert prediction["scores"][label] == pytest.approx(score, abs=1e-5)
+
+
+@pytest.mark.parametrize("aggregation", ["mean", "max", "length_weighted"])
+def test_long_texts_are_chunked_and_aggregated(loader, aggregation):
+    """A text longer than the model input is split, scored in one call and combined into one vector."""
+    predictions = loader.predict_long([LONG_TEXT, "bitcoin"], aggregation=aggregation)
+    assert [prediction["text"] for prediction in predictions] == [LONG_TEXT, "bitcoin"]
+    assert predictions[0]["chunks"] > 1
+    assert predictions[1]["chunks"] == 1
+    assert sum(predictions[0]["scores"].values()) == pytest.approx(1.0, abs=1e-5)
+    assert predictions[0]["predicted_label"] == max(predictions[0]["scores"], key=predictions[0]["scores"].get)
+
+
+def test_long_texts_respect_the_chunk_limit(tiny_model_dir):
+    loader = ModelLoader(tiny_model_dir, max_chunks=2, cache=PredictionCache())
+    loader.load_model()
+    first = loader.predict_long([LONG_TEXT * 5])[0]
+    assert first["chunks"] == 2
+    # The cache keeps the chunk count and separates aggregations from plain predictions
+    assert loader.predict_long([LONG_TEXT * 5])[0]["chunks"] == 2
+    assert loader.cache.stats["hits"] == 1
+    assert "chunks" not in loader.predict_many([LONG_TEXT * 5])[0]
+
+
+def test_long_texts_fit_roberta_position_embeddings(tiny_model_dir, tmp_path):
+    """RoBERTa-style models lose `pad_token_id + 1` positions, which chunks must leave out."""
+    from transformers import RobertaConfig, RobertaForSequenceClassification
+
+    model_dir = tmp_path / "roberta"
+    shutil.copytree(tiny_model_dir, model_dir)
+    tiny = ModelLoader(tiny_model_dir)
+    tiny.load_model()
+    config = RobertaConfig(
+        vocab_size=tiny.config.vocab_size,
+        hidden_size=16,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=32,
+        max_position_embeddings=34,
+        pad_token_id=1,
+        id2label=tiny.config.id2label,
+        label2id=tiny.config.label2id,
+    )
+    RobertaForSequenceClassification(config).save_pretrained(model_dir)
+
+    loader = ModelLoader(str(model_dir), chunk_overlap_tokens=0)
+    loader.load_model()
+    # No sentence boundaries, so every chunk but the last is a full window
+    prediction = loader.predict_long(["bitcoin " * 90])[0]
+
+    # 32 usable positions minus [CLS] and [SEP] leave 30 text tokens per chunk
+    assert prediction["chunks"] == 3
+    assert sum(prediction["scores"].values()) == pytest.approx(1.0, abs=1e-5)
+
+
+def test_repeated_texts_skip_tokenization(tiny_model_dir):
+    """Without a prediction cache, a second pass reuses the token ids and scores the same."""
+    loader = ModelLoader(tiny_model_dir)
+    loader.load_model()
+    assert loader.tokenizer.is_fast
+    first = loader.predict_many(TEXTS)
+    second = loader.predict_many(TEXTS)
+    assert loader.token_cache.stats["hits"] == len(TEXTS)
+    assert [p["scores"] for p in second] == pytest.approx([p["scores"] for p in first])
+    assert 0 < loader.tokenize_share < 1
+
+
+def test_prepared_artifacts_load_offline(loader, tiny_model_dir, tmp_path):
+    """A snapshot from prepare_artifacts loads without the original source and scores the same."""
+    prepare_artifacts(tiny_model_dir, str(tmp_path), [Backend.TORCH_INT8_DYNAMIC])
+    prepared = ModelLoader(tiny_model_dir, artifacts_dir=str(tmp_path))
+    prepared.load_model()
+    assert prepared.source.parent == tmp_path
+    assert prepared.load_seconds > 0
+    assert check_parity(loader, prepared, TEXTS)["max_score_deviation"] < 1e-5
+
+    built = sorted(prepared.source.glob("torch-int8-dynamic-*.pt"))
+    quantized = ModelLoader(tiny_model_dir, backend=Backend.TORCH_INT8_DYNAMIC, artifacts_dir=str(tmp_path))
+    quantized.load_model()
+    assert check_parity(loader, quantized, TEXTS)["max_score_deviation"] < 0.05
+    # The prepared int8 weights are reused, not rebuilt
+    assert sorted(prepared.source.glob("torch-int8-dynamic-*.pt")) == built and len(built) == 1
+
+    with pytest.raises(RuntimeError, match="prepare_artifacts"):
+        ModelLoader(tiny_model_dir, artifacts_dir=str(tmp_path / "missing")).load_model()
+
+
+def test_transformers_is_imported_only_when_a_model_loads():
+    code = "import sys, app; print('transformers' in sys.modules)"
+    api_dir = Path(__file__).resolve().parents[1]
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=api_dir)
+    assert result.stdout.strip() == "False"
@@ -1,40 +1,52 @@
+import pytest
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from api.routes.predict import predict_router
-from models import SentimentRequest
+import routes.predict as predict
+from ai.model_loader import ModelLoader
+from ai.registry import ModelRegistry
+from routes.predict import predict_router
 
-client = TestClient(predict_router)
 
-def test_analyze_sentiment_positive():
-    """Test analyze_sentiment with positive sentiment text."""
-    request_data = SentimentRequest(text="I love this product! It's amazing.")
-    response = client.post("/analyze/", json=request_data.dict())
+@pytest.fixture
+def client(tiny_model_dir, monkeypatch):
+    """Serves the prediction routes with the tiny model as the default model."""
+    registry = ModelRegistry(lambda model: ModelLoader(tiny_model_dir))
+    monkeypatch.setattr(predict, "model_registry", registry)
+    monkeypatch.setattr(predict, "sentiment_batchers", {})
+    app = FastAPI()
+    app.include_router(predict_router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_analyze_sentiment(client):
+    """The response holds the scores of every label, and the label is the highest one."""
+    predict.model_registry.load()
+    response = client.post("/analyze/", json={"text": "I love this product! It's amazing."})
     assert response.status_code == 200
     response_data = response.json()
-    assert "label" in response_data
-    assert "confidence" in response_data
-    assert response_data["label"] == "positive"
-
-def test_analyze_sentiment_negative():
-    """Test analyze_sentiment with negative sentiment text."""
-    request_data = SentimentRequest(text="I hate this product. It's terrible.")
-    response = client.post("/analyze/", json=request_data.dict())
+    assert response_data["text"] == "I love this product! It's amazing."
+    assert set(response_data["scores"]) == set(predict.model_registry.get().labels)
+    assert response_data["predicted_label"] == max(response_data["scores"], key=response_data["scores"].get)
+
+
+def test_analyze_sentiment_batch_keeps_the_order(client):
+    predict.model_registry.load()
+    texts = ["I hate this product. It's terrible.", "bitcoin", "I love this product! It's amazing."]
+    response = client.post("/analyze/batch", json={"texts": texts})
     assert response.status_code == 200
-    response_data = response.json()
-    assert "label" in response_data
-    assert "confidence" in response_data
-    assert response_data["label"] == "negative"
-
-def test_analyze_sentiment_empty_text():
-    """Test analyze_sentiment with empty text."""
-    request_data = SentimentRequest(text="")
-    response = client.post("/analyze/", json=request_data.dict())
+    assert [result["text"] for result in response.json()["results"]] == texts
+
+
+def test_analyze_sentiment_missing_text(client):
+    predict.model_registry.load()
+    response = client.post("/analyze/", json={})
     assert response.status_code == 422  # Unprocessable Entity for invalid input
 
-def test_analyze_sentiment_model_not_loaded():
-    """Test analyze_sentiment when the model is not loaded."""
-    global sentiment_model
-    sentiment_model = None  # Simulate model not being loaded
-    request_data = SentimentRequest(text="This is a test.")
-    response = client.post("/analyze/", json=request_data.dict())
-    assert response.status_code == 500
-    assert "Model loading failed" in response.json()["detail"]
\ No newline at end of file
+
+def test_analyze_sentiment_model_not_ready(client):
+    """Until the default model is loaded, requests are refused with a 503 to retry later."""
+    response = client.post("/analyze/", json={"text": "This is a test."})
+    assert response.status_code == 503
+    assert "not ready" in response.json()["detail"]
+    assert response.headers["Retry-After"]
@@ -0,0 +1,136 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from ai.cache import TokenCache
+from ai.model_loader import ModelSelection
+from ai.registry import MemoryBudgetError, ModelRegistry, ModelState, ModelNotReadyError
+
+
+class FakeModel:
+    """Stand-in for ModelLoader that counts loads and warm-up calls."""
+    loads = 0
+
+    def __init__(self, model, fail=False, memory_mb=100):
+        self.model_name = model.value
+        self.fail = fail
+        self.memory_bytes = memory_mb * 1024 ** 2
+        self.warmed_up_with = None
+        self.load_seconds = None
+
+    def load_model(self):
+        FakeModel.loads += 1
+        time.sleep(0.05)
+        if self.fail:
+            raise RuntimeError("Failed to load model: offline")
+        self.load_seconds = 0.05
+
+    def predict_batch(self, texts):
+        self.warmed_up_with = texts
+        return []
+
+
+def test_concurrent_loads_build_one_model():
+    """Callers racing on load() all get the same, single model instance."""
+    FakeModel.loads = 0
+    registry = ModelRegistry(FakeModel, warmup_texts=["warm up"])
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        models = list(executor.map(lambda _: registry.load(), range(4)))
+    assert FakeModel.loads == 1
+    assert all(model is models[0] for model in models)
+    assert models[0].warmed_up_with == ["warm up"]
+    assert registry.ready and registry.get() is models[0]
+
+
+def test_get_before_load_is_not_ready():
+    registry = ModelRegistry(FakeModel)
+    with pytest.raises(ModelNotReadyError):
+        registry.get()
+    assert registry.status()["state"] == "not_loaded"
+
+
+def test_failed_load_is_reported():
+    registry = ModelRegistry(lambda model: FakeModel(model, fail=True))
+    with pytest.raises(RuntimeError):
+        registry.load()
+    assert registry.state() == ModelState.FAILED
+    assert "offline" in registry.status()["error"]
+
+
+def test_both_models_are_served():
+    registry = ModelRegistry(FakeModel)
+    roberta = registry.load(ModelSelection.TWITTER_ROBERTA)
+    bert = registry.load()
+    assert roberta.model_name == ModelSelection.TWITTER_ROBERTA.value
+    assert bert.model_name == ModelSelection.MULTILINGUAL_BERT.value
+    assert registry.get(ModelSelection.TWITTER_ROBERTA) is roberta
+
+
+def test_memory_budget_unloads_idle_models_but_keeps_default():
+    """Loading past the budget unloads the least recently used non-default model."""
+    registry = ModelRegistry(FakeModel, default=ModelSelection.MULTILINGUAL_BERT, memory_budget_mb=150)
+    registry.load(ModelSelection.TWITTER_ROBERTA)
+    registry.load()
+    assert registry.state(ModelSelection.TWITTER_ROBERTA) == ModelState.NOT_LOADED
+    assert registry.ready
+
+    registry = ModelRegistry(FakeModel, default=ModelSelection.MULTILINGUAL_BERT, memory_budget_mb=250)
+    registry.load()
+    registry.load(ModelSelection.TWITTER_ROBERTA)
+    assert registry.state(ModelSelection.TWITTER_ROBERTA) == ModelState.READY
+    assert registry.status()["models"]["TWITTER_ROBERTA"]["memory_mb"] == 100
+
+
+def test_model_that_does_not_fit_next_to_default_is_refused():
+    registry = ModelRegistry(FakeModel, default=ModelSelection.MULTILINGUAL_BERT, memory_budget_mb=150)
+    registry.load()
+    with pytest.raises(MemoryBudgetError, match="memory budget"):
+        registry.load(ModelSelection.TWITTER_ROBERTA)
+    assert registry.state(ModelSelection.TWITTER_ROBERTA) == ModelState.OVER_BUDGET
+    assert "150 MB" in registry.status()["models"]["TWITTER_ROBERTA"]["error"]
+    assert list(registry.loaded()) == [ModelSelection.MULTILINGUAL_BERT]
+
+    # The refusal is remembered, so the weights are not loaded over the budget again
+    FakeModel.loads = 0
+    with pytest.raises(MemoryBudgetError, match="memory budget"):
+        registry.load(ModelSelection.TWITTER_ROBERTA)
+    assert FakeModel.loads == 0
+
+
+def test_failed_startup_load_is_retried(monkeypatch):
+    """A temporary load error does not leave the API unready for good."""
+    import app
+
+    attempts = []
+
+    def flaky_model(model):
+        attempts.append(model)
+        return FakeModel(model, fail=len(attempts) < 3)
+
+    registry = ModelRegistry(flaky_model)
+    monkeypatch.setattr(app, "model_registry", registry)
+    asyncio.run(asyncio.wait_for(app.load_model(retry_seconds=0.01, max_retry_seconds=0.02), timeout=5))
+    assert len(attempts) == 3
+    assert registry.ready
+
+
+def test_stats_do_not_change_the_eviction_order(monkeypatch):
+    """Polling /stats/ reads the loaded models without marking them as recently used."""
+    import routes.predict as predict
+    from routes.stats import get_stats
+
+    registry = ModelRegistry(FakeModel)
+    registry.load()
+    registry.load(ModelSelection.TWITTER_ROBERTA)
+    monkeypatch.setattr(predict, "model_registry", registry)
+    order = list(registry.loaded())
+    # The statistics a real ModelLoader reports
+    for name in ("padding_stats", "stage_stats", "stage_timings"):
+        monkeypatch.setattr(FakeModel, name, {"calls": 0, "texts": 0}, raising=False)
+    for name in ("padding_ratio", "unbucketed_padding_ratio", "tokenize_share"):
+        monkeypatch.setattr(FakeModel, name, 0.0, raising=False)
+    monkeypatch.setattr(FakeModel, "token_cache", TokenCache(), raising=False)
+
+    get_stats()
+
+    assert list(registry.loaded()) == order
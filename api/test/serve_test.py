@@ -0,0 +1,97 @@
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+import requests
+from ai.backends import artifact_dir
+from ai.cache import PredictionCache
+from ai.model_loader import ModelSelection
+from prepare_artifacts import prepare_artifacts
+from serve import restart_delay, worker_torch_threads
+
+
+PREDICTION = {"predicted_label": "Positive", "scores": {"Negative": 0.1, "Positive": 0.9}}
+
+
+def test_cores_are_split_between_workers():
+    cores = os.cpu_count() or 1
+    assert worker_torch_threads(1) == cores
+    assert worker_torch_threads(cores * 2) == 1
+    assert worker_torch_threads(4, torch_threads=3) == 3
+
+
+def test_restarts_back_off_while_workers_keep_crashing():
+    assert [restart_delay(crashes) for crashes in range(1, 5)] == [1, 2, 4, 8]
+    assert restart_delay(20) == 60
+
+
+def test_disk_cache_reconnects_in_forked_worker(tmp_path):
+    """A forked child writes through its own SQLite connection, and the parent reads the entry."""
+    cache = PredictionCache(path=str(tmp_path / "predictions.sqlite3"))
+    cache.put("model", "a", PREDICTION)
+    pid = os.fork()
+    if pid == 0:
+        try:
+            cache.put("model", "b", PREDICTION)
+            os._exit(0 if cache.get("model", "a") == PREDICTION else 1)
+        finally:
+            os._exit(1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert PredictionCache(path=cache.path).get("model", "b") == PREDICTION
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_workers_serve_the_model_loaded_before_fork(tiny_model_dir, tmp_path):
+    prepared = prepare_artifacts(tiny_model_dir, str(tmp_path))
+    prepared.rename(artifact_dir(str(tmp_path), ModelSelection.MULTILINGUAL_BERT.value))
+    port = free_port()
+    env = {**os.environ, "MODEL_ARTIFACTS_DIR": str(tmp_path), "PREDICTION_CACHE_PATH": ""}
+    api_dir = Path(__file__).resolve().parents[1]
+    command = [sys.executable, "serve.py", "--host", "127.0.0.1", "--port", str(port), "--workers", "2"]
+    server = subprocess.Popen(command, cwd=api_dir, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        url = f"http://127.0.0.1:{port}"
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if requests.get(f"{url}/health/ready", timeout=1).status_code == 200:
+                    break
+            except requests.RequestException:
+                pass
+            assert time.monotonic() < deadline, "serve.py did not become ready"
+            time.sleep(0.2)
+
+        workers = Path(f"/proc/{server.pid}/task/{server.pid}/children").read_text().split()
+        assert len(workers) == 2
+        for _ in range(4):
+            response = requests.post(f"{url}/analyze/", json={"text": "the market is amazing"}, timeout=10)
+            assert response.status_code == 200
+            assert response.json()["predicted_label"]
+
+        # /metrics reports both workers, whichever one answers the scrape, once
+        # the other one has published its counts (every METRICS_SYNC_SECONDS)
+        deadline = time.monotonic() + 10
+        while True:
+            metrics = requests.get(f"{url}/metrics", timeout=10).text
+            served = [
+                float(line.rsplit(" ", 1)[1]) for line in metrics.splitlines()
+                if line.startswith('sentiment_api_requests_total{method="POST",route="/analyze/",status="200"}')
+            ]
+            if served == [4.0] or time.monotonic() > deadline:
+                break
+            time.sleep(0.2)
+        assert served == [4.0]
+        for pid in workers:
+            assert f'sentiment_api_queue_depth{{queue="inference",worker="{pid}"}}' in metrics
+    finally:
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=30) == 0
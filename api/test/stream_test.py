@@ -0,0 +1,106 @@
+import asyncio
+import json
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import routes.predict as predict
+from ai.executor import QueueFullError
+from ai.model_loader import ModelSelection
+from ai.registry import ModelRegistry
+from routes.stream import parse_line, score, stream_router
+
+
+class FakeModel:
+    """Stand-in for ModelLoader that records the batches it scores and can fail on a text."""
+
+    def __init__(self, model, fail_on=None):
+        self.model_name = model.value
+        self.cache_namespace = model.value
+        self.memory_bytes = 0
+        self.load_seconds = 0.0
+        self.fail_on = fail_on
+        self.batches = []
+
+    def load_model(self):
+        pass
+
+    def predict_many(self, texts):
+        self.batches.append(list(texts))
+        if self.fail_on in texts:
+            raise RuntimeError("backend error")
+        return [{"text": text, "predicted_label": "Neutral", "scores": {"Neutral": 1.0}} for text in texts]
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    """Serves the stream route with a fake default model; returns a function posting an NDJSON body."""
+    def post(body: bytes, fail_on=None, batch_size=2):
+        registry = ModelRegistry(lambda model: FakeModel(model, fail_on=fail_on))
+        model = registry.load()
+        monkeypatch.setattr(predict, "model_registry", registry)
+        monkeypatch.setattr("routes.stream.STREAM_BATCH_SIZE", batch_size)
+        app = FastAPI()
+        app.include_router(stream_router)
+        response = TestClient(app).post("/analyze/stream", content=body)
+        assert response.status_code == 200
+        return [json.loads(line) for line in response.text.splitlines()], model
+    return post
+
+
+def test_parse_line_accepts_strings_and_objects():
+    assert parse_line(b'"Bitcoin sobe"') == ("Bitcoin sobe", None)
+    assert parse_line(b'{"text": "Bitcoin cai"}') == ("Bitcoin cai", None)
+
+
+def test_parse_line_reports_invalid_lines():
+    text, error = parse_line(b"not json")
+    assert text is None and error.startswith("Invalid JSON")
+    text, error = parse_line(b'{"title": "Bitcoin"}')
+    assert text is None and "'text'" in error
+
+
+def test_rows_keep_the_order_of_the_lines_in_batches(stream):
+    rows, model = stream(b'"a"\n{"text": "b"}\nnot json\n\n"c"\n"d"')
+    assert [row.get("text") for row in rows] == ["a", "b", None, "c", "d"]
+    assert rows[2]["error"].startswith("Invalid JSON")
+    # Invalid lines take a place in their batch of STREAM_BATCH_SIZE lines
+    assert model.batches == [["a", "b"], ["c"], ["d"]]
+
+
+def test_failed_batch_becomes_error_rows_and_the_stream_goes_on(stream):
+    rows, model = stream(b'"a"\n"boom"\n"c"\n', fail_on="boom")
+    assert [row.get("error") for row in rows] == ["Inference failed: backend error"] * 2 + [None]
+    assert rows[2]["text"] == "c"
+
+
+def test_overlong_lines_are_reported_without_buffering_them(stream, monkeypatch):
+    monkeypatch.setattr("routes.stream.STREAM_MAX_LINE_BYTES", 16)
+    rows, _ = stream(b'"a"\n"' + b"x" * 100 + b'"\n"b"\n"' + b"y" * 100)
+    assert [row.get("text") for row in rows] == ["a", None, "b", None]
+    assert rows[1]["error"] == "Line exceeds 16 bytes."
+
+
+def test_full_queue_is_retried_without_holding_the_texts(monkeypatch):
+    """While a batch waits for room in the queue, other requests for its texts are not held by it."""
+    class FullOnce:
+        calls = 0
+
+        async def run(self, func, *args):
+            self.calls += 1
+            if self.calls == 1:
+                raise QueueFullError("full")
+            return func(*args)
+
+    monkeypatch.setattr("routes.stream.inference_executor", FullOnce())
+    monkeypatch.setattr("routes.stream.RETRY_AFTER_SECONDS", 0.05)
+    model = FakeModel(ModelSelection.MULTILINGUAL_BERT)
+
+    async def run():
+        task = asyncio.ensure_future(score(model, ["a", "b"]))
+        await asyncio.sleep(0.02)
+        pending = predict.request_coalescer.stats["pending"]
+        return pending, await task
+
+    pending, predictions = asyncio.run(run())
+    assert pending == 0
+    assert [prediction["text"] for prediction in predictions] == ["a", "b"]
@@ -1,11 +1,15 @@
+import logging
 import sys
+from os import environ
 import streamlit as st
-import time
-from notebooks import SentimentAnalyzerNotebook
+import pandas as pd
+from notebooks import AnalysisJob, SentimentAnalyzerNotebook
+from notebooks.sentiment_analysis import default_timeseries
 from components import (
     TopicInput,
     DisplayThemes,
     DisplayPredictions,
+    DisplayTrends,
     PageHeader,
 )
 
@@ -16,17 +20,47 @@ st.set_page_config(
     page_icon="🦈"
 )
 
+ANALYSIS_CACHE_TTL_SECONDS = float(environ.get("ANALYSIS_CACHE_TTL_SECONDS", 600))
+ANALYSIS_POLL_SECONDS = float(environ.get("ANALYSIS_POLL_SECONDS", 0.5))
+TREND_DAYS = int(environ.get("TREND_DAYS", 30))
+
+# Registra o tempo de cada fase por tema, com o trace ID enviado à API
+logging.basicConfig(level=environ.get("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
 # Exibe o cabeçalho da página
 PageHeader()
 
 
-def load_data():
-    sentiment_analyzer = SentimentAnalyzerNotebook()
-    sentiment_analyzer.main(st.session_state.topics)
-    output_sentiment_df = sentiment_analyzer.sentiment_indicator
-    st.session_state.output_sentiment_df = output_sentiment_df
-    st.session_state.news_df = sentiment_analyzer.news_df
-    
+# Análises do mesmo conjunto de temas são reaproveitadas durante o TTL
+@st.cache_resource(ttl=ANALYSIS_CACHE_TTL_SECONDS, max_entries=32, show_spinner=False)
+def start_analysis(topics: tuple[str, ...]) -> AnalysisJob:
+    return AnalysisJob(list(topics), SentimentAnalyzerNotebook)
+
+
+# Tendências lidas dos agregados já calculados, sem executar o pipeline
+@st.cache_data(ttl=60, show_spinner=False)
+def load_trends(topics: tuple[str, ...]) -> pd.DataFrame:
+    start = pd.Timestamp.now(tz="UTC") - pd.Timedelta(days=TREND_DAYS)
+    return default_timeseries().rolling(list(topics), start=start, freq="D", window=7)
+
+
+def show_results(topics: tuple[str, ...]):
+    # Exibe os temas já concluídos; enquanto a análise roda, o fragmento é atualizado periodicamente
+    job = start_analysis(topics)
+    st.session_state.output_sentiment_df = job.sentiment_indicator
+    st.session_state.news_df = job.news_df
+
+    if job.error is not None:
+        st.error(f"Falha na análise: {job.error}")
+        return
+    if job.done:
+        DisplayPredictions()
+        return
+    analyzed = set(st.session_state.output_sentiment_df["query"])
+    DisplayPredictions(pending=[topic for topic in topics if topic not in analyzed])
+    st.progress(job.completed / len(topics), text=f"Analisando temas... ({job.completed}/{len(topics)})")
+
+
 # Centraliza os campos usando colunas do Streamlit
 col1, col2, col3 = st.columns([1, 2, 1])
 
@@ -49,13 +83,38 @@ with col2:
         use_container_width=True,
     )
 
-if analysis_run:
+if analysis_run and st.session_state.topics:
     st.toast("Buscando informações...", icon="🔄")
-    load_data()
-    time.sleep(1)
-    st.toast("Executando análise...", icon="🔍")
-    time.sleep(1)
-    st.toast("Análise concluida com sucesso!", icon="✅")
-    st.balloons()
+    st.session_state.analysis_topics = tuple(st.session_state.topics)
+    st.session_state.analysis_announced = False
+    # Uma análise que falhou é refeita em vez de reaproveitada do cache
+    if start_analysis(st.session_state.analysis_topics).error is not None:
+        start_analysis.clear(st.session_state.analysis_topics)
+
+if "analysis_topics" in st.session_state:
+    topics = st.session_state.analysis_topics
     st.divider()
-    DisplayPredictions()
+    job = start_analysis(topics)
+    if job.done:
+        show_results(topics)
+        if not st.session_state.analysis_announced and job.error is None:
+            # A série histórica acabou de receber as notícias desta análise
+            load_trends.clear(topics)
+        if job.error is None:
+            DisplayTrends(load_trends(topics))
+        if not st.session_state.analysis_announced and job.error is None:
+            st.session_state.analysis_announced = True
+            st.toast("Análise concluida com sucesso!", icon="✅")
+            st.balloons()
+    else:
+        @st.fragment(run_every=ANALYSIS_POLL_SECONDS)
+        def poll_results():
+            # Atualiza apenas os resultados até a análise terminar e então recarrega a página
+            show_results(topics)
+            if start_analysis(topics).done:
+                st.rerun()
+
+        poll_results()
+elif st.session_state.topics:
+    # Antes de qualquer análise, mostra o histórico já salvo dos temas
+    DisplayTrends(load_trends(tuple(st.session_state.topics)))
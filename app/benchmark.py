@@ -0,0 +1,281 @@
+import argparse
+import hashlib
+import json
+import platform
+import resource
+import sys
+import tempfile
+import time
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+from urllib.parse import parse_qs, urlparse
+import requests
+from notebooks import (
+    ArticleStore,
+    NewsCache,
+    NewsSearcher,
+    RateLimiter,
+    SentimentAnalyzerNotebook,
+    SentimentClient,
+    SentimentTimeSeries,
+)
+
+LABELS = ["Very Negative", "Negative", "Neutral", "Positive", "Very Positive"]
+HEADLINES = [
+    "{topic} dispara e atinge nova máxima histórica",
+    "{topic} cai após resultado abaixo do esperado",
+    "Analistas veem {topic} estável até o fim do trimestre",
+    "Investidores demonstram otimismo com {topic}",
+    "Regulador anuncia investigação envolvendo {topic}",
+]
+
+
+def stub_scores(text: str) -> dict:
+    """Returns deterministic class scores for a text, derived from its hash."""
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    weights = [byte + 1 for byte in digest[:len(LABELS)]]
+    return {label: weight / sum(weights) for label, weight in zip(LABELS, weights)}
+
+
+class StubServer:
+    def __init__(self, handler: type[BaseHTTPRequestHandler], latency_ms: float = 0.0):
+        """
+        Serves a stub handler on a free local port from a background thread.
+
+        Parameters:
+        handler (type): Request handler class. It reads the server's `latency_ms`
+            and `requests` attributes.
+        latency_ms (float): Time each request waits before answering, to mimic a remote service.
+
+        Attributes:
+        url (str): Base URL of the server.
+        """
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.server.latency_ms = latency_ms
+        self.server.requests = 0
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.__thread = Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def requests(self) -> int:
+        """Number of requests served."""
+        return self.server.requests
+
+    def __enter__(self):
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, body):
+        self.server.requests += 1
+        time.sleep(self.server.latency_ms / 1000)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class NewsHandler(JSONHandler):
+    """Answers GET /search?q=<topic>&n=<articles> with Google News-like results."""
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        topic = params["q"][0]
+        count = int(params.get("n", ["10"])[0])
+        news = []
+        for index in range(count):
+            headline = HEADLINES[index % len(HEADLINES)].format(topic=topic)
+            # Every fifth article repeats another one's text, as syndicated news does
+            number = index - index % 5 if index % 5 == 4 else index
+            news.append({
+                "title": f"{headline} ({number})",
+                "desc": f"{headline}. Detalhes da notícia {number} sobre {topic}.",
+                "img": "",
+                "date": f"há {index % 48 + 1} horas",
+            })
+        self.reply(news)
+
+
+class SentimentHandler(JSONHandler):
+    """Answers the sentiment API routes with deterministic scores."""
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+
+        def prediction(text):
+            scores = stub_scores(text)
+            return {"text": text, "predicted_label": max(scores, key=scores.get), "scores": scores}
+
+        if self.path.rstrip("/") == "/analyze/batch":
+            self.reply({"results": [prediction(text) for text in body["texts"]]})
+        else:
+            self.reply(prediction(body["text"]))
+
+
+def http_news_fetcher(url: str, articles: int, query: str, period: str, lang: str, encode: str) -> list[dict]:
+    """Fetches the news of a query from the stub news server."""
+    response = requests.get(f"{url}/search", params={"q": query, "n": articles}, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+# peak_rss_mb and check_regressions are kept identical to api/benchmark.py: the API and
+# the app are separate projects built into separate images and share no code,
+# so a shared module would have to be copied into both anyway.
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(
+    topics: int = 20,
+    articles: int = 50,
+    news_latency_ms: float = 50.0,
+    api_latency_ms: float = 5.0,
+    fetch_workers: int = 4,
+    concurrency: int = 4,
+) -> dict:
+    """
+    Times `SentimentAnalyzerNotebook.main` end to end against local stub news and sentiment servers.
+
+    The first run scores every article (cold); the second runs the same topics on the same
+    article store, so it measures the pipeline when nothing needs scoring (warm).
+
+    Parameters:
+    topics (int): Number of topics analyzed.
+    articles (int): Articles returned per topic.
+    news_latency_ms (float): Latency of each news search.
+    api_latency_ms (float): Latency of each sentiment API request.
+    fetch_workers (int): Topics fetched at the same time.
+    concurrency (int): Requests in flight to the sentiment API.
+
+    Returns:
+        dict: `environment` describing the run and flat `metrics`. Metric names ending in
+        `_per_second` are better when higher; all others are better when lower.
+    """
+    queries = [f"tema {index}" for index in range(topics)]
+    with tempfile.TemporaryDirectory() as directory, \
+            StubServer(NewsHandler, news_latency_ms) as news_server, \
+            StubServer(SentimentHandler, api_latency_ms) as api_server:
+        store = ArticleStore(":memory:")
+        client = SentimentClient(url=api_server.url, concurrency=concurrency)
+        searcher = NewsSearcher(
+            fetcher=partial(http_news_fetcher, news_server.url, articles),
+            max_workers=fetch_workers,
+            cache=NewsCache(ttl_seconds=0),
+            rate_limiter=RateLimiter(0),
+        )
+
+        def run():
+            notebook = SentimentAnalyzerNotebook(
+                client=client,
+                searcher=searcher,
+                store=store,
+                timeseries=SentimentTimeSeries(directory),
+            )
+            start = time.perf_counter()
+            notebook.main(queries)
+            return time.perf_counter() - start, notebook.scoring_stats
+
+        try:
+            cold_seconds, cold_stats = run()
+            warm_seconds, warm_stats = run()
+        finally:
+            client.close()
+            store.close()
+
+    return {
+        "environment": {
+            "topics": topics,
+            "articles_per_topic": articles,
+            "news_latency_ms": news_latency_ms,
+            "api_latency_ms": api_latency_ms,
+            "cold_scored": cold_stats["scored"],
+            "warm_scored": warm_stats["scored"],
+            "api_requests": api_server.requests,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "metrics": {
+            "e2e_cold_seconds": cold_seconds,
+            "e2e_warm_seconds": warm_seconds,
+            "e2e_cold_articles_per_second": cold_stats["articles"] / cold_seconds,
+            "e2e_warm_articles_per_second": warm_stats["articles"] / warm_seconds,
+            "peak_rss_mb": peak_rss_mb(),
+        },
+    }
+
+
+def check_regressions(metrics: dict, baseline: dict, max_regression: float) -> list[dict]:
+    """
+    Lists the metrics that got worse than `baseline` by more than `max_regression`.
+
+    Parameters:
+    metrics (dict): Metrics of the current run.
+    baseline (dict): Metrics of a previous run. Metrics missing from either side are not compared.
+    max_regression (float): Tolerated relative slowdown, e.g. 0.2 for 20%.
+
+    Returns:
+        list[dict]: One entry per regressed metric, with both values and the relative change
+        (positive means worse).
+    """
+    regressions = []
+    for name, value in metrics.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        change = (value - reference) / reference
+        if name.endswith("_per_second"):
+            change = -change
+        if change > max_regression:
+            regressions.append({"metric": name, "baseline": reference, "current": value, "change": change})
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Benchmarks the analysis pipeline end to end and optionally fails on regressions against a baseline."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--articles", type=int, default=50, help="Articles per topic.")
+    parser.add_argument("--news-latency-ms", type=float, default=50.0)
+    parser.add_argument("--api-latency-ms", type=float, default=5.0)
+    parser.add_argument("--fetch-workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", help="Results file of a previous run to compare against.")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="Tolerated relative slowdown.")
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        topics=args.topics,
+        articles=args.articles,
+        news_latency_ms=args.news_latency_ms,
+        api_latency_ms=args.api_latency_ms,
+        fetch_workers=args.fetch_workers,
+        concurrency=args.concurrency,
+    )
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        results["regressions"] = check_regressions(results["metrics"], baseline["metrics"], args.max_regression)
+    report = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(report, encoding="utf-8")
+    print(report)
+    return 1 if results.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
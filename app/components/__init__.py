@@ -1,3 +1,3 @@
 from .input import TopicInput
-from .main import DisplayThemes, DisplayPredictions,PageHeader
-from .news import NewsCard
\ No newline at end of file
+from .main import DisplayThemes, DisplayPredictions, DisplayTrends, PageHeader
+from .news import NewsCard
@@ -1,4 +1,4 @@
-import time
+import pandas as pd
 import streamlit as st
 
 
@@ -64,29 +64,23 @@ class DisplayThemes:
                 self.topics = []
                 st.rerun()
             
-            status.update(label="Carregando temas...", state="running")
-            time.sleep(1)
-            status.update(label="Temas carregados! ✅", state="complete")
-            time.sleep(1)
             status.update(label="Ver os temas adicionados. (Clique aqui)", state="complete")
 
 class DisplayPredictions:
-    def __init__(self):
-        # Inicializa a classe e exibe os resultados da análise de sentimento
+    def __init__(self, pending: list[str] | None = None):
+        # Inicializa a classe e exibe os resultados da análise de sentimento;
+        # os temas em `pending` aparecem como ainda em análise
+        self.pending = pending or []
         self.__display()
 
-    def __sentiment_label(self, score):
-        # Retorna o rótulo e a cor correspondente ao score de sentimento
-        if score <= -1.5:
-            return "Muito Negativo", "#3182CE"
-        elif score <= -0.5:
-            return "Negativo", "#4299E1"
-        elif score < 0.5:
-            return "Neutro", "#F6AD55"
-        elif score < 1.5:
-            return "Positivo", "#48BB78"
-        else:
-            return "Muito Positivo", "#38A169"
+    # Cor de cada rótulo calculado pelo indicador
+    LABEL_COLORS = {
+        "Muito Negativo": "#3182CE",
+        "Negativo": "#4299E1",
+        "Neutro": "#F6AD55",
+        "Positivo": "#48BB78",
+        "Muito Positivo": "#38A169",
+    }
 
     def __display(self):
         # Exibe os temas, labels e scores lado a lado em uma linha
@@ -110,22 +104,49 @@ class DisplayPredictions:
             by="sentiment_weight", ascending=False
         )
 
-        for idx, row in sorted_df.iterrows():
-            label, color = self.__sentiment_label(row["sentiment_weight"])
+        # Rótulos e indicadores já vêm calculados; apenas exibe cada linha
+        for row in sorted_df.itertuples(index=False):
+            color = self.LABEL_COLORS.get(row.sentiment_label, "#718096")
             cols = st.columns([2, 2, 1])
             cols[0].markdown(
-                f"<span style='font-size:1.2rem; font-weight:600; color:#4F8BF9'>{row['query']}</span>",
+                f"<span style='font-size:1.2rem; font-weight:600; color:#4F8BF9'>{row.query}</span>",
                 unsafe_allow_html=True,
             )
+            cols[0].caption(
+                f"{row.articles} notícias · dispersão {row.dispersion:.0f} · recente {row.recency_weighted:.0f}"
+            )
             cols[1].markdown(
-                f"<span style='background: {color}; color: #fff; border-radius: 1rem; padding: 0.3rem 1.1rem; font-size: 1.05rem; font-weight: 600;'>{label}</span>",
+                f"<span style='background: {color}; color: #fff; border-radius: 1rem; padding: 0.3rem 1.1rem; font-size: 1.05rem; font-weight: 600;'>{row.sentiment_label}</span>",
                 unsafe_allow_html=True,
             )
             # Badge para o score
             cols[2].markdown(
-                f"<span style='background: #2D3748; color: #fff; border-radius: 1rem; padding: 0.3rem 1.1rem; font-size: 1.05rem; font-weight: 600;'>{row['sentiment_weight']:.2f}</span>",
+                f"<span style='background: #2D3748; color: #fff; border-radius: 1rem; padding: 0.3rem 1.1rem; font-size: 1.05rem; font-weight: 600;'>{row.sentiment_weight:.2f}</span>",
+                unsafe_allow_html=True,
+            )
+
+        for topic in self.pending:
+            # Linha provisória até o resultado do tema ficar pronto
+            cols = st.columns([2, 2, 1])
+            cols[0].markdown(
+                f"<span style='font-size:1.2rem; font-weight:600; color:#4F8BF9'>{topic}</span>",
                 unsafe_allow_html=True,
             )
+            cols[1].markdown("⏳ *Analisando...*")
+
+class DisplayTrends:
+    def __init__(self, trends: pd.DataFrame):
+        # Exibe a evolução diária do sentimento de cada tema, a partir da série histórica
+        self.trends = trends
+        self.__display()
+
+    def __display(self):
+        if self.trends.empty:
+            return
+        st.markdown("**Tendência (média móvel de 7 dias)**")
+        chart = self.trends.pivot(index="period", columns="query", values="rolling_sentiment_weight")
+        st.line_chart(chart, y_label="Sentimento", x_label="Dia")
+
 
 class PageHeader:
     """
@@ -1,5 +1,8 @@
-from .sentiment_analysis import SentimentAnalyzerNotebook
-
-
-
-
+from .sentiment_analysis import NewsSearcher, SentimentAnalyzerNotebook
+from .client import SentimentClient
+from .news import NewsCache, RateLimiter
+from .store import ArticleStore
+from .jobs import AnalysisJob
+from .dedupe import MinHashDeduplicator, normalize_texts
+from .indicator import INDICATOR_COLUMNS, SENTIMENT_WEIGHTS, compute_indicators
+from .timeseries import SentimentTimeSeries
@@ -0,0 +1,144 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from os import environ
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+# Header carrying the trace ID, logged by the API with each request
+TRACE_HEADER = "X-Request-ID"
+
+
+class SentimentClient:
+    def __init__(
+        self,
+        url: str | None = None,
+        concurrency: int = 4,
+        batch_size: int = 32,
+        timeout: tuple[float, float] = (3.05, 60),
+        retries: int = 3,
+        backoff: float = 0.5,
+        session: requests.Session | None = None,
+    ):
+        """
+        Reusable HTTP client for the sentiment prediction API.
+
+        Keeps a pool of keep-alive connections, sends texts in chunks to the
+        batch endpoint with a bounded number of concurrent requests, and retries
+        transient failures with jittered exponential backoff. If the server has
+        no batch endpoint, it falls back to one request per text.
+
+        Parameters:
+        url (str): Base URL of the API. Defaults to the SENTIMENT_API_URL environment
+            variable, or http://sentiment_api:8000.
+        concurrency (int): Maximum number of requests in flight at the same time.
+        batch_size (int): Number of texts per batch request.
+        timeout (tuple[float, float]): Connect and read timeouts, in seconds.
+        retries (int): Number of retries after a failed request.
+        backoff (float): Base delay of the exponential backoff, in seconds.
+        session (requests.Session): Session to use. A pooled session is created if None.
+        """
+        self.url = (url or environ.get("SENTIMENT_API_URL", "http://sentiment_api:8000")).rstrip("/")
+        self.concurrency = max(concurrency, 1)
+        self.batch_size = max(batch_size, 1)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.batch_supported = True
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+
+    def __delay(self, attempt: int, response: requests.Response | None) -> float:
+        """
+        Returns how long to wait before the next attempt: the server's Retry-After
+        if it sent one, otherwise a full-jitter exponential backoff.
+        """
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    def __post(self, path: str, body: dict, trace_id: str | None = None) -> requests.Response:
+        """
+        Posts a JSON body, retrying connection errors, timeouts and transient status codes.
+        The trace ID, if given, is sent in the X-Request-ID header.
+
+        Returns:
+            requests.Response: The last response received. Non-retryable errors
+            (such as 404) are returned without raising.
+        """
+        headers = {TRACE_HEADER: trace_id} if trace_id else None
+        for attempt in range(self.retries + 1):
+            response = None
+            try:
+                response = self.session.post(f"{self.url}{path}", json=body, timeout=self.timeout, headers=headers)
+                if response.status_code not in RETRY_STATUS:
+                    return response
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+            if attempt < self.retries:
+                time.sleep(self.__delay(attempt, response))
+        return response
+
+    def predict(self, text: str, trace_id: str | None = None) -> dict:
+        """
+        Predicts the sentiment of a single text.
+
+        Parameters:
+        text (str): The text to be analyzed.
+        trace_id (str): Trace ID sent with the request, to find it in the API logs.
+
+        Returns:
+            dict: The prediction, with 'predicted_label' and 'scores'.
+        """
+        response = self.__post("/analyze/", {"text": text}, trace_id)
+        response.raise_for_status()
+        return response.json()
+
+    def __predict_chunk(self, texts: list[str], trace_id: str | None = None) -> list[dict]:
+        """Predicts one chunk through the batch endpoint, or text by text without it."""
+        if self.batch_supported:
+            response = self.__post("/analyze/batch", {"texts": texts}, trace_id)
+            if response.status_code not in (404, 405):
+                response.raise_for_status()
+                return response.json()["results"]
+            # Older servers only expose /analyze/
+            self.batch_supported = False
+        return [self.predict(text, trace_id) for text in texts]
+
+    def predict_many(self, texts: list[str], trace_id: str | None = None) -> list[dict]:
+        """
+        Predicts the sentiment of many texts, in the same order as given.
+
+        Texts are split into chunks of `batch_size`, and up to `concurrency`
+        chunks are sent at the same time.
+
+        Parameters:
+        texts (list[str]): The texts to be analyzed.
+        trace_id (str): Trace ID sent with every request, to find them in the API logs.
+
+        Returns:
+            list[dict]: One prediction per text.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        chunk_size = self.batch_size if self.batch_supported else 1
+        chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = executor.map(partial(self.__predict_chunk, trace_id=trace_id), chunks)
+            return [prediction for chunk in results for prediction in chunk]
+
+    def close(self):
+        """Closes the pooled connections."""
+        self.session.close()
@@ -0,0 +1,125 @@
+import html
+import zlib
+import numpy as np
+import pandas as pd
+
+# Mersenne prime larger than every 32-bit shingle hash
+MINHASH_PRIME = (1 << 61) - 1
+
+
+def normalize_texts(texts: pd.Series) -> pd.Series:
+    """
+    Normalizes news snippets so copies of the same story compare equal.
+
+    Unescapes HTML entities, drops HTML tags and the trailing ellipsis of truncated
+    snippets, collapses whitespace and casefolds. Every step but the entity unescaping
+    runs on the whole Series at once.
+
+    Parameters:
+    texts (pd.Series): The texts to normalize.
+
+    Returns:
+        pd.Series: The normalized texts, with the same index.
+    """
+    texts = texts.fillna('').astype(str)
+    has_entity = texts.str.contains('&', regex=False)
+    if has_entity.any():
+        texts = texts.copy()
+        texts[has_entity] = texts[has_entity].map(html.unescape)
+    return (
+        texts.str.replace(r'<[^>]+>', ' ', regex=True)
+        .str.replace(r'(\.\.\.|…)\s*$', '', regex=True)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+        .str.casefold()
+    )
+
+
+class MinHashDeduplicator:
+    def __init__(self, num_perm: int = 64, bands: int = 16, threshold: float = 0.8, shingle_size: int = 3, seed: int = 1):
+        """
+        Groups near-duplicate texts with MinHash signatures and locality-sensitive hashing.
+
+        Texts are split into word shingles and summarized by `num_perm` MinHash values.
+        Texts sharing any of the `bands` signature bands are candidates, and candidates
+        whose signatures agree on at least `threshold` of the values (an estimate of the
+        Jaccard similarity of their shingles) end up in the same group.
+
+        Parameters:
+        num_perm (int): Number of MinHash values per text. Must be a multiple of `bands`.
+        bands (int): Number of LSH bands.
+        threshold (float): Minimum estimated Jaccard similarity of two near-duplicates.
+        shingle_size (int): Number of words per shingle.
+        seed (int): Seed of the hash permutations.
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands.")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self.__a = rng.integers(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.__b = rng.integers(0, 1 << 31, size=num_perm, dtype=np.uint64)
+
+    def __shingles(self, text: str) -> np.ndarray:
+        """Hashes of the word shingles of a normalized text."""
+        words = text.split()
+        size = min(self.shingle_size, len(words)) or 1
+        shingles = {' '.join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+        return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64)
+
+    def signatures(self, texts: pd.Series) -> np.ndarray:
+        """
+        Computes the MinHash signature of each normalized text.
+
+        Returns:
+            np.ndarray: Array of shape (len(texts), num_perm).
+        """
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint64)
+        for row, text in enumerate(texts):
+            hashes = self.__shingles(text)
+            signatures[row] = ((self.__a[:, None] * hashes[None, :] + self.__b[:, None]) % MINHASH_PRIME).min(axis=1)
+        return signatures
+
+    def groups(self, texts: pd.Series) -> np.ndarray:
+        """
+        Assigns each text to a group of near-duplicates.
+
+        Parameters:
+        texts (pd.Series): The texts, normalized with `normalize_texts`.
+
+        Returns:
+            np.ndarray: For each text, the position of the first text of its group.
+        """
+        texts = pd.Series(texts).reset_index(drop=True)
+        parent = np.arange(len(texts))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        # Identical texts are merged without comparing signatures
+        codes, _ = pd.factorize(texts)
+        parent[:] = pd.Series(parent).groupby(codes).transform('min').to_numpy()
+        unique = np.flatnonzero(parent == np.arange(len(texts)))
+
+        if len(unique) > 1:
+            signatures = self.signatures(texts[unique])
+            rows = self.num_perm // self.bands
+            for band in range(self.bands):
+                buckets = {}
+                for position, key in enumerate(map(bytes, signatures[:, band * rows:(band + 1) * rows])):
+                    buckets.setdefault(key, []).append(position)
+                for members in buckets.values():
+                    for other in members[1:]:
+                        left, right = find(unique[members[0]]), find(unique[other])
+                        if left == right:
+                            continue
+                        similarity = np.mean(signatures[members[0]] == signatures[other])
+                        if similarity >= self.threshold:
+                            parent[max(left, right)] = min(left, right)
+
+        return np.array([find(i) for i in range(len(texts))])
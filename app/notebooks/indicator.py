@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+SENTIMENT_WEIGHTS = {
+    "Very Positive": 2,
+    "Positive": 1,
+    "Neutral": 0,
+    "Negative": -1,
+    "Very Negative": -2
+}
+
+# Bounds of each display label on the -2..2 weight scale
+SENTIMENT_LABELS = [
+    (-1.5, "Muito Negativo"),
+    (-0.5, "Negativo"),
+    (0.5, "Neutro"),
+    (1.5, "Positivo"),
+    (np.inf, "Muito Positivo"),
+]
+
+INDICATOR_COLUMNS = [
+    'query', 'sentiment_weight', 'articles', 'expected_sentiment', 'confidence_weighted',
+    'dispersion', 'recency_weighted', 'sentiment_label',
+]
+
+AGE_UNIT_HOURS = {
+    "min": 1 / 60,
+    "hora": 1, "hour": 1,
+    "dia": 24, "day": 24,
+    "semana": 24 * 7, "week": 24 * 7,
+    "mes": 24 * 30, "mês": 24 * 30, "month": 24 * 30,
+    "ano": 24 * 365, "year": 24 * 365,
+}
+
+
+def parse_article_ages(dates: pd.Series) -> np.ndarray:
+    """
+    Parses the 'date' column of Google News results into article ages, in hours.
+
+    Relative dates in Portuguese or English ("há 2 horas", "3 days ago", "ontem") are
+    read with a single vectorized regex; anything else goes through pd.to_datetime.
+
+    Parameters:
+    dates (pd.Series): The 'date' values.
+
+    Returns:
+        np.ndarray: The age of each article in hours, NaN where the date can't be read.
+    """
+    dates = dates.fillna('').astype(str).str.strip().str.lower()
+    parts = dates.str.extract(r'(\d+)\s*(min|hora|hour|dia|day|semana|week|mês|mes|month|ano|year)')
+    hours = pd.to_numeric(parts[0], errors='coerce') * parts[1].map(AGE_UNIT_HOURS)
+    hours[dates.isin(["ontem", "yesterday"])] = 24
+    unparsed = hours.isna() & (dates != '')
+    if unparsed.any():
+        absolute = pd.to_datetime(dates[unparsed], errors='coerce', format='mixed', utc=True)
+        hours[unparsed] = (pd.Timestamp.now(tz='UTC') - absolute).dt.total_seconds() / 3600
+    return hours.to_numpy(dtype=float)
+
+
+def score_matrix(scores: pd.Series, predicted_labels: pd.Series) -> np.ndarray:
+    """
+    Builds the dense (articles x classes) probability matrix, with classes in the order of
+    `SENTIMENT_WEIGHTS`.
+
+    Articles without class scores get a one-hot row for their predicted label.
+
+    Parameters:
+    scores (pd.Series): The 'scores' dict the API returned for each article.
+    predicted_labels (pd.Series): The predicted label of each article.
+
+    Returns:
+        np.ndarray: The score matrix.
+    """
+    labels = list(SENTIMENT_WEIGHTS)
+    matrix = pd.DataFrame.from_records(
+        [row if isinstance(row, dict) else {} for row in scores], columns=labels
+    ).fillna(0.0).to_numpy(dtype=float, copy=True)
+    missing = matrix.sum(axis=1) == 0
+    if missing.any():
+        one_hot = (np.asarray(predicted_labels)[missing, None] == np.array(labels)[None, :])
+        matrix[missing] = one_hot.astype(float)
+    return matrix
+
+
+def article_sentiment(matrix: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the expected sentiment (probability-weighted class weight, -2..2) and the
+    confidence (top class probability) of each row of a score matrix.
+    """
+    weights = np.array(list(SENTIMENT_WEIGHTS.values()), dtype=float)
+    return matrix @ weights, matrix.max(axis=1)
+
+
+def compute_indicators(articles: pd.DataFrame, now: float, half_life_hours: float = 24) -> pd.DataFrame:
+    """
+    Computes the score-based sentiment indicators of every topic at once.
+
+    For each article the expected sentiment is the probability-weighted mean of the class
+    weights (-2..2) and its confidence is the top class probability. Per topic:
+    - expected_sentiment: mean expected sentiment.
+    - confidence_weighted: mean expected sentiment weighted by confidence.
+    - dispersion: standard deviation of the expected sentiment.
+    - recency_weighted: mean expected sentiment weighted by 0.5 ** (age / half_life_hours).
+      Articles without a known publication time weigh as if one half-life old.
+    Every indicator is multiplied by 100, like 'sentiment_weight'.
+
+    Parameters:
+    articles (pd.DataFrame): One row per article, with columns 'query', 'predicted_label',
+        'scores' and 'published_at' (Unix time, or NaN).
+    now (float): Current Unix time.
+    half_life_hours (float): Age at which an article weighs half as much as a new one.
+
+    Returns:
+        pd.DataFrame: One row per topic with columns 'query', 'articles', 'expected_sentiment',
+        'confidence_weighted', 'dispersion' and 'recency_weighted'.
+    """
+    columns = ['query', 'articles', 'expected_sentiment', 'confidence_weighted', 'dispersion', 'recency_weighted']
+    if articles.empty:
+        return pd.DataFrame(columns=columns)
+
+    codes, queries = pd.factorize(articles['query'])
+    expected, confidence = article_sentiment(score_matrix(articles['scores'], articles['predicted_label']))
+    ages = (now - articles['published_at'].to_numpy(dtype=float)) / 3600
+    decay = np.where(np.isnan(ages), 0.5, 0.5 ** (np.clip(ages, 0, None) / half_life_hours))
+
+    def grouped(values):
+        return np.bincount(codes, weights=values, minlength=len(queries))
+
+    def ratio(numerator, denominator):
+        return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+    counts = grouped(np.ones(len(codes)))
+    mean = grouped(expected) / counts
+    variance = np.clip(grouped(expected ** 2) / counts - mean ** 2, 0, None)
+    return pd.DataFrame({
+        'query': queries,
+        'articles': counts.astype(int),
+        'expected_sentiment': 100 * mean,
+        'confidence_weighted': 100 * ratio(grouped(confidence * expected), grouped(confidence)),
+        'dispersion': 100 * np.sqrt(variance),
+        'recency_weighted': 100 * ratio(grouped(decay * expected), grouped(decay)),
+    })
+
+
+def sentiment_labels(sentiment_weight: pd.Series) -> pd.Series:
+    """
+    Maps indicator values (multiplied by 100) to their display label.
+    """
+    values = sentiment_weight.to_numpy(dtype=float) / 100
+    (very_negative, _), (negative, _), (neutral, _), (positive, _), (_, very_positive) = SENTIMENT_LABELS
+    # Negative bounds are inclusive and positive ones exclusive, as in the original labels
+    conditions = [values <= very_negative, values <= negative, values < neutral, values < positive]
+    names = [name for _, name in SENTIMENT_LABELS[:-1]]
+    return pd.Series(np.select(conditions, names, default=very_positive), index=sentiment_weight.index)
@@ -0,0 +1,85 @@
+import time
+from threading import Event, Lock, Thread
+from typing import Callable
+import pandas as pd
+from .indicator import INDICATOR_COLUMNS
+
+
+class AnalysisJob:
+    def __init__(self, queries: list[str], notebook_factory: Callable):
+        """
+        Runs a sentiment analysis in a background thread and exposes its partial results.
+
+        The job drains `SentimentAnalyzerNotebook.stream`, so each topic's indicator and
+        news become available as soon as that topic completes. The UI polls the job
+        instead of blocking until every topic is done.
+
+        Parameters:
+        queries (list[str]): The topics to analyze.
+        notebook_factory (Callable): Called without arguments to build the notebook that
+            runs the analysis.
+
+        Attributes:
+        queries (list[str]): The topics to analyze.
+        error (Exception): The error that stopped the job, or None.
+        started_at (float): When the job started, as a time.time() timestamp.
+        finished_at (float): When the job finished, or None while it is running.
+        """
+        self.queries = list(queries)
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self.__indicator = []
+        self.__news = []
+        self.__lock = Lock()
+        self.__done = Event()
+        self.__thread = Thread(target=self.__run, args=(notebook_factory,), daemon=True)
+        self.__thread.start()
+
+    def __run(self, notebook_factory: Callable):
+        try:
+            for query, news_df, indicator in notebook_factory().stream(self.queries):
+                with self.__lock:
+                    self.__news.append(news_df)
+                    if indicator is not None:
+                        self.__indicator.append(indicator)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished_at = time.time()
+            self.__done.set()
+
+    @property
+    def done(self) -> bool:
+        """Whether the job finished, successfully or not."""
+        return self.__done.is_set()
+
+    @property
+    def completed(self) -> int:
+        """Number of topics already analyzed."""
+        with self.__lock:
+            return len(self.__news)
+
+    @property
+    def sentiment_indicator(self) -> pd.DataFrame:
+        """
+        Returns the sentiment indicators of the topics completed so far, in completion order.
+        """
+        with self.__lock:
+            return pd.DataFrame(self.__indicator, columns=INDICATOR_COLUMNS)
+
+    @property
+    def news_df(self) -> pd.DataFrame:
+        """Returns the scored news of the topics completed so far."""
+        with self.__lock:
+            news = list(self.__news)
+        return pd.concat(news, ignore_index=True) if news else pd.DataFrame()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Blocks until the job finishes or `timeout` seconds pass.
+
+        Returns:
+            bool: Whether the job finished.
+        """
+        return self.__done.wait(timeout)
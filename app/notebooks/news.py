@@ -0,0 +1,83 @@
+import time
+from threading import Lock
+from GoogleNews import GoogleNews
+
+
+def google_news_fetcher(query: str, period: str, lang: str, encode: str) -> list[dict]:
+    """
+    Fetches the Google News results for a query.
+
+    Parameters:
+    query (str): The query to search for.
+    period (str): The period to search in, e.g. '7d'.
+    lang (str): The language of the results.
+    encode (str): The encoding of the results.
+
+    Returns:
+        list[dict]: The news found, as returned by GoogleNews.
+    """
+    googlenews = GoogleNews(period=period, lang=lang, encode=encode)
+    googlenews.enableException(True)
+    googlenews.search(query)
+    return googlenews.results()
+
+
+class RateLimiter:
+    def __init__(self, rate_per_second: float):
+        """
+        Spaces out calls so that at most `rate_per_second` start per second, across threads.
+
+        Parameters:
+        rate_per_second (float): Maximum number of calls per second. Zero or less disables the limit.
+        """
+        self.interval = 1 / rate_per_second if rate_per_second > 0 else 0.0
+        self.__next_slot = 0.0
+        self.__lock = Lock()
+
+    def wait(self):
+        """Blocks until the caller may start its call."""
+        if not self.interval:
+            return
+        with self.__lock:
+            now = time.monotonic()
+            slot = max(self.__next_slot, now)
+            self.__next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class NewsCache:
+    def __init__(self, ttl_seconds: float = 600):
+        """
+        Thread-safe in-memory cache of fetch results that expire after `ttl_seconds`.
+
+        Parameters:
+        ttl_seconds (float): How long a result is reused. Zero or less disables the cache.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.__entries = {}
+        self.__lock = Lock()
+
+    def get(self, key: tuple):
+        """Returns the cached result for `key`, or None if it is missing or expired."""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            expires_at, news = entry
+            if time.monotonic() >= expires_at:
+                del self.__entries[key]
+                return None
+            return news
+
+    def put(self, key: tuple, news: list[dict]):
+        """Stores a fetch result for `key`."""
+        if self.ttl_seconds <= 0:
+            return
+        with self.__lock:
+            self.__entries[key] = (time.monotonic() + self.ttl_seconds, news)
+
+    def clear(self):
+        """Removes every cached result."""
+        with self.__lock:
+            self.__entries.clear()
@@ -1,40 +1,226 @@
-import requests
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import lru_cache
+from os import environ
+from queue import Full, Queue
+from threading import Event
+from typing import Callable, Iterator
+from uuid import uuid4
+import time
 import pandas as pd
 from dotenv import load_dotenv
-from GoogleNews import GoogleNews
-from concurrent.futures import ThreadPoolExecutor
+from .client import SentimentClient
+from .dedupe import MinHashDeduplicator, normalize_texts
+from .indicator import (
+    INDICATOR_COLUMNS,
+    SENTIMENT_WEIGHTS,
+    article_sentiment,
+    compute_indicators,
+    parse_article_ages,
+    score_matrix,
+    sentiment_labels,
+)
+from .news import NewsCache, RateLimiter, google_news_fetcher
+from .store import ArticleStore
+from .timeseries import SentimentTimeSeries
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Phases of each topic's analysis, timed and logged with the run's trace ID
+PHASES = ['news_wait', 'get_news_df', 'cleaning', 'feature_engineering', 'sentiment_api', 'indicator']
+
+# Shared by every searcher, so re-runs of the same topics reuse recent results
+news_cache = NewsCache(ttl_seconds=float(environ.get("NEWS_CACHE_TTL_SECONDS", 600)))
+news_rate_limiter = RateLimiter(rate_per_second=float(environ.get("NEWS_RATE_LIMIT_PER_SECOND", 2)))
+
+@lru_cache(maxsize=1)
+def default_article_store() -> ArticleStore:
+    """
+    Returns the article store shared by every run, opened from the ARTICLE_STORE_PATH and
+    ARTICLE_RETENTION_SECONDS environment variables.
+    """
+    return ArticleStore(
+        path=environ.get("ARTICLE_STORE_PATH", "~/.cache/sentiment-explorer/articles.sqlite3"),
+        retention_seconds=float(environ.get("ARTICLE_RETENTION_SECONDS", 7 * 86400)),
+    )
+
+
+@lru_cache(maxsize=1)
+def default_timeseries() -> SentimentTimeSeries:
+    """
+    Returns the sentiment time series shared by every run, stored in SENTIMENT_TIMESERIES_PATH.
+    """
+    return SentimentTimeSeries(environ.get("SENTIMENT_TIMESERIES_PATH", "~/.cache/sentiment-explorer/timeseries"))
+
 class NewsSearcher:
-    def __init__(self, period: str = '7d', lang:str = 'pt', encode: str = 'utf-8'):
+    def __init__(
+        self,
+        period: str = '7d',
+        lang: str = 'pt',
+        encode: str = 'utf-8',
+        fetcher: Callable[[str, str, str, str], list[dict]] = google_news_fetcher,
+        max_workers: int | None = None,
+        cache: NewsCache | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ):
+        """
+        Fetches news for several queries concurrently, reusing recent results.
+
+        Parameters:
+        period (str): The period to search in, e.g. '7d'.
+        lang (str): The language of the results.
+        encode (str): The encoding of the results.
+        fetcher (Callable): Function called as fetcher(query, period, lang, encode) that
+            returns the news of a query. Defaults to Google News.
+        max_workers (int): Maximum number of queries fetched at the same time. Defaults to
+            the NEWS_FETCH_WORKERS environment variable, or 4.
+        cache (NewsCache): Cache of fetch results keyed on (query, period, lang). Defaults
+            to the cache shared by every searcher.
+        rate_limiter (RateLimiter): Limits how often fetches start. Defaults to the limiter
+            shared by every searcher.
+        """
         self.period = period
         self.lang = lang
         self.encode = encode
+        self.fetcher = fetcher
+        self.max_workers = max(max_workers or int(environ.get("NEWS_FETCH_WORKERS", 4)), 1)
+        self.cache = cache if cache is not None else news_cache
+        self.rate_limiter = rate_limiter if rate_limiter is not None else news_rate_limiter
         self.news_df = None
     
     def get_news(self, query):
-        googlenews = GoogleNews(period=self.period, lang=self.lang, encode=self.encode)
-        googlenews.enableException(True)
-        googlenews.search(query)
-        return googlenews.results()
+        """
+        Returns the news of a query, from the cache when a recent result exists.
+
+        Parameters:
+        query (str): The query to search for.
+
+        Returns:
+            list[dict]: The news found.
+        """
+        key = (query, self.period, self.lang)
+        news = self.cache.get(key)
+        if news is None:
+            self.rate_limiter.wait()
+            news = self.fetcher(query, self.period, self.lang, self.encode)
+            self.cache.put(key, news)
+        return news
+
+    def get_many(self, queries: list[str]) -> list[list[dict]]:
+        """
+        Returns the news of each query, fetching up to `max_workers` queries at the same time.
+
+        Parameters:
+        queries (list[str]): The queries to search for.
+
+        Returns:
+            list[list[dict]]: The news of each query, in the same order as `queries`.
+        """
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, max(len(queries), 1))) as executor:
+            return list(executor.map(self.get_news, queries))
+
+    def iter_news(self, queries: list[str], max_pending: int | None = None) -> Iterator[tuple[str, list[dict]]]:
+        """
+        Yields the news of each query as soon as its fetch completes.
+
+        Up to `max_workers` queries are fetched at the same time. Fetched results wait in a
+        queue of at most `max_pending` entries, so fetches pause while the consumer is busy.
+        Closing the iterator early stops the remaining fetches.
+
+        Parameters:
+        queries (list[str]): The queries to search for.
+        max_pending (int): Maximum number of fetched results waiting to be consumed.
+            Defaults to `max_workers`.
+
+        Yields:
+            tuple[str, list[dict]]: Each query and its news, in completion order.
+        """
+        queries = list(queries)
+        results = Queue(maxsize=max_pending or self.max_workers)
+        stop = Event()
+
+        def fetch(query):
+            try:
+                result = (query, self.get_news(query), None)
+            except Exception as e:
+                result = (query, None, e)
+            while not stop.is_set():
+                try:
+                    results.put(result, timeout=0.1)
+                    return
+                except Full:
+                    continue
+
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, max(len(queries), 1)))
+        try:
+            for query in queries:
+                executor.submit(fetch, query)
+            for _ in queries:
+                query, news, error = results.get()
+                if error is not None:
+                    raise error
+                yield query, news
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
 
 class SentimentAnalyzerNotebook:
-    def __init__(self, period: str = '7d', lang: str = 'pt', encode: str = 'utf-8'):
+    def __init__(
+        self,
+        period: str = '7d',
+        lang: str = 'pt',
+        encode: str = 'utf-8',
+        client: SentimentClient | None = None,
+        searcher: NewsSearcher | None = None,
+        store: ArticleStore | None = None,
+        deduplicator: MinHashDeduplicator | None = None,
+        timeseries: SentimentTimeSeries | None = None,
+    ):
         """
-        Initializes a SentimentAnalyzerNotebook object with a given URL for the sentiment prediction server.
+        Initializes a SentimentAnalyzerNotebook object with a client for the sentiment prediction server.
 
         Parameters:
-        url (str): URL for the sentiment prediction server.
+        client (SentimentClient): Client for the sentiment prediction server. A pooled client
+            configured from the environment is created if None.
+        searcher (NewsSearcher): Searcher used to fetch the news. One with the given period,
+            lang and encode is created if None.
+        store (ArticleStore): Store of already scored articles and per-topic aggregates.
+            Defaults to the store shared by every run.
+        deduplicator (MinHashDeduplicator): Groups near-duplicate articles so each group is
+            scored once. One with the default settings is created if None.
+        timeseries (SentimentTimeSeries): Time series every scored article is written to.
+            Defaults to the time series shared by every run.
 
         Attributes:
-        url (str): URL for the sentiment prediction server.
+        client (SentimentClient): Client for the sentiment prediction server.
+        searcher (NewsSearcher): Searcher used to fetch the news.
+        store (ArticleStore): Store of already scored articles and per-topic aggregates.
+        deduplicator (MinHashDeduplicator): Groups near-duplicate articles before scoring.
+        timeseries (SentimentTimeSeries): Time series of scored articles and hourly aggregates.
+        scoring_stats (dict): Number of articles seen, found in the store, collapsed as
+            near-duplicates and sent to the sentiment analysis server.
+        trace_id (str): ID of the latest run, sent to the sentiment analysis server with each
+            request and written in every log line of the run.
+        phase_timings (dict): Seconds the latest run spent in each phase of PHASES, over all
+            topics. 'sentiment_api' is the part of 'feature_engineering' spent waiting for
+            the server, and 'news_wait' the time spent waiting for fetched news.
         news_df (Pandas DataFrame): DataFrame containing news data, with columns 'title', 'desc', and 'query'.
-        __sentiment_indicator (Pandas DataFrame): DataFrame containing the sentiment indicator, with columns 'query' and 'sentiment_weight'.
+        __sentiment_indicator (Pandas DataFrame): DataFrame containing the sentiment indicators, with a row per query and the columns in INDICATOR_COLUMNS.
         """
         self.period = period
         self.lang = lang
         self.encode = encode
+        self.client = client or SentimentClient()
+        self.searcher = searcher or NewsSearcher(period=period, lang=lang, encode=encode)
+        self.store = store or default_article_store()
+        self.deduplicator = deduplicator or MinHashDeduplicator()
+        self.timeseries = timeseries or default_timeseries()
+        self.scoring_stats = {"articles": 0, "stored": 0, "near_duplicates": 0, "scored": 0}
+        self.trace_id = None
+        self.phase_timings = dict.fromkeys(PHASES, 0.0)
         self.news_df = None
         self.__sentiment_indicator = None
         
@@ -42,108 +228,196 @@ class SentimentAnalyzerNotebook:
     @property
     def sentiment_indicator(self):
         """
-        Returns the sentiment indicator, a Pandas DataFrame with two columns: 'query' and 'sentiment_weight',
-        where 'sentiment_weight' is the mean sentiment weight for each query, multiplied by 100. The weights are:
+        Returns the sentiment indicator, a Pandas DataFrame with one row per query, where 'sentiment_weight'
+        is the mean sentiment weight for each query, multiplied by 100. The weights are:
         - Very Positive: 2
         - Positive: 1
         - Neutral: 0
         - Negative: -1
         - Very Negative: -2
+
+        It also holds the number of articles, the score-based indicators computed by `compute_indicators`
+        and the display label of 'sentiment_weight' in 'sentiment_label'.
         """
         return self.__sentiment_indicator
+
+    @contextmanager
+    def __timed(self, phase: str, timings: dict):
+        """Adds the time spent in the block to `phase` in `timings` and in `phase_timings`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            timings[phase] = timings.get(phase, 0.0) + elapsed
+            self.phase_timings[phase] += elapsed
     
-    def __get_news_df(self,*args):
+    def __get_news_df(self, query: str, news: list[dict]) -> pd.DataFrame:
         """
-        Concatenates news dataframes from Google News queries into a single Pandas DataFrame and assigns it to the news_df attribute of the class.
+        Builds the news DataFrame of a single Google News query.
         
         Parameters:
-        *args (str): Google News queries to search for.
+        query (str): The Google News query.
+        news (list[dict]): The news returned for the query.
+
+        Returns:
+            pd.DataFrame: The news, with columns 'title', 'desc', 'img', 'date' and 'query'.
         """
-        news_data = []
-        googlenews = NewsSearcher(period=self.period, lang=self.lang, encode=self.encode)
         required_fields = ['title', 'desc', 'img','date']
-        for query in args:  
-            news = googlenews.get_news(query)
-            df = pd.DataFrame(news)
-            df = df[required_fields]
-            df['query'] = query
-            news_data.append(df.reset_index(drop=True))
-        self.news_df = pd.concat(news_data, ignore_index=True)
+        df = pd.DataFrame(news, columns=required_fields)
+        df['query'] = query
+        return df
 
 
-    def __sentiment_prediction(self, text: str):
+    def __sentiment_prediction(self, texts: list[str]):
         """
-        Posts a request to the sentiment analysis server to predict the sentiment of a given text.
+        Predicts the sentiment of the given texts through the sentiment analysis server.
 
         Parameters:
-            text (str): The text to be analyzed.
+            texts (list[str]): The texts to be analyzed.
 
         Returns:
-            dict: A dictionary with the predicted sentiment label and its confidence score.
+            list[dict]: One dictionary per text with the predicted sentiment label and its scores.
         """
-        body = {'text': text}
-        url = 'http://sentiment_api:8000/analyze'
-        response = requests.post(url, json=body)
-        
-        return response.json()
+        return self.client.predict_many(texts, trace_id=self.trace_id)
     
 
-    def __feature_engineering(self):
+    def __feature_engineering(self, news_df: pd.DataFrame, timings: dict):
         
         """
-        Performs feature engineering on the news DataFrame by predicting the sentiment
+        Performs feature engineering on a news DataFrame by predicting the sentiment
         label for each news description.
 
-        This function applies sentiment prediction to the 'desc' column of the DataFrame
-        and assigns the predicted sentiment label to a new column named 'sentiment'.
-        """
+        Each article is fingerprinted by its title and description. Only articles missing
+        from the store are sent to the sentiment analysis server; the others reuse their
+        stored prediction. Missing articles whose normalized descriptions are near-duplicates
+        are scored once and the prediction is spread to the whole group. The predicted label
+        goes to a new column named 'sentiment', its weight to 'sentiment_weight', the
+        publication time read from 'date' to 'published_at', and the expected sentiment and
+        confidence from the class scores to 'expected_sentiment' and 'confidence'. Each topic
+        is linked to its articles in the store and the articles are added to the time series.
 
-        def predict_sentiment(description):
-            return self.__sentiment_prediction(description)['predicted_label']
-
-        def pooled_sentiment_prediction(descriptions, max_workers=1):
-            results = []
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                results = list(executor.map(predict_sentiment, descriptions))
-                return results
+        Parameters:
+        news_df (pd.DataFrame): Cleaned news, changed in place.
+        timings (dict): Per-phase timings of the topic; the wait for the server is added
+            to 'sentiment_api'.
+        """
+        fingerprints = [
+            ArticleStore.fingerprint(title, desc)
+            for title, desc in zip(news_df['title'], news_df['desc'])
+        ]
+        predictions = self.store.get_many(fingerprints)
+        missing = {}
+        for fingerprint, desc in zip(fingerprints, news_df['desc']):
+            if fingerprint not in predictions:
+                missing.setdefault(fingerprint, desc)
+        self.scoring_stats["articles"] += len(set(fingerprints))
+        self.scoring_stats["stored"] += len(set(fingerprints)) - len(missing)
+        if missing:
+            groups = self.deduplicator.groups(normalize_texts(pd.Series(list(missing.values()))))
+            representatives = sorted(set(groups.tolist()))
+            descs = list(missing.values())
+            with self.__timed('sentiment_api', timings):
+                scored = self.__sentiment_prediction([descs[i] for i in representatives])
+            scored = dict(zip(representatives, scored))
+            scored = {fingerprint: scored[group] for fingerprint, group in zip(missing, groups)}
+            self.scoring_stats["near_duplicates"] += len(missing) - len(representatives)
+            self.scoring_stats["scored"] += len(representatives)
+            self.store.put_many(scored)
+            predictions.update(scored)
 
-        self.news_df['sentiment'] = pooled_sentiment_prediction(self.news_df['desc'])
+        news_df['fingerprint'] = fingerprints
+        news_df['sentiment'] = [predictions[fingerprint]['predicted_label'] for fingerprint in fingerprints]
+        news_df['sentiment_weight'] = news_df['sentiment'].map(SENTIMENT_WEIGHTS)
+        news_df['published_at'] = time.time() - 3600 * parse_article_ages(news_df['date'])
+        matrix = score_matrix(
+            pd.Series([predictions[fingerprint].get('scores') for fingerprint in fingerprints]),
+            news_df['sentiment'],
+        )
+        news_df['expected_sentiment'], news_df['confidence'] = article_sentiment(matrix)
+        for query, group in news_df.groupby('query'):
+            stored = self.store.link(query, group['fingerprint'].tolist(), group['published_at'].tolist())
+            # Keep the first time the topic saw each article, as the store does
+            news_df.loc[group.index, 'published_at'] = group['fingerprint'].map(stored).astype(float)
+        self.timeseries.write(news_df)
     
-    def __cleaning(self):
-        self.news_df.dropna(inplace=True)
-        self.news_df.drop_duplicates(inplace=True)
-        self.news_df.reset_index(drop=True, inplace=True)
-    def __set_sentiment_indicator(self):
+    def __cleaning(self, news_df: pd.DataFrame) -> pd.DataFrame:
+        # Copies differing only in image URL or date are the same article
+        news_df = news_df.dropna().drop_duplicates(subset=['title', 'desc', 'query'])
+        return news_df.reset_index(drop=True)
+
+    def __indicator(self, query: str) -> dict | None:
         """
-        Calculates the sentiment indicator for each query by mapping sentiment labels to
-        predefined weights and computing the mean weight for each query.
+        Calculates the sentiment indicators of a query from the articles the store holds for it.
 
-        The weights are:
+        'sentiment_weight' is the mean of the predicted labels' weights, taken from the
+        per-topic label counts kept in the store:
         - Very Positive: 2
         - Positive: 1
         - Neutral: 0
         - Negative: -1
         - Very Negative: -2
 
-        The sentiment indicator is a DataFrame with two columns: 'query' and 'sentiment_weight',
-        where 'sentiment_weight' is the mean sentiment weight for each query, multiplied by 100.
+        The score-based indicators ('expected_sentiment', 'confidence_weighted', 'dispersion'
+        and 'recency_weighted') come from `compute_indicators`, on the class probabilities of
+        the same articles. 'sentiment_label' is the display label of 'sentiment_weight'.
 
-        The sentiment indicator is stored in the 'sentiment_indicator' attribute of the class instance.
+        Returns:
+            dict | None: The indicators, multiplied by 100, or None if the query has no articles.
         """
-        sentiment_weights = {
-            "Very Positive": 2,
-            "Positive": 1,
-            "Neutral": 0,
-            "Negative": -1,
-            "Very Negative": -2
-        }
-        self.news_df['sentiment_weight'] = self.news_df['sentiment'].map(sentiment_weights)
-        sentiment_indicator = self.news_df.groupby('query')['sentiment_weight'].mean().reset_index()
-        sentiment_indicator.columns = ['query', 'sentiment_weight']
-        sentiment_indicator['sentiment_weight'] *= 100    
-        self.__sentiment_indicator = sentiment_indicator
+        counts = self.store.label_counts([query]).get(query)
+        if not counts:
+            return None
+        articles = sum(counts.values())
+        weight = sum(SENTIMENT_WEIGHTS.get(label, 0) * count for label, count in counts.items())
+        indicator = compute_indicators(self.store.topic_articles([query]), now=time.time())
+        indicator.insert(1, 'sentiment_weight', 100 * weight / articles)
+        indicator['sentiment_label'] = sentiment_labels(indicator['sentiment_weight'])
+        return indicator.iloc[0].to_dict()
+
+    def stream(self, queries: list[str]) -> Iterator[tuple[str, pd.DataFrame, dict | None]]:
+        """
+        Runs the sentiment analysis one topic at a time, as each topic's news arrive.
+
+        The topics are fetched concurrently. As soon as a topic's news are fetched they are
+        cleaned, scored and aggregated, while the other fetches keep running; only as many
+        fetched topics as the searcher has workers wait to be scored. The total time is therefore bounded
+        by the slowest topic rather than by the sum of every phase.
+
+        Each run gets a new `trace_id`. The time each topic spends in each phase is added to
+        `phase_timings` and logged at INFO level with the trace ID.
+
+        Parameters:
+        queries (list[str]): A list of query terms to search for news articles.
+
+        Yields:
+            tuple[str, pd.DataFrame, dict | None]: Each topic's query, its scored news and its
+            sentiment indicators, in the order the topics complete.
+        """
+        self.trace_id = uuid4().hex
+        self.phase_timings = dict.fromkeys(PHASES, 0.0)
+        self.store.prune()
+        waiting_since = time.perf_counter()
+        for query, news in self.searcher.iter_news(queries):
+            timings = {'news_wait': time.perf_counter() - waiting_since}
+            self.phase_timings['news_wait'] += timings['news_wait']
+            with self.__timed('get_news_df', timings):
+                news_df = self.__get_news_df(query, news)
+            with self.__timed('cleaning', timings):
+                news_df = self.__cleaning(news_df)
+            if not news_df.empty:
+                with self.__timed('feature_engineering', timings):
+                    self.__feature_engineering(news_df, timings)
+            with self.__timed('indicator', timings):
+                indicator = self.__indicator(query)
+            logger.info(
+                "trace_id=%s query=%r articles=%d %s",
+                self.trace_id, query, len(news_df),
+                " ".join(f"{phase}_ms={1000 * timings.get(phase, 0.0):.1f}" for phase in PHASES),
+            )
+            yield query, news_df, indicator
+            waiting_since = time.perf_counter()
 
-    
     def main(self, queries: list[str]):
         """
         Executes the sentiment analysis process.
@@ -151,21 +425,16 @@ class SentimentAnalyzerNotebook:
         Args:
             queries (list[str]): A list of query terms to search for news articles.
 
-        This function retrieves news data for the given queries, performs sentiment prediction,
-        and calculates the sentiment indicator for each query.
+        This function retrieves news data for the given queries, performs sentiment prediction
+        on the articles not scored in earlier runs, and updates the sentiment indicator for each
+        query. It drains `stream` and gathers every topic into `news_df` and `sentiment_indicator`.
         """
+        news_data, indicator = [], []
+        for query, news_df, topic_indicator in self.stream(queries):
+            news_data.append(news_df)
+            if topic_indicator is not None:
+                indicator.append(topic_indicator)
 
-        self.__get_news_df(*queries)
-        self.__cleaning()
-        self.__feature_engineering()
-        self.__set_sentiment_indicator()
-        
-
-        
-if __name__ == '__main__':
-    # Example usage
-    # Initialize the SentimentAnalyzerNotebook class
-    # and run the main method with a list of queries
-    analyzer = SentimentAnalyzerNotebook()
-    analyzer.main(['bitcoin', 'ethereum', 'dogecoin', 'litecoin', 'ripple'])
-    
\ No newline at end of file
+        self.news_df = pd.concat(news_data, ignore_index=True) if news_data else pd.DataFrame()
+        sentiment_indicator = pd.DataFrame(indicator, columns=INDICATOR_COLUMNS)
+        self.__sentiment_indicator = sentiment_indicator.sort_values('query', ignore_index=True)
@@ -0,0 +1,235 @@
+import json
+import sqlite3
+import time
+import unicodedata
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+import pandas as pd
+
+
+class ArticleStore:
+    def __init__(self, path: str = ":memory:", retention_seconds: float = 7 * 86400):
+        """
+        Persistent store of scored articles and of per-topic sentiment aggregates.
+
+        Articles are keyed by a fingerprint of their title and description, so an article
+        is scored once no matter how many runs or topics return it. For each topic the store
+        keeps the articles it returned and a running count of each sentiment label, updated
+        only when a topic gains or loses an article.
+
+        Parameters:
+        path (str): SQLite file holding the store. Defaults to an in-memory database.
+        retention_seconds (float): Time a topic keeps an article that was not returned again.
+        """
+        if path != ":memory:":
+            path = str(Path(path).expanduser())
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.retention_seconds = retention_seconds
+        self.__lock = Lock()
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS articles (
+                fingerprint TEXT PRIMARY KEY,
+                predicted_label TEXT NOT NULL,
+                scores TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS topic_articles (
+                query TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                predicted_label TEXT NOT NULL,
+                last_seen REAL NOT NULL,
+                published_at REAL,
+                PRIMARY KEY (query, fingerprint)
+            );
+            CREATE TABLE IF NOT EXISTS topic_labels (
+                query TEXT NOT NULL,
+                predicted_label TEXT NOT NULL,
+                articles INTEGER NOT NULL,
+                PRIMARY KEY (query, predicted_label)
+            );
+            """
+        )
+        columns = {row[1] for row in self.__db.execute("PRAGMA table_info(topic_articles)")}
+        if "published_at" not in columns:
+            # Stores created before publication times were kept
+            self.__db.execute("ALTER TABLE topic_articles ADD COLUMN published_at REAL")
+        self.__db.commit()
+
+    @staticmethod
+    def fingerprint(title: str, desc: str) -> str:
+        """
+        Returns the fingerprint of an article: a SHA-256 hash of its normalized title and description.
+        """
+        text = "\n".join(" ".join(unicodedata.normalize("NFC", str(part)).split()).casefold() for part in (title, desc))
+        return sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, fingerprints: list[str]) -> dict[str, dict]:
+        """
+        Returns the stored predictions of the given articles.
+
+        Parameters:
+        fingerprints (list[str]): Fingerprints of the articles.
+
+        Returns:
+            dict[str, dict]: The 'predicted_label' and 'scores' of each stored article, by fingerprint.
+                Articles that were never scored are left out.
+        """
+        fingerprints = list(set(fingerprints))
+        found = {}
+        with self.__lock:
+            # Stay well below SQLite's limit on query parameters
+            for start in range(0, len(fingerprints), 500):
+                chunk = fingerprints[start:start + 500]
+                rows = self.__db.execute(
+                    f"SELECT fingerprint, predicted_label, scores FROM articles "
+                    f"WHERE fingerprint IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                for fingerprint, label, scores in rows:
+                    found[fingerprint] = {"predicted_label": label, "scores": json.loads(scores)}
+        return found
+
+    def put_many(self, predictions: dict[str, dict]):
+        """
+        Stores the predictions of newly scored articles.
+
+        Parameters:
+        predictions (dict[str, dict]): Prediction with 'predicted_label' and 'scores', by fingerprint.
+        """
+        rows = [
+            (fingerprint, prediction["predicted_label"], json.dumps(prediction.get("scores", {})))
+            for fingerprint, prediction in predictions.items()
+        ]
+        with self.__lock, self.__db:
+            self.__db.executemany(
+                "INSERT OR REPLACE INTO articles (fingerprint, predicted_label, scores) VALUES (?, ?, ?)",
+                rows,
+            )
+
+    def link(
+        self, query: str, fingerprints: list[str], published_at: list[float | None] | None = None
+    ) -> dict[str, float | None]:
+        """
+        Records that a topic returned the given scored articles and updates its label counts.
+
+        Articles the topic already had only get their last seen time refreshed, so the
+        aggregates change by the new articles alone.
+
+        Parameters:
+        query (str): The topic.
+        fingerprints (list[str]): Fingerprints of the articles returned, already stored with put_many.
+        published_at (list[float | None]): Publication time of each article as Unix time, or
+            None where unknown.
+
+        Returns:
+        dict[str, float | None]: The publication time stored for each fingerprint, which is the
+            one first recorded for the topic, so later sightings do not move the article.
+        """
+        now = time.time()
+        if published_at is None:
+            published_at = [None] * len(fingerprints)
+        articles = {}
+        for fingerprint, published in zip(fingerprints, published_at):
+            if published is not None and published != published:
+                published = None
+            articles.setdefault(fingerprint, published)
+        with self.__lock, self.__db:
+            for fingerprint, published in articles.items():
+                updated = self.__db.execute(
+                    "UPDATE topic_articles SET last_seen = ?, published_at = COALESCE(published_at, ?) "
+                    "WHERE query = ? AND fingerprint = ?",
+                    (now, published, query, fingerprint),
+                ).rowcount
+                if updated:
+                    continue
+                self.__db.execute(
+                    "INSERT INTO topic_articles (query, fingerprint, predicted_label, last_seen, published_at) "
+                    "SELECT ?, fingerprint, predicted_label, ?, ? FROM articles WHERE fingerprint = ?",
+                    (query, now, published, fingerprint),
+                )
+                self.__db.execute(
+                    "INSERT INTO topic_labels (query, predicted_label, articles) "
+                    "SELECT ?, predicted_label, 1 FROM articles WHERE fingerprint = ? "
+                    "ON CONFLICT (query, predicted_label) DO UPDATE SET articles = articles + 1",
+                    (query, fingerprint),
+                )
+            stored = {}
+            for fingerprint in articles:
+                row = self.__db.execute(
+                    "SELECT published_at FROM topic_articles WHERE query = ? AND fingerprint = ?",
+                    (query, fingerprint),
+                ).fetchone()
+                stored[fingerprint] = row[0] if row else articles[fingerprint]
+        return stored
+
+    def prune(self):
+        """
+        Drops the articles no topic returned within `retention_seconds` from the topic aggregates.
+        """
+        cutoff = time.time() - self.retention_seconds
+        with self.__lock, self.__db:
+            expired = self.__db.execute(
+                "SELECT query, predicted_label, COUNT(*) FROM topic_articles WHERE last_seen < ? "
+                "GROUP BY query, predicted_label",
+                (cutoff,),
+            ).fetchall()
+            self.__db.executemany(
+                "UPDATE topic_labels SET articles = articles - ? WHERE query = ? AND predicted_label = ?",
+                [(count, query, label) for query, label, count in expired],
+            )
+            self.__db.execute("DELETE FROM topic_labels WHERE articles <= 0")
+            self.__db.execute("DELETE FROM topic_articles WHERE last_seen < ?", (cutoff,))
+
+    def label_counts(self, queries: list[str]) -> dict[str, dict[str, int]]:
+        """
+        Returns how many articles of each sentiment label every topic has.
+
+        Parameters:
+        queries (list[str]): The topics.
+
+        Returns:
+            dict[str, dict[str, int]]: Number of articles by label, for each topic that has any.
+        """
+        queries = list(queries)
+        counts = {}
+        with self.__lock:
+            rows = self.__db.execute(
+                f"SELECT query, predicted_label, articles FROM topic_labels "
+                f"WHERE query IN ({', '.join('?' * len(queries))})",
+                queries,
+            )
+            for query, label, articles in rows:
+                counts.setdefault(query, {})[label] = articles
+        return counts
+
+    def topic_articles(self, queries: list[str]) -> pd.DataFrame:
+        """
+        Returns the articles each topic currently holds, with their scores.
+
+        Parameters:
+        queries (list[str]): The topics.
+
+        Returns:
+            pd.DataFrame: One row per topic and article, with columns 'query', 'fingerprint',
+            'predicted_label', 'scores' and 'published_at' (Unix time, or NaN).
+        """
+        queries = list(queries)
+        with self.__lock:
+            rows = self.__db.execute(
+                f"SELECT t.query, t.fingerprint, t.predicted_label, a.scores, t.published_at "
+                f"FROM topic_articles t JOIN articles a ON a.fingerprint = t.fingerprint "
+                f"WHERE t.query IN ({', '.join('?' * len(queries))})",
+                queries,
+            ).fetchall()
+        articles = pd.DataFrame(rows, columns=['query', 'fingerprint', 'predicted_label', 'scores', 'published_at'])
+        articles['scores'] = articles['scores'].map(json.loads)
+        articles['published_at'] = articles['published_at'].astype(float)
+        return articles
+
+    def close(self):
+        """Closes the database."""
+        with self.__lock:
+            self.__db.close()
@@ -0,0 +1,188 @@
+import time
+import uuid
+from pathlib import Path
+from threading import Lock
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+
+ARTICLE_COLUMNS = ['fingerprint', 'published_at', 'sentiment_weight', 'expected_sentiment', 'confidence']
+HOURLY_COLUMNS = ['hour', 'articles', 'sentiment_weight_sum', 'expected_sum', 'expected_sq_sum']
+
+
+class SentimentTimeSeries:
+    def __init__(self, path: str):
+        """
+        Columnar time series of scored articles with precomputed hourly aggregates per topic.
+
+        Articles are written once per topic to Parquet files partitioned by topic and day
+        (`articles/topic=<topic>/day=<YYYY-MM-DD>/`). Each write also adds the new articles
+        to the topic's hourly sums (`hourly/topic=<topic>.parquet`), so range queries read
+        those aggregates and never rescan the raw articles. The fingerprints a topic holds,
+        on any day, are kept next to them (`hourly/topic=<topic>.fingerprints.parquet`).
+
+        Parameters:
+        path (str): Directory holding the Parquet files.
+        """
+        self.path = Path(path).expanduser()
+        self.__lock = Lock()
+
+    @staticmethod
+    def __topic_name(topic: str) -> str:
+        # Dots are quoted too, so no topic name is mistaken for a file suffix or for '..'
+        return f"topic={quote(topic, safe='').replace('.', '%2E')}"
+
+    def __topic_dir(self, kind: str, topic: str) -> Path:
+        return self.path / kind / self.__topic_name(topic)
+
+    def __hourly_path(self, topic: str) -> Path:
+        return self.path / 'hourly' / f"{self.__topic_name(topic)}.parquet"
+
+    def __fingerprints_path(self, topic: str) -> Path:
+        return self.path / 'hourly' / f"{self.__topic_name(topic)}.fingerprints.parquet"
+
+    def __known_fingerprints(self, topic: str) -> pd.Series:
+        """Fingerprints the topic already holds, on any day."""
+        path = self.__fingerprints_path(topic)
+        if path.exists():
+            return pd.read_parquet(path)['fingerprint']
+        directory = self.__topic_dir('articles', topic)
+        if directory.exists():
+            # Series written before the index existed
+            return pd.read_parquet(directory, columns=['fingerprint'])['fingerprint']
+        return pd.Series([], dtype=object)
+
+    @staticmethod
+    def __replace(path: Path, frame: pd.DataFrame):
+        """Writes a Parquet file through a temporary file, so readers never see it half written."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = path.with_name(f"{path.name}.tmp")
+        frame.to_parquet(temporary, index=False)
+        temporary.replace(path)
+
+    def write(self, news_df: pd.DataFrame):
+        """
+        Appends scored articles to the series, skipping those a topic already holds.
+
+        Parameters:
+        news_df (pd.DataFrame): Scored news with columns 'query', 'fingerprint', 'published_at',
+            'sentiment_weight', 'expected_sentiment' and 'confidence'. Articles without a
+            publication time are filed at the current time. An article is only ever filed
+            once per topic, whatever time later writes give it.
+        """
+        if news_df.empty:
+            return
+        articles = news_df[['query', *ARTICLE_COLUMNS]].drop_duplicates(subset=['query', 'fingerprint'])
+        articles = articles.assign(
+            published_at=pd.to_datetime(articles['published_at'].fillna(time.time()), unit='s', utc=True)
+        )
+        articles['day'] = articles['published_at'].dt.strftime('%Y-%m-%d')
+
+        with self.__lock:
+            for topic, topic_articles in articles.groupby('query'):
+                known = self.__known_fingerprints(topic)
+                new = topic_articles[~topic_articles['fingerprint'].isin(known)]
+                if new.empty:
+                    continue
+                for day, day_articles in new.groupby('day'):
+                    directory = self.__topic_dir('articles', topic) / f"day={day}"
+                    directory.mkdir(parents=True, exist_ok=True)
+                    day_articles[ARTICLE_COLUMNS].to_parquet(directory / f"{uuid.uuid4().hex}.parquet", index=False)
+                self.__add_hourly(topic, new)
+                fingerprints = pd.concat([known, new['fingerprint']], ignore_index=True)
+                self.__replace(self.__fingerprints_path(topic), fingerprints.to_frame('fingerprint'))
+
+    def __add_hourly(self, topic: str, articles: pd.DataFrame):
+        """Adds the sums of new articles to the topic's hourly aggregates."""
+        hourly = articles.assign(
+            hour=articles['published_at'].dt.floor('h'),
+            articles=1,
+            sentiment_weight_sum=articles['sentiment_weight'].astype(float),
+            expected_sum=articles['expected_sentiment'],
+            expected_sq_sum=articles['expected_sentiment'] ** 2,
+        )[HOURLY_COLUMNS]
+        path = self.__hourly_path(topic)
+        if path.exists():
+            hourly = pd.concat([pd.read_parquet(path), hourly], ignore_index=True)
+        hourly = hourly.groupby('hour', as_index=False).sum().sort_values('hour')
+        self.__replace(path, hourly)
+
+    @staticmethod
+    def __period(value, freq: str) -> pd.Timestamp | None:
+        """Converts a range bound to the UTC start of its period."""
+        if value is None:
+            return None
+        value = pd.Timestamp(value)
+        value = value.tz_localize('UTC') if value.tzinfo is None else value.tz_convert('UTC')
+        return value.floor(freq)
+
+    def rolling(
+        self,
+        topics: list[str],
+        start: pd.Timestamp | str | None = None,
+        end: pd.Timestamp | str | None = None,
+        freq: str = 'D',
+        window: int = 7,
+    ) -> pd.DataFrame:
+        """
+        Returns the sentiment of each topic per period and its rolling mean over `window` periods.
+
+        Parameters:
+        topics (list[str]): The topics.
+        start (Timestamp | str): First period included (UTC). Defaults to the first article.
+        end (Timestamp | str): Last period included (UTC). Defaults to the last article.
+        freq (str): Period length: 'D' for days or 'h' for hours.
+        window (int): Number of periods in the rolling window.
+
+        Returns:
+            pd.DataFrame: One row per topic and period, with columns 'query', 'period', 'articles',
+            'sentiment_weight', 'expected_sentiment', 'dispersion', 'rolling_sentiment_weight' and
+            'rolling_expected_sentiment'. Indicators are multiplied by 100; rolling means weigh each
+            period by its number of articles, and periods without articles are NaN.
+        """
+        columns = [
+            'query', 'period', 'articles', 'sentiment_weight', 'expected_sentiment', 'dispersion',
+            'rolling_sentiment_weight', 'rolling_expected_sentiment',
+        ]
+        if freq not in ('D', 'h'):
+            raise ValueError("freq must be 'D' or 'h'.")
+        start = self.__period(start, freq)
+        end = self.__period(end, freq)
+        offset = pd.tseries.frequencies.to_offset(freq)
+        frames = []
+        for topic in topics:
+            path = self.__hourly_path(topic)
+            if not path.exists():
+                continue
+            hourly = pd.read_parquet(path)
+            hourly['period'] = hourly['hour'].dt.floor(freq)
+            sums = hourly.drop(columns='hour').groupby('period').sum()
+            first = start if start is not None else sums.index.min()
+            last = end if end is not None else sums.index.max()
+            if first > last:
+                continue
+            # The periods before `first` still count towards its rolling window
+            sums = sums.reindex(
+                pd.date_range(first - (window - 1) * offset, last, freq=freq, name='period'),
+                fill_value=0,
+            )
+            rolled = sums.rolling(window, min_periods=1).sum()[first:]
+            sums = sums[first:]
+
+            def mean(column, totals=sums):
+                return 100 * totals[column] / totals['articles'].replace(0, np.nan)
+
+            variance = (sums['expected_sq_sum'] / sums['articles'].replace(0, np.nan)) - (mean('expected_sum') / 100) ** 2
+            frames.append(pd.DataFrame({
+                'query': topic,
+                'period': sums.index,
+                'articles': sums['articles'].astype(int).to_numpy(),
+                'sentiment_weight': mean('sentiment_weight_sum').to_numpy(),
+                'expected_sentiment': mean('expected_sum').to_numpy(),
+                'dispersion': (100 * np.sqrt(variance.clip(lower=0))).to_numpy(),
+                'rolling_sentiment_weight': mean('sentiment_weight_sum', rolled).to_numpy(),
+                'rolling_expected_sentiment': mean('expected_sum', rolled).to_numpy(),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)[columns]
@@ -0,0 +1,109 @@
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+import pandas as pd
+from notebooks import NewsCache, NewsSearcher, SentimentAnalyzerNotebook, SentimentClient
+
+WRITERS = {
+    "csv": lambda df, path: df.to_csv(path, index=False),
+    "parquet": lambda df, path: df.to_parquet(path, index=False),
+    "json": lambda df, path: df.to_json(path, orient="records", force_ascii=False, date_format="iso", indent=2),
+}
+
+
+def read_topics(topics: list[str], topics_file: str | None) -> list[str]:
+    """
+    Returns the topics given on the command line followed by those in `topics_file`, without repeats.
+
+    The file has one topic per line; blank lines and lines starting with '#' are ignored.
+    """
+    if topics_file:
+        with open(topics_file, encoding="utf-8") as file:
+            lines = [line.strip() for line in file]
+        topics = [*topics, *(line for line in lines if line and not line.startswith("#"))]
+    return list(dict.fromkeys(topics))
+
+
+def write_output(df: pd.DataFrame, path: Path, fmt: str):
+    """Writes a DataFrame through a temporary file, so readers never see a partial file."""
+    temporary = path.with_name(f".{path.name}.tmp")
+    WRITERS[fmt](df, temporary)
+    temporary.replace(path)
+
+
+def run_once(notebook: SentimentAnalyzerNotebook, topics: list[str], output_dir: Path, fmt: str) -> dict:
+    """
+    Runs the analysis of `topics` and writes the indicators and the scored articles to `output_dir`.
+
+    Returns:
+        dict: Summary of the run, with its duration and scoring counters.
+    """
+    start = time.perf_counter()
+    notebook.main(topics)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    write_output(notebook.sentiment_indicator, output_dir / f"indicators.{fmt}", fmt)
+    write_output(notebook.news_df, output_dir / f"articles.{fmt}", fmt)
+    return {
+        "finished_at": pd.Timestamp.now(tz="UTC").isoformat(),
+        "topics": len(topics),
+        "indicators": len(notebook.sentiment_indicator),
+        "seconds": round(time.perf_counter() - start, 3),
+        "trace_id": notebook.trace_id,
+        "phase_ms": {phase: round(1000 * seconds, 1) for phase, seconds in notebook.phase_timings.items()},
+        **notebook.scoring_stats,
+    }
+
+
+def main(argv: list[str] | None = None):
+    """Runs the sentiment analysis of many topics without the web app, once or on a schedule."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("topics", nargs="*", help="Topics to analyze.")
+    parser.add_argument("--topics-file", help="File with one topic per line. Re-read before every run in watch mode.")
+    parser.add_argument("--output-dir", default="output", help="Directory for indicators.<format> and articles.<format>.")
+    parser.add_argument("--format", choices=list(WRITERS), default="csv")
+    parser.add_argument("--period", default="7d", help="Google News period, e.g. 7d.")
+    parser.add_argument("--lang", default="pt")
+    parser.add_argument("--fetch-workers", type=int, default=4, help="Topics fetched at the same time.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight to the sentiment API.")
+    parser.add_argument("--watch", type=float, metavar="SECONDS", help="Run again every SECONDS seconds.")
+    parser.add_argument("--iterations", type=int, help="Stop watch mode after this many runs.")
+    parser.add_argument("--log-level", default="WARNING", help="Use INFO to log each topic's phase timings.")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    if not args.topics and not args.topics_file:
+        parser.error("give topics or --topics-file")
+
+    # Watch mode must see fresh news on every run; the article store still skips known ones
+    cache = NewsCache(ttl_seconds=0) if args.watch else None
+    searcher = NewsSearcher(period=args.period, lang=args.lang, max_workers=args.fetch_workers, cache=cache)
+    client = SentimentClient(concurrency=args.concurrency)
+    output_dir = Path(args.output_dir)
+
+    runs = 0
+    try:
+        while True:
+            topics = read_topics(args.topics, args.topics_file)
+            notebook = SentimentAnalyzerNotebook(period=args.period, lang=args.lang, client=client, searcher=searcher)
+            try:
+                print(json.dumps(run_once(notebook, topics, output_dir, args.format)), flush=True)
+            except Exception as e:
+                if not args.watch:
+                    raise
+                # A failed refresh keeps the previous outputs and waits for the next one
+                print(json.dumps({"error": str(e)}), file=sys.stderr, flush=True)
+            runs += 1
+            if not args.watch or (args.iterations and runs >= args.iterations):
+                break
+            time.sleep(args.watch)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
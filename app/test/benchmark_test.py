@@ -0,0 +1,28 @@
+import json
+import benchmark
+
+
+def test_end_to_end_run_scores_once_and_reports_metrics():
+    results = benchmark.run_benchmark(topics=3, articles=10, news_latency_ms=0, api_latency_ms=0)
+    environment, metrics = results["environment"], results["metrics"]
+    assert environment["cold_scored"] > 0
+    assert environment["warm_scored"] == 0
+    assert set(metrics) == {
+        "e2e_cold_seconds",
+        "e2e_warm_seconds",
+        "e2e_cold_articles_per_second",
+        "e2e_warm_articles_per_second",
+        "peak_rss_mb",
+    }
+    assert all(value > 0 for value in metrics.values())
+
+
+def test_cli_fails_on_regression(tmp_path):
+    arguments = ["--topics", "2", "--articles", "5", "--news-latency-ms", "0", "--api-latency-ms", "0"]
+    output = tmp_path / "results.json"
+    assert benchmark.main([*arguments, "--output", str(output)]) == 0
+
+    metrics = json.loads(output.read_text())["metrics"]
+    baseline = {"metrics": {**metrics, "e2e_cold_seconds": metrics["e2e_cold_seconds"] / 100}}
+    (tmp_path / "baseline.json").write_text(json.dumps(baseline))
+    assert benchmark.main([*arguments, "--baseline", str(tmp_path / "baseline.json"), "--max-regression", "0.5"]) == 1
@@ -0,0 +1,85 @@
+import requests
+from notebooks.client import SentimentClient
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None, headers=None):
+        self.status_code = status_code
+        self.payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+
+class FakeSession:
+    """Session stub that answers with `handler(path, body)` and records every call."""
+    def __init__(self, handler):
+        self.handler = handler
+        self.calls = []
+
+    def post(self, url, json, timeout, headers=None):
+        path = url.split("8000", 1)[1]
+        self.calls.append((path, json))
+        self.headers = headers
+        return self.handler(path, json)
+
+    def close(self):
+        pass
+
+
+def predictions(texts):
+    return [{"text": text, "predicted_label": text.upper(), "scores": {}} for text in texts]
+
+
+def test_texts_are_sent_in_ordered_batches():
+    """predict_many chunks the texts into batch requests and keeps their order."""
+    session = FakeSession(lambda path, body: FakeResponse(200, {"results": predictions(body["texts"])}))
+    client = SentimentClient(url="http://api:8000", batch_size=2, concurrency=3, session=session)
+
+    texts = [f"text {i}" for i in range(5)]
+    results = client.predict_many(texts)
+
+    assert [result["text"] for result in results] == texts
+    assert sorted(len(body["texts"]) for _, body in session.calls) == [1, 2, 2]
+
+
+def test_falls_back_to_single_requests_without_batch_endpoint():
+    """A 404 on /analyze/batch switches the client to one request per text."""
+    def handler(path, body):
+        if path == "/analyze/batch":
+            return FakeResponse(404)
+        return FakeResponse(200, predictions([body["text"]])[0])
+
+    session = FakeSession(handler)
+    client = SentimentClient(url="http://api:8000", batch_size=8, concurrency=1, session=session)
+
+    results = client.predict_many(["a", "b"])
+
+    assert [result["predicted_label"] for result in results] == ["A", "B"]
+    assert client.batch_supported is False
+    assert [path for path, _ in session.calls] == ["/analyze/batch", "/analyze/", "/analyze/"]
+
+
+def test_transient_errors_are_retried():
+    """503 responses are retried, honoring Retry-After, until the request succeeds."""
+    responses = [FakeResponse(503, headers={"Retry-After": "0"}), FakeResponse(200, predictions(["a"])[0])]
+    session = FakeSession(lambda path, body: responses.pop(0))
+    client = SentimentClient(url="http://api:8000", retries=2, session=session)
+
+    assert client.predict("a")["predicted_label"] == "A"
+    assert len(session.calls) == 2
+
+
+def test_trace_id_is_sent_with_every_request():
+    session = FakeSession(lambda path, body: FakeResponse(200, {"results": predictions(body["texts"])}))
+    client = SentimentClient(url="http://api:8000", session=session)
+
+    client.predict_many(["a"], trace_id="abc123")
+    assert session.headers == {"X-Request-ID": "abc123"}
+    client.predict_many(["a"])
+    assert session.headers is None
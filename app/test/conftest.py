@@ -0,0 +1,14 @@
+import pytest
+from notebooks import sentiment_analysis
+
+
+@pytest.fixture(autouse=True)
+def isolated_storage(tmp_path, monkeypatch):
+    """Points the shared article store and time series at a temporary directory."""
+    monkeypatch.setenv("ARTICLE_STORE_PATH", str(tmp_path / "articles.sqlite3"))
+    monkeypatch.setenv("SENTIMENT_TIMESERIES_PATH", str(tmp_path / "timeseries"))
+    sentiment_analysis.default_article_store.cache_clear()
+    sentiment_analysis.default_timeseries.cache_clear()
+    yield
+    sentiment_analysis.default_article_store.cache_clear()
+    sentiment_analysis.default_timeseries.cache_clear()
@@ -0,0 +1,49 @@
+import pandas as pd
+from notebooks.dedupe import MinHashDeduplicator, normalize_texts
+from notebooks.news import NewsCache, RateLimiter
+from notebooks.sentiment_analysis import NewsSearcher, SentimentAnalyzerNotebook
+from notebooks.store import ArticleStore
+
+
+def test_normalization_removes_entities_tags_and_spacing():
+    texts = pd.Series(["Bitcoin &amp; <b>Ether</b>  sobem...", None])
+
+    assert normalize_texts(texts).tolist() == ["bitcoin & ether sobem", ""]
+
+
+def test_near_duplicates_share_a_group():
+    """Syndicated copies with a slightly different ending join the first copy's group."""
+    texts = normalize_texts(pd.Series([
+        "Bitcoin sobe 10% após anúncio do ETF nos EUA, dizem analistas do mercado...",
+        "Futebol: time vence o campeonato estadual pela terceira vez seguida",
+        "Bitcoin sobe 10% após anúncio do ETF nos EUA, dizem analistas do mercado financeiro",
+        "Futebol: time vence o campeonato estadual pela terceira vez seguida",
+    ]))
+
+    assert MinHashDeduplicator().groups(texts).tolist() == [0, 1, 0, 1]
+
+
+def test_near_duplicates_are_scored_once():
+    """Only one copy per group reaches the client and every copy gets its label."""
+    def fetcher(query, period, lang, encode):
+        return [
+            {"title": "Agência A", "desc": "Bitcoin sobe 10% após anúncio do ETF nos EUA, dizem analistas", "img": "a.png", "date": ""},
+            {"title": "Agência B", "desc": "Bitcoin sobe 10% após anúncio do ETF nos EUA, dizem analistas...", "img": "b.png", "date": ""},
+            {"title": "Agência C", "desc": "Mercado de ações fecha em queda com temor de juros altos", "img": "c.png", "date": ""},
+        ]
+
+    class Client:
+        scored = []
+
+        def predict_many(self, texts, trace_id=None):
+            self.scored.extend(texts)
+            return [{"predicted_label": "Positive", "scores": {}} for _ in texts]
+
+    client = Client()
+    searcher = NewsSearcher(fetcher=fetcher, cache=NewsCache(0), rate_limiter=RateLimiter(0))
+    notebook = SentimentAnalyzerNotebook(client=client, searcher=searcher, store=ArticleStore())
+    notebook.main(["bitcoin"])
+
+    assert len(client.scored) == 2
+    assert notebook.news_df["sentiment"].tolist() == ["Positive"] * 3
+    assert notebook.scoring_stats == {"articles": 3, "stored": 0, "near_duplicates": 1, "scored": 2}
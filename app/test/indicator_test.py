@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+from notebooks.indicator import compute_indicators, parse_article_ages, sentiment_labels
+
+NOW = 1_700_000_000.0
+
+
+def test_relative_and_absolute_dates_are_parsed():
+    ages = parse_article_ages(pd.Series(["há 2 horas", "3 days ago", "ontem", "30 minutos atrás", "", None]))
+
+    assert ages[:4].tolist() == [2, 72, 24, 0.5]
+    assert np.isnan(ages[4:]).all()
+
+
+def test_indicators_use_class_probabilities():
+    articles = pd.DataFrame({
+        "query": ["a", "a", "b"],
+        "predicted_label": ["Positive", "Very Negative", "Neutral"],
+        "scores": [
+            {"Positive": 0.5, "Very Positive": 0.5},
+            {"Very Negative": 1.0},
+            {},
+        ],
+        "published_at": [NOW, NOW - 24 * 3600, np.nan],
+    })
+
+    indicators = compute_indicators(articles, now=NOW, half_life_hours=24).set_index("query")
+
+    # Expected sentiments: a -> [1.5, -2], b -> [0] (one-hot Neutral)
+    assert indicators.loc["a", "articles"] == 2
+    assert indicators.loc["a", "expected_sentiment"] == pytest.approx(100 * (1.5 - 2) / 2)
+    assert indicators.loc["a", "confidence_weighted"] == pytest.approx(100 * (0.5 * 1.5 - 2) / 1.5)
+    assert indicators.loc["a", "dispersion"] == pytest.approx(100 * 1.75)
+    assert indicators.loc["a", "recency_weighted"] == pytest.approx(100 * (1.5 - 0.5 * 2) / 1.5)
+    assert indicators.loc["b", "expected_sentiment"] == 0
+
+
+def test_thousands_of_articles_per_topic():
+    rng = np.random.default_rng(0)
+    probabilities = rng.dirichlet(np.ones(5), size=20000)
+    labels = ["Very Negative", "Negative", "Neutral", "Positive", "Very Positive"]
+    articles = pd.DataFrame({
+        "query": rng.choice(["a", "b", "c"], size=20000),
+        "predicted_label": [labels[i] for i in probabilities.argmax(axis=1)],
+        "scores": [dict(zip(labels, row)) for row in probabilities],
+        "published_at": NOW - rng.uniform(0, 7 * 86400, size=20000),
+    })
+
+    indicators = compute_indicators(articles, now=NOW)
+
+    assert indicators["articles"].sum() == 20000
+    assert indicators["dispersion"].gt(0).all()
+
+
+def test_labels_follow_the_weight_scale():
+    labels = sentiment_labels(pd.Series([-200.0, -100.0, 0.0, 100.0, 200.0]))
+
+    assert labels.tolist() == ["Muito Negativo", "Negativo", "Neutro", "Positivo", "Muito Positivo"]
+
+
+def test_labels_at_the_exact_boundaries_match_the_original_thresholds():
+    """Negative bounds are inclusive and positive bounds exclusive, as in the original labels."""
+    labels = sentiment_labels(pd.Series([-150.0, -50.0, 50.0, 150.0]))
+
+    assert labels.tolist() == ["Muito Negativo", "Negativo", "Positivo", "Muito Positivo"]
@@ -0,0 +1,40 @@
+import time
+import pandas as pd
+from notebooks.jobs import AnalysisJob
+
+
+class FakeNotebook:
+    """Notebook stub whose stream yields one topic per `delay` seconds."""
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+
+    def stream(self, queries):
+        for query in queries:
+            time.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError("fetch failed")
+            yield query, pd.DataFrame({"query": [query], "sentiment": ["Positive"]}), {"query": query, "sentiment_weight": 100.0}
+
+
+def test_partial_results_are_visible_while_running():
+    """Completed topics are exposed before the job finishes."""
+    job = AnalysisJob(["a", "b"], lambda: FakeNotebook(delay=0.2))
+
+    deadline = time.monotonic() + 2
+    while job.completed < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not job.done
+    assert job.sentiment_indicator["query"].tolist() == ["a"]
+    assert job.wait(timeout=2)
+    assert job.sentiment_indicator["query"].tolist() == ["a", "b"]
+    assert job.news_df["query"].tolist() == ["a", "b"]
+
+
+def test_errors_finish_the_job():
+    job = AnalysisJob(["a"], lambda: FakeNotebook(fail=True))
+
+    assert job.wait(timeout=2)
+    assert isinstance(job.error, RuntimeError)
+    assert job.sentiment_indicator.empty
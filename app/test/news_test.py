@@ -0,0 +1,68 @@
+import time
+from threading import Lock
+from notebooks.news import NewsCache, RateLimiter
+from notebooks.sentiment_analysis import NewsSearcher
+
+
+class FakeFetcher:
+    """Fetcher stub that records its calls and the peak number running at once."""
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.peak = 0
+        self.lock = Lock()
+
+    def __call__(self, query, period, lang, encode):
+        with self.lock:
+            self.calls.append((query, period, lang))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+        return [{"title": query, "desc": f"{query} news", "img": "", "date": ""}]
+
+
+def test_queries_are_fetched_concurrently_in_order():
+    """get_many runs up to max_workers fetches at once and keeps the query order."""
+    fetcher = FakeFetcher(delay=0.05)
+    searcher = NewsSearcher(fetcher=fetcher, max_workers=3, cache=NewsCache(0), rate_limiter=RateLimiter(0))
+
+    results = searcher.get_many(["a", "b", "c", "d"])
+
+    assert [news[0]["title"] for news in results] == ["a", "b", "c", "d"]
+    assert fetcher.peak == 3
+
+
+def test_results_are_cached_per_query_period_and_lang():
+    """A repeated query is served from the cache, but another period is fetched again."""
+    fetcher = FakeFetcher()
+    cache = NewsCache(ttl_seconds=60)
+    searcher = NewsSearcher(fetcher=fetcher, cache=cache, rate_limiter=RateLimiter(0))
+    other_period = NewsSearcher(period="1d", fetcher=fetcher, cache=cache, rate_limiter=RateLimiter(0))
+
+    searcher.get_many(["a", "b"])
+    searcher.get_many(["a", "b"])
+    other_period.get_news("a")
+
+    assert sorted(fetcher.calls) == [("a", "1d", "pt"), ("a", "7d", "pt"), ("b", "7d", "pt")]
+
+
+def test_cache_entries_expire():
+    """Entries older than the TTL are dropped."""
+    cache = NewsCache(ttl_seconds=0.01)
+    cache.put(("a", "7d", "pt"), [])
+    time.sleep(0.02)
+
+    assert cache.get(("a", "7d", "pt")) is None
+
+
+def test_rate_limiter_spaces_out_calls():
+    """Calls beyond the rate wait for their slot."""
+    limiter = RateLimiter(rate_per_second=50)
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.wait()
+
+    assert time.monotonic() - start >= 3 / 50 * 0.9
@@ -0,0 +1,51 @@
+import json
+import pandas as pd
+import run_analysis
+from notebooks.news import NewsCache, RateLimiter
+from notebooks.sentiment_analysis import NewsSearcher
+
+
+class FakeClient:
+    def __init__(self):
+        self.scored = []
+
+    def predict_many(self, texts, trace_id=None):
+        self.scored.extend(texts)
+        return [{"predicted_label": "Positive", "scores": {"Positive": 1.0}} for _ in texts]
+
+    def close(self):
+        pass
+
+
+def fetcher(query, period, lang, encode):
+    return [{"title": f"{query} title", "desc": f"{query} news", "img": "", "date": "há 1 hora"}]
+
+
+def test_topics_come_from_arguments_and_file(tmp_path):
+    topics_file = tmp_path / "topics.txt"
+    topics_file.write_text("# crypto\nbitcoin\n\nethereum\nbitcoin\n", encoding="utf-8")
+
+    assert run_analysis.read_topics(["dólar"], str(topics_file)) == ["dólar", "bitcoin", "ethereum"]
+
+
+def test_watch_mode_writes_outputs_and_rescores_only_changes(tmp_path, monkeypatch, capsys):
+    client = FakeClient()
+    searcher = NewsSearcher(fetcher=fetcher, cache=NewsCache(0), rate_limiter=RateLimiter(0))
+    monkeypatch.setattr(run_analysis, "SentimentClient", lambda concurrency: client)
+    monkeypatch.setattr(run_analysis, "NewsSearcher", lambda **kwargs: searcher)
+    monkeypatch.setattr(run_analysis.time, "sleep", lambda seconds: None)
+
+    run_analysis.main([
+        "bitcoin", "ethereum",
+        "--output-dir", str(tmp_path),
+        "--format", "parquet",
+        "--watch", "60",
+        "--iterations", "2",
+    ])
+
+    summaries = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [summary["scored"] for summary in summaries] == [2, 0]
+    assert sorted(client.scored) == ["bitcoin news", "ethereum news"]
+    indicators = pd.read_parquet(tmp_path / "indicators.parquet")
+    assert indicators["query"].tolist() == ["bitcoin", "ethereum"]
+    assert len(pd.read_parquet(tmp_path / "articles.parquet")) == 2
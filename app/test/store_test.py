@@ -0,0 +1,120 @@
+import time
+from notebooks.news import NewsCache, RateLimiter
+from notebooks.sentiment_analysis import PHASES, NewsSearcher, SentimentAnalyzerNotebook
+from notebooks.store import ArticleStore
+
+LABELS = {"up": "Positive", "down": "Negative", "flat": "Neutral"}
+
+
+def fake_fetcher(query, period, lang, encode):
+    """Returns two articles per topic; 'shared' is returned by every topic."""
+    return [
+        {"title": f"{query} title", "desc": f"{query} up", "img": "", "date": ""},
+        {"title": "shared", "desc": "market down", "img": "", "date": ""},
+    ]
+
+
+class FakeClient:
+    """Client stub that labels a text by its last word and records what it scored."""
+    def __init__(self):
+        self.scored = []
+        self.trace_ids = set()
+
+    def predict_many(self, texts, trace_id=None):
+        self.scored.extend(texts)
+        self.trace_ids.add(trace_id)
+        return [{"predicted_label": LABELS[text.split()[-1]], "scores": {}} for text in texts]
+
+
+def build_notebook(store, client):
+    searcher = NewsSearcher(fetcher=fake_fetcher, cache=NewsCache(0), rate_limiter=RateLimiter(0))
+    return SentimentAnalyzerNotebook(client=client, searcher=searcher, store=store)
+
+
+def test_only_new_articles_are_scored_across_runs(tmp_path):
+    """A second run with one more topic scores only that topic's new article."""
+    store = ArticleStore(path=str(tmp_path / "articles.sqlite3"))
+    client = FakeClient()
+
+    build_notebook(store, client).main(["a", "b"])
+    assert sorted(client.scored) == ["a up", "b up", "market down"]
+
+    client.scored.clear()
+    notebook = build_notebook(store, client)
+    notebook.main(["a", "b", "c"])
+
+    assert client.scored == ["c up"]
+    assert notebook.news_df["sentiment"].notna().all()
+
+
+def test_indicator_comes_from_stored_aggregates(tmp_path):
+    """Re-running a topic does not count its articles twice."""
+    store = ArticleStore(path=str(tmp_path / "articles.sqlite3"))
+    notebook = build_notebook(store, FakeClient())
+    notebook.main(["a"])
+    notebook.main(["a"])
+
+    indicator = notebook.sentiment_indicator
+    assert indicator["query"].tolist() == ["a"]
+    assert indicator["sentiment_weight"].tolist() == [0.0]
+    assert store.label_counts(["a"]) == {"a": {"Positive": 1, "Negative": 1}}
+
+
+def test_prune_drops_articles_past_retention():
+    """Articles not seen again within the retention leave the topic aggregates."""
+    store = ArticleStore(retention_seconds=-1)
+    fingerprint = ArticleStore.fingerprint("t", "d")
+    store.put_many({fingerprint: {"predicted_label": "Positive", "scores": {}}})
+    store.link("a", [fingerprint])
+
+    store.prune()
+
+    assert store.label_counts(["a"]) == {}
+    assert fingerprint in store.get_many([fingerprint])
+
+
+def test_link_keeps_the_first_publication_time():
+    store = ArticleStore()
+    fingerprint = ArticleStore.fingerprint("t", "d")
+    store.put_many({fingerprint: {"predicted_label": "Positive", "scores": {}}})
+
+    assert store.link("a", [fingerprint], [100.0]) == {fingerprint: 100.0}
+    assert store.link("a", [fingerprint], [200.0]) == {fingerprint: 100.0}
+
+
+def test_fingerprint_ignores_case_and_spacing():
+    assert ArticleStore.fingerprint("Bitcoin  sobe", "x") == ArticleStore.fingerprint("bitcoin sobe ", "x")
+
+
+def test_stream_yields_topics_as_they_complete():
+    """A fast topic is scored and yielded while a slow topic is still being fetched."""
+    def slow_fetcher(query, period, lang, encode):
+        time.sleep(0.3 if query == "slow" else 0)
+        return fake_fetcher(query, period, lang, encode)
+
+    searcher = NewsSearcher(fetcher=slow_fetcher, cache=NewsCache(0), rate_limiter=RateLimiter(0))
+    notebook = SentimentAnalyzerNotebook(client=FakeClient(), searcher=searcher, store=ArticleStore())
+
+    start = time.monotonic()
+    stream = notebook.stream(["slow", "fast"])
+    query, news_df, indicator = next(stream)
+
+    assert query == "fast"
+    assert time.monotonic() - start < 0.3
+    assert news_df["sentiment"].tolist() == ["Positive", "Negative"]
+    assert indicator["sentiment_weight"] == 0.0
+    assert [query for query, _, _ in stream] == ["slow"]
+
+
+def test_runs_are_traced_and_timed_per_phase(caplog):
+    client = FakeClient()
+    notebook = build_notebook(ArticleStore(), client)
+    with caplog.at_level("INFO", logger="notebooks.sentiment_analysis"):
+        notebook.main(["a", "b"])
+
+    assert client.trace_ids == {notebook.trace_id}
+    assert set(notebook.phase_timings) == set(PHASES)
+    assert notebook.phase_timings["sentiment_api"] <= notebook.phase_timings["feature_engineering"]
+    lines = [record.getMessage() for record in caplog.records]
+    assert len(lines) == 2
+    assert all(f"trace_id={notebook.trace_id}" in line and "sentiment_api_ms=" in line for line in lines)
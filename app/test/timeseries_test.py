@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+from notebooks.timeseries import SentimentTimeSeries
+
+DAY = 86400
+START = pd.Timestamp("2025-01-01", tz="UTC").timestamp()
+
+
+def articles(query, rows):
+    """Builds scored news rows from (fingerprint, seconds after START, label weight)."""
+    return pd.DataFrame({
+        "query": query,
+        "fingerprint": [fingerprint for fingerprint, _, _ in rows],
+        "published_at": [START + offset for _, offset, _ in rows],
+        "sentiment_weight": [weight for _, _, weight in rows],
+        "expected_sentiment": [float(weight) for _, _, weight in rows],
+        "confidence": 1.0,
+    })
+
+
+def test_daily_and_rolling_sentiment(tmp_path):
+    series = SentimentTimeSeries(str(tmp_path))
+    series.write(articles("btc", [("a", 0, 2), ("b", 3600, 0), ("c", 2 * DAY, -1)]))
+
+    daily = series.rolling(["btc"], freq="D", window=2)
+
+    assert daily["period"].dt.strftime("%Y-%m-%d").tolist() == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert daily["articles"].tolist() == [2, 0, 1]
+    assert daily["sentiment_weight"].tolist()[::2] == [100.0, -100.0]
+    assert daily["dispersion"].iloc[0] == pytest.approx(100.0)
+    # Day 3 rolls up days 2 and 3; day 2 had no articles
+    assert daily["rolling_sentiment_weight"].tolist() == [100.0, 100.0, -100.0]
+
+
+def test_rewritten_articles_are_not_counted_twice(tmp_path):
+    series = SentimentTimeSeries(str(tmp_path))
+    series.write(articles("btc", [("a", 0, 1)]))
+    series.write(articles("btc", [("a", 0, 1), ("b", 60, -1)]))
+
+    hourly = series.rolling(["btc"], freq="h")
+
+    assert hourly["articles"].tolist() == [2]
+    assert (tmp_path / "articles" / "topic=btc" / "day=2025-01-01").is_dir()
+
+
+def test_articles_seen_again_on_another_day_are_not_counted_twice(tmp_path):
+    series = SentimentTimeSeries(str(tmp_path))
+    series.write(articles("btc", [("a", 0, 1)]))
+    # The relative age scraped later lands the same article on the next day
+    series.write(articles("btc", [("a", DAY + 60, 1)]))
+
+    assert series.rolling(["btc"], freq="D")["articles"].tolist() == [1]
+
+
+def test_topics_differing_only_by_dots_stay_apart(tmp_path):
+    series = SentimentTimeSeries(str(tmp_path))
+    series.write(articles("btc.usd", [("a", 0, 1)]))
+    series.write(articles("btc.eur", [("b", 0, -1)]))
+
+    daily = series.rolling(["btc.usd", "btc.eur"], freq="D")
+
+    assert daily.set_index("query")["sentiment_weight"].to_dict() == {"btc.usd": 100.0, "btc.eur": -100.0}
+
+
+def test_rolling_window_reaches_before_the_range(tmp_path):
+    series = SentimentTimeSeries(str(tmp_path))
+    series.write(articles("btc", [("a", 0, 2), ("b", DAY, 0)]))
+
+    daily = series.rolling(["btc"], start="2025-01-02", end="2025-01-02", window=2)
+
+    assert daily["rolling_sentiment_weight"].tolist() == [100.0]
+    assert series.rolling(["eth"]).empty